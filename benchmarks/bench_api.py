@@ -0,0 +1,139 @@
+"""
+Load test for the read-only HTTP API.
+
+Run from the project root:
+    python -m benchmarks.bench_api [--students 500] [--clients 8] [--seconds 3]
+
+Starts the API on a free local port over a synthetic data directory and
+drives it with keep-alive clients requesting a mix of student, course and
+leaderboard endpoints. Three rounds are reported in requests/second with
+p50/p99 latency: the response cache disabled, the cache enabled, and
+conditional requests (If-None-Match) that are answered with 304. Clients run
+in the same process as the server, so the absolute numbers understate a
+separate-process deployment; compare the rounds with each other.
+"""
+import argparse
+import http.client
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from student_management_system.api import make_server
+from student_management_system.metrics import LatencyHistogram
+from student_management_system.storage.storage_manager import StorageManager
+
+COURSES = [f"C-{n:03d}" for n in range(1, 9)]
+
+
+def build_dataset(data_dir: str, students: int, days: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    storage = StorageManager(data_dir)
+    ids = [f"S-{n:05d}" for n in range(1, students + 1)]
+    storage.save_users([
+        {'_user_id': sid, '_username': f"student{n}", '_role': 'Student', '_is_active': True}
+        for n, sid in enumerate(ids, 1)
+    ])
+    start = date.today() - timedelta(days=days)
+    enrollments, attendance, grades = [], [], []
+    for sid in ids:
+        for course_id in rng.sample(COURSES, 3):
+            enrollments.append({'student_id': sid, 'course_id': course_id, 'date': start.isoformat(), 'status': 'enrolled'})
+            for day in range(days):
+                attendance.append({'student_id': sid, 'course_id': course_id,
+                                   'date': (start + timedelta(days=day)).isoformat(),
+                                   'status': rng.choice('PPPPPPALE'), 'marked_by': 'T-001'})
+            for _ in range(5):
+                grades.append({'student_id': sid, 'course_id': course_id, 'score': rng.randint(40, 100),
+                               'max_score': 100, 'weight': 0.2})
+    storage.append_enrollments(enrollments)
+    storage.append_attendance(attendance)
+    storage.append_grades(grades)
+    return ids
+
+
+def run_round(port: int, paths: list, clients: int, seconds: float, conditional: bool) -> tuple:
+    histogram = LatencyHistogram()
+    lock = threading.Lock()
+    counts = []
+    deadline = time.perf_counter() + seconds
+
+    def client(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        etags = {}
+        local = LatencyHistogram()
+        done = 0
+        while time.perf_counter() < deadline:
+            path = rng.choice(paths)
+            headers = {'If-None-Match': etags[path]} if conditional and path in etags else {}
+            started = time.perf_counter_ns()
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            local.record(time.perf_counter_ns() - started)
+            assert response.status in (200, 304), (path, response.status)
+            etags[path] = response.getheader('ETag')
+            done += 1
+        conn.close()
+        with lock:
+            counts.append(done)
+            for index, n in enumerate(local.counts):
+                histogram.counts[index] += n
+            histogram.count += local.count
+            histogram.total += local.total
+            histogram.max = max(histogram.max, local.max)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return sum(counts) / elapsed, histogram
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--students', type=int, default=500)
+    parser.add_argument('--days', type=int, default=60, help="attendance days per enrolled course")
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='sms-api-')
+    try:
+        build_start = time.perf_counter()
+        ids = build_dataset(data_dir, args.students, args.days)
+        print(f"Dataset: {args.students} students, {args.students * 3 * args.days} attendance rows "
+              f"(built in {time.perf_counter() - build_start:.1f} s)")
+        rng = random.Random(1)
+        sample = rng.sample(ids, min(50, len(ids)))
+        paths = ['/students', '/leaderboard?n=20']
+        paths += [f"/courses/{c}/attendance" for c in COURSES] + [f"/courses/{c}/roster" for c in COURSES]
+        paths += [f"/students/{sid}/attendance" for sid in sample] + [f"/students/{sid}/grades" for sid in sample]
+
+        print(f"\n{'Round':<22} | {'req/s':>8} | {'p50 ms':>7} | {'p99 ms':>7}")
+        print("-" * 54)
+        for label, cache_entries, conditional in (('no response cache', 0, False),
+                                                  ('LRU response cache', 512, False),
+                                                  ('If-None-Match (304)', 512, True)):
+            server = make_server(StorageManager(data_dir), '127.0.0.1', 0, reports_dir=data_dir, cache_entries=cache_entries)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                run_round(server.server_address[1], paths, 1, 0.5, conditional)  # Warm the indexes
+                rate, histogram = run_round(server.server_address[1], paths, args.clients, args.seconds, conditional)
+            finally:
+                server.shutdown()
+                server.server_close()
+            print(f"{label:<22} | {rate:>8,.0f} | {histogram.percentile(50) / 1e6:>7.2f} | {histogram.percentile(99) / 1e6:>7.2f}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Caller-side cost of a log call: synchronous FileHandler vs the queued pipeline.
+
+Run from the project root:
+    python -m benchmarks.bench_logging [--records 100000]
+
+The synchronous handler writes and flushes on the caller's thread, as
+decorators/logger.py used to. The queued pipeline only enqueues on the
+caller's thread; the listener batches the file writes. Both write to a
+temporary directory, and the drain time of the queued pipeline (until
+every record is on disk) is reported separately. In this tight loop the
+listener thread competes for the GIL, so the queued figure is an upper
+bound; with actions spaced out by user input the caller pays only the
+enqueue, and slow disks only make the synchronous handler worse.
+"""
+import argparse
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import time
+
+from student_management_system.decorators.logger import (
+    CompressingRotatingFileHandler, _BatchingQueueListener, _InProcessQueueHandler
+)
+
+MESSAGE = "Action: Mark Attendance | UserID: T-001 | Status: SUCCESS"
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(handler)
+    return logger
+
+
+def run(logger: logging.Logger, records: int) -> float:
+    start = time.perf_counter()
+    for _ in range(records):
+        logger.info(MESSAGE)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--records', type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_handler = logging.FileHandler(os.path.join(tmp, 'sync.log'))
+        sync_seconds = run(make_logger('bench_sync', sync_handler), args.records)
+        sync_handler.close()
+
+        file_handler = CompressingRotatingFileHandler(os.path.join(tmp, 'queued.log'), 50 * 1024 * 1024, 3, 0)
+        log_queue = queue.SimpleQueue()
+        listener = _BatchingQueueListener(log_queue, file_handler)
+        listener.start()
+        queued_seconds = run(make_logger('bench_queued', _InProcessQueueHandler(log_queue)), args.records)
+        drain_start = time.perf_counter()
+        listener.stop()
+        drain_seconds = time.perf_counter() - drain_start
+        file_handler.close()
+
+    print(f"{'Pipeline':<12} | {'us/call':>8} | {'caller total s':>14}")
+    print("-" * 40)
+    print(f"{'sync':<12} | {sync_seconds / args.records * 1e6:>8.2f} | {sync_seconds:>14.3f}")
+    print(f"{'queued':<12} | {queued_seconds / args.records * 1e6:>8.2f} | {queued_seconds:>14.3f}")
+    print(f"\nQueued pipeline drained the remaining records in {drain_seconds:.3f}s after the last call.")
+
+
+if __name__ == '__main__':
+    main()
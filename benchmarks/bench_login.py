@@ -0,0 +1,62 @@
+"""
+Login latency and throughput under each password-hashing cost setting.
+
+Run from the project root:
+    python -m benchmarks.bench_login [--logins 64] [--threads 1,4,8]
+
+A login costs one verify_password() call, so this reports the single-login
+latency and the logins/second a terminal server can sustain when many
+users sign in at once (e.g. the start-of-class rush). Pick the strongest
+setting whose peak throughput still covers the expected burst.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from student_management_system.passwords import hash_password, verify_password
+
+POLICIES = [
+    {'scheme': 'scrypt', 'n': 2 ** 12, 'r': 8, 'p': 1},
+    {'scheme': 'scrypt', 'n': 2 ** 14, 'r': 8, 'p': 1},
+    {'scheme': 'scrypt', 'n': 2 ** 15, 'r': 8, 'p': 1},
+    {'scheme': 'pbkdf2_sha256', 'iterations': 100000},
+    {'scheme': 'pbkdf2_sha256', 'iterations': 310000},
+    {'scheme': 'pbkdf2_sha256', 'iterations': 600000},
+]
+
+
+def label(policy: dict) -> str:
+    if policy['scheme'] == 'scrypt':
+        return f"scrypt n=2^{policy['n'].bit_length() - 1} r={policy['r']} p={policy['p']}"
+    return f"pbkdf2 it={policy['iterations']}"
+
+
+def throughput(stored: str, logins: int, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: verify_password('correct horse', stored), range(logins)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--logins', type=int, default=64, help="logins per measurement")
+    parser.add_argument('--threads', default='1,4,8', help="comma-separated concurrency levels")
+    args = parser.parse_args()
+    levels = [int(t) for t in args.threads.split(',')]
+
+    print(f"{'Policy':<26} | {'Latency (ms)':>12} | " + " | ".join(f"{f'{t} thr/s':>9}" for t in levels))
+    print("-" * (44 + 12 * len(levels)))
+    for policy in POLICIES:
+        stored = hash_password('correct horse', policy)
+        start = time.perf_counter()
+        verify_password('correct horse', stored)
+        latency = (time.perf_counter() - start) * 1000
+        rates = [throughput(stored, args.logins, t) for t in levels]
+        print(f"{label(policy):<26} | {latency:>12.1f} | " + " | ".join(f"{r:>9.1f}" for r in rates))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Overhead and accuracy of the latency histograms in metrics.py.
+
+Run from the project root:
+    python -m benchmarks.bench_metrics [--calls 200000]
+
+Reports the per-call cost of recording one sample, of a full
+start_timer()/stop_timer() pair (what log_action and the menu dispatch pay),
+and the relative error of the histogram percentiles against exact
+percentiles of a log-normal latency sample.
+"""
+import argparse
+import math
+import random
+import timeit
+
+from student_management_system.metrics import LatencyHistogram, MetricsRegistry, start_timer, stop_timer
+
+
+def exact_percentile(sorted_values: list, p: float) -> float:
+    return sorted_values[max(0, math.ceil(len(sorted_values) * p / 100) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    histogram = LatencyHistogram()
+
+    def timer_pair():
+        stop_timer('bench', start_timer())
+
+    variants = (
+        ('LatencyHistogram.record', lambda: histogram.record(123_456)),
+        ('MetricsRegistry.record', lambda: registry.record('bench', 123_456, 98_765)),
+        ('start_timer + stop_timer', timer_pair),
+    )
+    print(f"{'Operation':<26} | {'ns/call':>8}")
+    print("-" * 38)
+    for label, func in variants:
+        best = min(timeit.repeat(func, number=args.calls, repeat=args.repeat))
+        print(f"{label:<26} | {best / args.calls * 1e9:>8.1f}")
+
+    rng = random.Random(42)
+    samples = [int(rng.lognormvariate(math.log(2e6), 1.0)) for _ in range(args.calls)]
+    accuracy = LatencyHistogram()
+    for value in samples:
+        accuracy.record(value)
+    samples.sort()
+    print(f"\n{'Percentile':<10} | {'exact ms':>9} | {'histogram ms':>12} | {'error':>6}")
+    print("-" * 46)
+    for p in (50, 95, 99):
+        exact = exact_percentile(samples, p)
+        approx = accuracy.percentile(p)
+        print(f"{'p' + str(p):<10} | {exact / 1e6:>9.3f} | {approx / 1e6:>12.3f} | {(approx - exact) / exact:>6.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Per-call overhead of the RBAC decorators.
+
+Run from the project root:
+    python -m benchmarks.bench_permissions [--calls 1000000]
+
+Compares an undecorated call with require_role (string comparison) and
+require_permission (one bitwise test against the mask compiled at login),
+reporting nanoseconds per call and the overhead over the bare call.
+"""
+import argparse
+import timeit
+
+from student_management_system.decorators.auth import require_role, require_permission
+from student_management_system.models.user import Teacher
+from student_management_system import permissions
+
+
+def bare(current_user=None):
+    return current_user
+
+
+@require_role('Teacher')
+def by_role(current_user=None):
+    return current_user
+
+
+@require_permission('attendance.mark')
+def by_permission(current_user=None):
+    return current_user
+
+
+@require_permission('attendance.mark', 'grades.assign', 'students.view')
+def by_three_permissions(current_user=None):
+    return current_user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--calls', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    user = Teacher('bench_teacher', None)
+    permissions.grant(user)
+
+    results = {}
+    for label, func in (('undecorated', bare), ('require_role', by_role),
+                        ('require_permission (1)', by_permission),
+                        ('require_permission (3)', by_three_permissions)):
+        best = min(timeit.repeat(lambda: func(current_user=user), number=args.calls, repeat=args.repeat))
+        results[label] = best / args.calls * 1e9
+
+    baseline = results['undecorated']
+    print(f"{'Variant':<24} | {'ns/call':>8} | {'overhead ns':>11}")
+    print("-" * 50)
+    for label, ns in results.items():
+        print(f"{label:<24} | {ns:>8.1f} | {ns - baseline:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Latency of the user search index at a large user count.
+
+Run from the project root:
+    python -m benchmarks.bench_search [--users 100000] [--queries 2000] [--target-ms 1.0]
+
+Indexes synthetic users named like 'james_smith42' (a small pool of first
+and last names, so many usernames share long prefixes and most trigrams are
+common) and reports p50/p99 latency for:
+  - search-as-you-type: search() on every prefix of a username, as typed;
+  - typo lookups: search() on usernames with two adjacent letters swapped,
+    with the share of lookups whose intended user was suggested;
+  - updates: one rename applied through sync() against a full rebuild.
+Exits with status 1 if a search-as-you-type or typo p99 exceeds --target-ms.
+Timed loops run with the garbage collector paused, as timeit does.
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+
+from student_management_system.storage.search_index import SearchIndex
+
+FIRST = ("james mary robert patricia john jennifer michael linda david elizabeth william barbara richard susan "
+         "joseph jessica thomas sarah charles karen daniel nancy matthew lisa anthony betty mark sandra paul "
+         "emily andrew donna joshua michelle kevin amanda brian dorothy george melissa alisher dilnoza bobur "
+         "shavkat aziz nodira rustam malika timur gulnora").split()
+LAST = ("smith johnson williams brown jones garcia miller davis rodriguez martinez wilson anderson taylor "
+        "thomas moore jackson martin lee thompson white harris clark lewis walker young allen king wright "
+        "karimov rahimov usmonov tursunov yusupov").split()
+
+
+def build_users(count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    users = []
+    for n in range(1, count + 1):
+        role = rng.choice(('Student',) * 8 + ('Teacher', 'Admin'))
+        users.append({
+            '_user_id': f"{role[0]}-{n:06d}",
+            '_username': f"{rng.choice(FIRST)}_{rng.choice(LAST)}{rng.randint(1, 99)}",
+            '_role': role,
+            '_is_active': True,
+        })
+    return users
+
+
+def percentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def time_calls(func, inputs) -> list:
+    # Like timeit, keep the collector out of the timings: a full pass over a
+    # 100k-user heap is a property of the heap, not of the call it lands in
+    samples = []
+    gc.collect()
+    gc.disable()
+    try:
+        for value in inputs:
+            started = time.perf_counter()
+            func(value)
+            samples.append((time.perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    return samples
+
+
+def report(label: str, samples: list) -> float:
+    p99 = percentile(samples, 99)
+    print(f"{label:<22} | {len(samples):>7} | {percentile(samples, 50):>8.3f} | {p99:>8.3f} | {max(samples):>8.3f}")
+    return p99
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--limit', type=int, default=10)
+    parser.add_argument('--target-ms', type=float, default=1.0)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    users = build_users(args.users)
+    started = time.perf_counter()
+    index = SearchIndex(users)
+    build_ms = (time.perf_counter() - started) * 1000
+    print(f"Indexed {len(index)} users in {build_ms:.0f} ms\n")
+
+    typed = []
+    while len(typed) < args.queries:
+        name = rng.choice(users)['_username']
+        typed.extend(name[:k] for k in range(1, len(name) + 1))
+    typos = []
+    for user in rng.sample(users, args.queries):
+        name = user['_username']
+        i = rng.randrange(len(name) - 1)
+        typos.append((name[:i] + name[i + 1] + name[i] + name[i + 2:], user['_user_id']))
+
+    print(f"{'Operation':<22} | {'calls':>7} | {'p50 ms':>8} | {'p99 ms':>8} | {'max ms':>8}")
+    print("-" * 66)
+    as_you_type = report('search as you type', time_calls(lambda q: index.search(q, args.limit), typed[:args.queries]))
+    report('prefix (students)', time_calls(lambda q: index.prefix(q, args.limit, 'Student'), typed[:args.queries]))
+    typo = report('search with typo', time_calls(lambda q: index.search(q[0], args.limit), typos))
+    found = sum(any(r['_user_id'] == uid for r in index.search(q, args.limit)) for q, uid in typos)
+
+    renamed = []
+    for user in rng.sample(users, 50):
+        copy = list(users)
+        copy[users.index(user)] = dict(user, _username=user['_username'] + 'x')
+        renamed.append(copy)
+    report('sync one rename', time_calls(index.sync, renamed))
+    report('full rebuild', time_calls(SearchIndex, renamed[:3]))
+
+    print(f"\nTypo lookups suggesting the intended user: {found / len(typos):.1%}")
+    if max(as_you_type, typo) > args.target_ms:
+        print(f"FAIL: p99 above the {args.target_ms} ms target")
+        return 1
+    print(f"OK: p99 within the {args.target_ms} ms target")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
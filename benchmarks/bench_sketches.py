@@ -0,0 +1,99 @@
+"""
+Benchmark streaming grade sketches against exact computation.
+
+Run from the project root:
+    python -m benchmarks.bench_sketches [--n 1000000] [--shards 8] [--k 200]
+
+For each stream size it reports time and peak memory of exact quantiles
+(keep every value, sort) versus KLLSketch + FixedHistogram, the worst
+observed rank error of the sketch against its stated bound, and the same
+check after merging per-shard sketches.
+"""
+import argparse
+import bisect
+import random
+import time
+import tracemalloc
+
+from student_management_system.sketches import KLLSketch, FixedHistogram
+
+QUANTILES = (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+def grade_stream(n: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield min(100.0, max(0.0, rng.gauss(72.0, 14.0)))
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def exact(n: int, seed: int):
+    values = sorted(grade_stream(n, seed))
+    return values, [values[min(len(values) - 1, int(q * len(values)))] for q in QUANTILES]
+
+
+def sketched(n: int, seed: int, k: int):
+    sketch, hist = KLLSketch(k, seed), FixedHistogram()
+    for value in grade_stream(n, seed):
+        sketch.update(value)
+        hist.update(value)
+    return sketch, sketch.quantiles(QUANTILES)
+
+
+def sharded(n: int, seed: int, k: int, shards: int):
+    merged = KLLSketch(k, seed)
+    rng = random.Random(seed)
+    parts = [KLLSketch(k, seed + i) for i in range(shards)]
+    for value in grade_stream(n, seed):
+        parts[rng.randrange(shards)].update(value)
+    for part in parts:
+        merged.merge(part)
+    return merged, merged.quantiles(QUANTILES)
+
+
+def worst_rank_error(sorted_values: list, estimates: list) -> float:
+    n = len(sorted_values)
+    worst = 0.0
+    for q, estimate in zip(QUANTILES, estimates):
+        lo = bisect.bisect_left(sorted_values, estimate) / n
+        hi = bisect.bisect_right(sorted_values, estimate) / n
+        # Distance from q to the rank interval occupied by the estimate
+        worst = max(worst, 0.0 if lo <= q <= hi else min(abs(q - lo), abs(q - hi)))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=1_000_000, help="largest stream size")
+    parser.add_argument('--shards', type=int, default=8)
+    parser.add_argument('--k', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    sizes = [size for size in (10_000, 100_000, 1_000_000, 10_000_000) if size <= args.n]
+    print(f"{'N':>10} | {'Method':<8} | {'Time (s)':>9} | {'Peak KiB':>9} | {'Retained':>9} | {'Rank err':>8} | {'Bound':>6}")
+    print("-" * 78)
+    for n in sizes:
+        (values, _), t_exact, m_exact = measure(lambda: exact(n, args.seed))
+        print(f"{n:>10} | {'exact':<8} | {t_exact:>9.3f} | {m_exact / 1024:>9.0f} | {n:>9} | {0:>8.4f} | {'-':>6}")
+
+        (sketch, est), t_sk, m_sk = measure(lambda: sketched(n, args.seed, args.k))
+        err = worst_rank_error(values, est)
+        print(f"{n:>10} | {'kll':<8} | {t_sk:>9.3f} | {m_sk / 1024:>9.0f} | {sketch.retained():>9} | {err:>8.4f} | {sketch.rank_error:>6.4f}")
+
+        (merged, est), t_mg, m_mg = measure(lambda: sharded(n, args.seed, args.k, args.shards))
+        err = worst_rank_error(values, est)
+        print(f"{n:>10} | {'merged':<8} | {t_mg:>9.3f} | {m_mg / 1024:>9.0f} | {merged.retained():>9} | {err:>8.4f} | {merged.rank_error:>6.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Time from launching main.py to the login prompt.
+
+Run from the project root:
+    python -m benchmarks.bench_startup [--runs 20] [--record LABEL]
+
+Each run starts a fresh interpreter on a throwaway copy of the data
+directory and stops it as soon as 'Username:' is printed. --record appends
+the result to benchmarks/startup_history.csv so the numbers are tracked with
+the code; --importtime also prints the slowest imports of one run.
+"""
+import argparse
+import csv
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY = os.path.join(ROOT, 'benchmarks', 'startup_history.csv')
+PROMPT = b'Username:'
+
+
+def make_workspace() -> str:
+    # main.py uses paths relative to the working directory; keep the real data untouched
+    workspace = tempfile.mkdtemp(prefix='sms-startup-')
+    shutil.copy(os.path.join(ROOT, 'main.py'), workspace)
+    shutil.copytree(
+        os.path.join(ROOT, 'student_management_system'),
+        os.path.join(workspace, 'student_management_system'),
+        ignore=shutil.ignore_patterns('__pycache__', 'backups'),
+    )
+    return workspace
+
+
+def time_to_prompt(workspace: str) -> float:
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, 'main.py'], cwd=workspace,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = b''
+    try:
+        while PROMPT not in output:
+            chunk = proc.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError(f"main.py exited before the login prompt:\n{output.decode(errors='replace')}")
+            output += chunk
+        return time.perf_counter() - start
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def slowest_imports(workspace: str, count: int = 15) -> list:
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                          cwd=workspace, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--record', metavar='LABEL', help="append the result to startup_history.csv")
+    parser.add_argument('--importtime', action='store_true')
+    args = parser.parse_args()
+
+    workspace = make_workspace()
+    try:
+        time_to_prompt(workspace)  # Warm the bytecode cache
+        times = sorted(time_to_prompt(workspace) * 1000 for _ in range(args.runs))
+        imports = slowest_imports(workspace) if args.importtime else []
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    median = statistics.median(times)
+    p90 = times[min(len(times) - 1, int(len(times) * 0.9))]
+    print(f"Time to login prompt over {args.runs} runs: min {times[0]:.1f} ms | median {median:.1f} ms | p90 {p90:.1f} ms")
+    if imports:
+        print("\nSlowest imports (cumulative us):")
+        for micros, name in imports:
+            print(f"{micros:>9} | {name}")
+
+    if args.record:
+        new_file = not os.path.exists(HISTORY)
+        with open(HISTORY, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow(['date', 'label', 'python', 'runs', 'min_ms', 'median_ms', 'p90_ms'])
+            writer.writerow([date.today().isoformat(), args.record, platform.python_version(), args.runs,
+                             f"{times[0]:.1f}", f"{median:.1f}", f"{p90:.1f}"])
+        print(f"Recorded in {os.path.relpath(HISTORY, ROOT)}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,90 +1,347 @@
+import os
 import sys
-from colorama import Fore, Style
+import time
+from datetime import date
+# Only what the login prompt needs is imported here. Models, analytics, the
+# scheduler, logging and colorama are imported by boot_services() on a
+# background thread while the user types (see benchmarks/bench_startup.py).
 from student_management_system.storage.storage_manager import StorageManager
 from student_management_system.ui import prompts, menus
-from student_management_system.models.user import Admin, Teacher, Student
-from student_management_system import utils
+from student_management_system import utils, config
+from student_management_system.session import Session
+from student_management_system import permissions
+from student_management_system import metrics
+from student_management_system.deferred import Deferred
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from student_management_system.models.user import Teacher
+    from student_management_system.early_warning import EarlyWarningEngine
 
 # Configuration
 DATA_DIR = "student_management_system/data"
-RED = Fore.RED
-GREEN = Fore.GREEN
-YELLOW = Fore.YELLOW
-BLUE = Fore.BLUE
-RESET = Style.RESET_ALL
-
-# --- Helpers for Data Mapping ---
-# StorageManager and Utils expect keys with underscores (e.g., '_username').
-# Domain Models (Admin.add_user) expect keys without underscores (e.g., 'username').
-# We map between them at the controller level (main.py).
-
-def map_storage_to_domain(data: dict) -> dict:
-    """Convert keys from storage format (_key) to domain format (key)."""
-    return {k.lstrip('_'): v for k, v in data.items()}
-
-def map_domain_to_storage(data: dict) -> dict:
-    """Convert keys from domain format (key) to storage format (_key)."""
-    return {f"_{k}" if not k.startswith('_') else k: v for k, v in data.items()}
-
-def create_user_from_dict(data: dict):
-    """Helper to instantiate appropriate User subclass from valid storage dict."""
-    # Ensure we use storage keys (_username, etc)
-    role = data.get('_role')
-    username = data.get('_username')
-    password_hash = data.get('_password_hash')
-    is_active = data.get('_is_active', True)
-
-    user = None
-    if role == 'Admin':
-        user = Admin(username, password_hash, is_active)
-    elif role == 'Teacher':
-        user = Teacher(username, password_hash, is_active)
-    elif role == 'Student':
-        user = Student(username, password_hash, is_active)
+# Set by use_colors() once the background boot has imported colorama
+RED = GREEN = YELLOW = BLUE = RESET = ""
+
+def use_colors():
+    """Bind the colour codes; nothing is printed in colour before login."""
+    global RED, GREEN, YELLOW, BLUE, RESET
+    from colorama import Fore, Style
+    RED, GREEN, YELLOW, BLUE = Fore.RED, Fore.GREEN, Fore.YELLOW, Fore.BLUE
+    RESET = Style.RESET_ALL
+
+# Menu action -> permission it requires; masks are computed once at import
+ACTION_PERMISSIONS = {
+    'Admin': {'1': 'users.manage', '2': 'users.manage', '3': 'users.manage', '4': 'groups.manage',
+              '5': 'groups.manage', '6': 'groups.manage', '7': 'users.view', '8': 'groups.view',
+              '9': 'courses.manage', '10': 'reports.generate', '11': 'reports.generate', '12': 'users.manage',
+              '13': 'system.stats'},
+    'Teacher': {'1': 'attendance.mark', '2': 'grades.assign', '3': 'students.view', '4': 'reports.view',
+                '5': 'attendance.mark', '6': 'groups.view'},
+    'Student': {'1': 'attendance.view_own', '2': 'grades.view_own', '3': 'courses.enroll'},
+}
+ACTION_MASKS = {
+    role: {action: permissions.table.mask(name) for action, name in actions.items()}
+    for role, actions in ACTION_PERMISSIONS.items()
+}
+
+MENU_OPTIONS = {'Admin': menus.ADMIN_OPTIONS, 'Teacher': menus.TEACHER_OPTIONS, 'Student': menus.STUDENT_OPTIONS}
+
+def start_menu_timer(role: str, action: str) -> tuple:
+    """Start timing (and, if selected, profiling) a menu action named 'Menu: <role>: <label>'."""
+    from student_management_system.profiling import profiler
+    name = f"Menu: {role}: {MENU_OPTIONS[role].get(action, action)}"
+    return (name, metrics.start_timer(), profiler.begin(name))
+
+def finish_menu_timer(pending: tuple):
+    """Record and profile-dump a menu action started by start_menu_timer()."""
+    from student_management_system.profiling import profiler
+    name, started, profile_token = pending
+    metrics.stop_timer(name, started)
+    profiler.finish(profile_token)
+
+def display_performance_stats(snapshot: dict):
+    """Print p50/p95/p99 wall and CPU times per action."""
+    print(f"\n{BLUE}--- Performance Stats (ms) ---{RESET}")
+    print(f"{BLUE}{'Action':<36} | {'Count':>6} | {'Wall p50':>9} | {'p95':>9} | {'p99':>9} | {'CPU p50':>9} | {'p95':>9} | {'p99':>9}{RESET}")
+    print("-" * 116)
+    for name, stats in snapshot.items():
+        wall, cpu = stats['wall'], stats['cpu']
+        print(f"{name[:36]:<36} | {wall['count']:>6} | {wall['p50_ms']:>9.3f} | {wall['p95_ms']:>9.3f} | {wall['p99_ms']:>9.3f} | "
+              f"{cpu['p50_ms']:>9.3f} | {cpu['p95_ms']:>9.3f} | {cpu['p99_ms']:>9.3f}")
+    print("Menu wall times include time spent at the action's own prompts.")
+
+def authorize(session: Session, role: str, action: str) -> bool:
+    """Check a menu action against the session's cached permission bitset."""
+    required = ACTION_MASKS.get(role, {}).get(action)
+    if required is None or session.can(required):
+        return True
+    from student_management_system.decorators.logger import audit
+    user_id = getattr(session.current_user, '_user_id', None) or "Unknown"
+    audit(f"{role} Menu {action}", user_id, "FAILURE", error="Permission denied")
+    prompts.display_error("Permission denied.")
+    return False
+
+def build_attendance_rows(teacher: 'Teacher', roster: list, course_id: str, date: str, exceptions: dict = None) -> list:
+    """
+    One attendance row per student on the roster, ready for a single append.
+    Args:
+        teacher (Teacher): The teacher marking attendance.
+        roster (list): Student IDs.
+        course_id (str): The course.
+        date (str): Date in YYYY-MM-DD format.
+        exceptions (dict): {student_id: status}; everyone else is Present.
+    Returns:
+        list: Storage rows (student_id, course_id, date, status, marked_by).
+    """
+    exceptions = exceptions or {}
+    record_dict = teacher.mark_attendance(roster, date)
+    return [
+        {
+            'student_id': sid,
+            'course_id': course_id,
+            'date': record_dict['date'],
+            'status': exceptions.get(sid, 'P'),
+            'marked_by': record_dict['teacher_id']
+        }
+        for sid in record_dict['present_students']
+    ]
+
+def save_class_attendance(storage: StorageManager, warnings: 'EarlyWarningEngine', teacher: 'Teacher',
+                          roster: list, class_session: dict):
+    """
+    Ask for the non-Present exceptions and store the whole roster in one append.
+    Args:
+        roster (list): Student IDs; everyone not listed as an exception is Present.
+        class_session (dict): course_id and date from prompt_class_session().
+    """
+    exceptions = prompts.prompt_status_exceptions(roster)
+    new_rows = build_attendance_rows(teacher, roster, class_session['course_id'], class_session['date'], exceptions)
+    marked_at = time.time()
+    if storage.append_attendance(new_rows):
+        present = sum(1 for row in new_rows if row['status'] == 'P')
+        prompts.display_message(f"Attendance marked for {len(new_rows)} student(s), {present} present.")
+        display_risk_crossings(warnings, marked_at)
     else:
+        prompts.display_error("Failed to save attendance.")
+
+def browse_users(storage: StorageManager, title: str, render, role: str = None, choose_role: bool = True) -> object:
+    """
+    Print users one page at a time from the cached user index.
+    Args:
+        title (str): Listing heading.
+        render (callable): Formats one storage record as a line.
+        role (str): Fixed role filter (skips the role prompt when set).
+        choose_role (bool): Whether to ask for a role filter.
+    Returns:
+        UserIndex|None: The index that was browsed, or None if nothing matched.
+    """
+    view = prompts.prompt_list_view(allow_role=choose_role and role is None)
+    role = role or view['role']
+    index = storage.load_user_index()
+    cursors = [None]  # Cursor of every page shown so far, for going back
+    while True:
+        page = index.page(view['sort'], role, cursors[-1], config.PAGE_SIZE)
+        if not page['items']:
+            return None
+        first = page['offset'] + 1
+        print(f"\n--- {title} ({first}-{first + len(page['items']) - 1} of {page['total']}) ---")
+        for u in page['items']:
+            print(render(u))
+        command = prompts.prompt_page_command(page['next_cursor'] is not None, len(cursors) > 1)
+        if command == 'n':
+            cursors.append(page['next_cursor'])
+        elif command == 'p':
+            cursors.pop()
+        else:
+            return index
+
+def resolve_user(storage: StorageManager, text: str, role: str = None):
+    """
+    Turn a typed username or user ID into a storage record, offering the
+    closest matches from the search index when it is not exact.
+    Returns:
+        dict|None: The storage record, or None if nothing was chosen.
+    """
+    record = storage.lookup_user(text, role)
+    if record is None and text.strip():
+        matches = storage.search_users(text, config.SEARCH_SUGGESTIONS, role)
+        record = prompts.prompt_pick(matches, lambda u: f"{u.get('_user_id')} | {u.get('_role')} | {u.get('_username')}")
+    return record
+
+def display_risk_crossings(warnings: 'EarlyWarningEngine', since: float):
+    """Print students who moved to a higher risk level since `since`."""
+    for event in warnings.crossed_since(since):
+        color = RED if event['to'] == 'Critical' else YELLOW
+        print(f"{color}[EARLY WARNING] {event['student_id']}: {event['from']} -> {event['to']} ({', '.join(event['reasons'])}){RESET}")
+
+def boot_services(storage: StorageManager) -> dict:
+    """
+    Startup work the login prompt does not need; runs on a background thread.
+    Returns:
+        dict: 'valid' and, if the data is valid, 'warnings', 'rankings' and 'scheduler'.
+    """
+    # Warm the imports used after login
+    import colorama  # noqa: F401
+    from student_management_system.models import user  # noqa: F401
+    from student_management_system import bulk_users  # noqa: F401
+    from student_management_system.early_warning import EarlyWarningEngine
+    from student_management_system.ranking import RankingIndex
+    from student_management_system.scheduler import ReportScheduler
+    from student_management_system.decorators.logger import system_logger
+
+    if not storage.validate_data_integrity():
+        return {'valid': False}
+
+    # Risk state is primed once here and then kept current by storage writes
+    warnings = EarlyWarningEngine.from_storage(storage)
+    storage.add_listener(warnings.on_storage_write)
+    rankings = RankingIndex.from_storage(storage)
+    storage.add_listener(rankings.on_storage_write)
+
+    scheduler = ReportScheduler(storage)
+    scheduler.start()
+    if config.NIGHTLY_REPORT_TIME:
+        scheduler.schedule_daily('all', config.NIGHTLY_REPORT_TIME)
+
+    system_logger.info("System started")
+    return {'valid': True, 'warnings': warnings, 'rankings': rankings, 'scheduler': scheduler}
+
+def join_boot(boot: Deferred) -> dict:
+    """
+    Wait for boot_services() and report a failed boot.
+    Returns:
+        dict: The boot_services() result, or None if the boot raised or found invalid data.
+    """
+    try:
+        services = boot.result()
+    except Exception as e:
+        print(f"CRITICAL ERROR: Startup failed: {e}")
         return None
-    
-    if '_user_id' in data:
-        user._user_id = data['_user_id']
-    
-    return user
+    if not services['valid']:
+        print("CRITICAL ERROR: Data integrity validation failed.")
+        return None
+    return services
+
+def shutdown(storage: StorageManager, boot: Deferred, metrics_dumper: metrics.MetricsDumper):
+    """Stop background work, back up data, flush pending metrics and log records, and exit."""
+    try:
+        scheduler = boot.result().get('scheduler')
+    except Exception:
+        scheduler = None
+    if scheduler is not None:
+        scheduler.stop()
+    metrics_dumper.stop()
+    print("Backing up data...")
+    storage.backup_data()
+    from student_management_system.decorators.logger import system_logger, shutdown_logging
+    system_logger.info("System shutdown")
+    shutdown_logging()
+    print("Goodbye!")
+    sys.exit(0)
 
 def main():
     print("Initializing Student Progress and Attendance Management System...")
     
     # 1. System Boot
     storage = StorageManager(DATA_DIR)
-    
-    if not storage.validate_data_integrity():
-        print("CRITICAL ERROR: Data integrity validation failed.")
-        sys.exit(1)
-        
+    # Validation, analytics priming and the scheduler overlap with the login prompt;
+    # the first login attempt waits for them before any data is read
+    boot = Deferred(boot_services, storage, name='boot')
+
+    # Latency histograms are written to config.METRICS_FILE every METRICS_DUMP_SECONDS
+    metrics_dumper = metrics.MetricsDumper()
+    metrics_dumper.start()
+
     print("System initialized successfully.")
+    permissions.table.set_source(os.path.join(DATA_DIR, config.PERMISSIONS_FILE))
 
+    try:
+        run_session(storage, boot)
+    except KeyboardInterrupt:
+        print("\n\nShutdown requested via Ctrl+C.")
+    shutdown(storage, boot, metrics_dumper)
+
+def serve(argv=None) -> int:
+    """Host many sessions over TCP against one shared in-memory store (see server.py)."""
+    import argparse
+    import asyncio
+    from student_management_system.server import SessionServer
+    from student_management_system.storage.shared_store import SharedStore
+
+    parser = argparse.ArgumentParser(prog='python main.py serve')
+    parser.add_argument('--host', default=config.SERVER_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVER_PORT)
+    parser.add_argument('--max-sessions', type=int, default=config.SERVER_MAX_SESSIONS)
+    args = parser.parse_args(argv)
+
+    store = SharedStore(DATA_DIR)
+    boot = Deferred(boot_services, store, name='boot')
+    if join_boot(boot) is None:
+        return 1
+    use_colors()
+    permissions.table.set_source(os.path.join(DATA_DIR, config.PERMISSIONS_FILE))
+    metrics_dumper = metrics.MetricsDumper()
+    metrics_dumper.start()
+
+    server = SessionServer(store, lambda: run_session(store, boot), args.host, args.port, args.max_sessions)
+    print(f"Serving sessions on {args.host}:{args.port} (connect with: python -m student_management_system.server connect). Ctrl+C to stop.")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\nStopping: ending sessions and committing pending writes.")
+    print(f"{store.writes} write(s) committed in {store.commits} batch(es).")
+    shutdown(store, boot, metrics_dumper)
+
+def run_session(storage: StorageManager, boot: Deferred):
+    """
+    One interactive session (login, menus, logout) that returns when the user picks Exit.
+    Args:
+        storage (StorageManager): The storage, shared by every session of a server.
+        boot (Deferred): The boot_services() run; joined on the first login attempt.
+    """
+    # Holds the logged-in user and a users.json snapshot reused across menu actions
+    session = Session(storage)
     current_user = None
+    pending_action = None
+    services = None
 
     try:
         while True:
+            # The previous menu action ends here, whether it ran to the end or hit `continue`
+            if pending_action is not None:
+                finish_menu_timer(pending_action)
+                pending_action = None
+
             # 2. Authentication Loop
             if not current_user:
                 username, password = prompts.prompt_login()
+
+                if services is None:
+                    services = join_boot(boot)
+                    if services is None:
+                        sys.exit(1)
+                    warnings, rankings = services['warnings'], services['rankings']
+                    scheduler = services['scheduler']
+                    use_colors()
+                    # Already imported by boot_services(), so these are dictionary lookups
+                    from student_management_system.ranking import OVERALL
+                    from student_management_system.models.user import User, ROLE_CLASSES
+                    from student_management_system import passwords, bulk_users
+                    from student_management_system.decorators.logger import audit
                 
-                users_data = storage.load_users()
-                found_user_data = None
-                
-                for u_data in users_data:
-                    if u_data.get('_username') == username:
-                        found_user_data = u_data
-                        break
+                users_data = session.users()
+                found_user_data = session.find_user(username)
                 
                 if found_user_data:
                     # Enforce Active Status
                     if not found_user_data.get('_is_active', True):
+                         audit("Login", found_user_data.get('_user_id', username), "FAILURE", error="Account is inactive")
                          prompts.display_error("Login failed. Account is inactive.")
                          continue
 
                     # Instantiate user
-                    user_obj = create_user_from_dict(found_user_data)
+                    user_obj = User.from_record(found_user_data)
                     
                     if not user_obj:
                         prompts.display_error("Login failed. System error: Invalid user role.")
@@ -92,73 +349,83 @@ def main():
 
                     if user_obj.authenticate(password):
                          current_user = user_obj
+                         session.login(user_obj, found_user_data.get('_permissions'))
+                         # Lazy rehash: upgrade plaintext or outdated hashes to the current policy
+                         if passwords.needs_rehash(user_obj._password_hash):
+                             new_hash = passwords.hash_password(password)
+                             passwords.set_password_hash(found_user_data, new_hash)
+                             if session.save_users(users_data):
+                                 user_obj._password_hash = new_hash
                          prompts.display_message(f"Welcome, {current_user._username}!")
                     else:
                         prompts.display_error("Login failed. Invalid credentials.")
                 else:
+                    # Unknown usernames are audited under the name that was tried
+                    audit("Login", username, "FAILURE", error="Unknown user")
                     prompts.display_error("Login failed. Invalid credentials.")
             
             else:
                 # 3. Role Routing
                 role = current_user._role
                 action = None
+                # Picks up permission table edits without a restart (one stat() per action)
+                session.refresh_permissions()
 
                 if role == 'Admin':
                     # Populate Admin state with current users/groups for management
-                    # Current storage data is underscored. Convert to domain for Admin logic.
-                    raw_users = storage.load_users()
-                    current_user._users = [map_storage_to_domain(u) for u in raw_users]
-                    # Groups management is purely runtime/mock in storage currently, 
-                    # but we initialize list to avoid errors if logic expects it.
-                    current_user._groups = [] 
+                    # Admin works on the session's storage records directly; the
+                    # session only reloads them when users.json has changed.
+                    current_user._users = session.users()
+                    # Groups live in groups.json; the index is only rebuilt when the file changes.
+                    # Admin edits copies, so a failed save cannot leave the cached index out of sync.
+                    group_index = storage.load_group_index()
+                    current_user._groups = [dict(g, members=list(g.get('members', []))) for g in group_index.groups]
 
                     action = menus.admin_menu()
+                    if not authorize(session, role, action):
+                        continue
+                    pending_action = start_menu_timer(role, action)
                     
                     # 4. Action Dispatching (Admin)
                     if action == '1': # Add User
-                        raw_input = prompts.prompt_user_details()
-                        # prompts likely returns underscored keys based on legacy code.
-                        # Clean them for Admin Logic.
-                        clean_input = map_storage_to_domain(raw_input)
-                        
-                        # Generate ID if missing (Admin logic might not do it)
-                        if 'user_id' not in clean_input:
-                            count = len(current_user._users) + 1
-                            prefix = clean_input.get('role', 'User')[0].upper()
-                            clean_input['user_id'] = f"{prefix}-{count:03d}"
+                        details = prompts.prompt_user_details()
+                        # The username check comes first so a rejected add doesn't burn an ID
+                        if any(u.get('_username') == details['_username'] for u in current_user._users):
+                            prompts.display_error("User already exists or creation failed.")
+                            continue
+                        # Only the hash is ever stored
+                        new_user = ROLE_CLASSES[details['_role']](
+                            details['_username'], passwords.hash_password(details['_password']),
+                            details['_is_active'], user_id=storage.next_user_id(details['_role']))
 
-                        if current_user.add_user(clean_input):
+                        if current_user.add_user(new_user.to_record()):
                             # Save back to storage
-                            # Convert Admin's internal list back to storage format
-                            users_to_save = [map_domain_to_storage(u) for u in current_user._users]
-                            if storage.save_users(users_to_save):
-                                prompts.display_message(f"User {clean_input['username']} created successfully.")
+                            if session.save_users(current_user._users):
+                                prompts.display_message(f"User {new_user._username} created successfully.")
                             else:
                                 prompts.display_error("Failed to save user.")
                         else:
                             prompts.display_error("User already exists or creation failed.")
 
                     elif action == '2': # Update User
-                        username_to_update = input("Enter username to update: ")
-                        # We need to find the ID or pass data that includes ID if update_user requires it
+                        username_to_update = input("Enter username or ID to update: ")
                         # Admin.update_user logic requires 'user_id'. Find it first.
-                        target_user = next((u for u in current_user._users if u['username'] == username_to_update), None)
+                        target_user = resolve_user(storage, username_to_update)
                         
                         if target_user:
                             print("Enter new details (leave blank to keep current):")
-                            new_username = input(f"New username ({target_user['username']}): ").strip()
-                            active_input = input(f"Is active? (y/n) ({'y' if target_user.get('is_active', True) else 'n'}): ").strip().lower()
+                            new_username = input(f"New username ({target_user['_username']}): ").strip()
+                            active_input = input(f"Is active? (y/n) ({'y' if target_user.get('_is_active', True) else 'n'}): ").strip().lower()
                             
-                            update_payload = {'user_id': target_user['user_id']}
+                            update_payload = {'_user_id': target_user['_user_id']}
                             if new_username:
-                                update_payload['username'] = new_username
+                                update_payload['_username'] = new_username
                             if active_input in ['y', 'n']:
-                                update_payload['is_active'] = (active_input == 'y')
+                                update_payload['_is_active'] = (active_input == 'y')
                             
                             if current_user.update_user(update_payload):
                                 # Save
-                                users_to_save = [map_domain_to_storage(u) for u in current_user._users]
-                                if storage.save_users(users_to_save):
+                                if session.save_users(current_user._users):
                                     prompts.display_message("User updated successfully.")
                                 else:
                                     prompts.display_error("Failed to save changes.")
@@ -168,25 +435,16 @@ def main():
                             prompts.display_error("User not found.")
 
                     elif action == '3': # Delete User
-                        # Refresh list to be sure
-                        raw_users = storage.load_users()
-                        if raw_users:
-                            print("\n--- Users List ---")
-                            for u in raw_users:
-                                print(f"ID: {u.get('_user_id')} | Name: {u.get('_username')}")
-                            
-                            username_del = input("Input username to delete: ")
+                        if browse_users(storage, "Users List", lambda u: f"ID: {u.get('_user_id')} | Name: {u.get('_username')}"):
+                            username_del = input("Input username or ID to delete: ")
                             # We need ID for remove_user
-                            target = next((u for u in raw_users if u.get('_username') == username_del), None)
+                            target = resolve_user(storage, username_del)
                             
                             if target:
                                 user_id_del = target.get('_user_id')
-                                # Sync admin internal list again just in case
-                                current_user._users = [map_storage_to_domain(u) for u in raw_users]
                                 
                                 if current_user.remove_user(user_id_del):
-                                    users_to_save = [map_domain_to_storage(u) for u in current_user._users]
-                                    if storage.save_users(users_to_save):
+                                    if session.save_users(current_user._users):
                                         prompts.display_message("User deleted successfully.")
                                     else:
                                         prompts.display_error("Failed to save deletion.")
@@ -198,64 +456,196 @@ def main():
                             prompts.display_message("No users to delete.")
 
                     elif action == '4': # Add Group
-                        # Group persistence is not supported by StorageManager, but we implement UI/Logic
-                        g_name = input("Enter Group Name: ")
-                        g_id = f"G-{len(current_user._groups) + 1:03d}"
-                        if current_user.add_group({'group_id': g_id, 'name': g_name}):
-                            prompts.display_message(f"Group {g_name} added (Session Only - No Persistence).")
+                        g_name = input("Enter Group Name: ").strip()
+                        if not g_name:
+                            prompts.display_error("Group name required.")
+                            continue
+                        members = prompts.prompt_id_list("Student IDs")
+                        known_ids = {u.get('_user_id') for u in session.students()}
+                        unknown = [sid for sid in members if sid not in known_ids]
+                        if unknown:
+                            prompts.display_error(f"Unknown student ID(s): {', '.join(unknown)}")
+                            continue
+                        g_id = storage.next_group_id()
+                        if current_user.add_group({'group_id': g_id, 'name': g_name, 'members': members}):
+                            if storage.save_groups(current_user._groups):
+                                prompts.display_message(f"Group {g_name} ({g_id}) created with {len(members)} member(s).")
+                            else:
+                                prompts.display_error("Failed to save group.")
                         else:
                             prompts.display_error("Failed to add group.")
 
                     elif action == '5': # Update Group
-                         prompts.display_message("Update Group feature is not persistent and skipped for CLI demo.")
+                        g_id = input("Enter Group ID to update: ").strip()
+                        target_group = group_index.get(g_id)
+                        if target_group:
+                            print(f"Members: {', '.join(target_group['members']) or 'none'}")
+                            new_name = input(f"New name ({target_group.get('name')}): ").strip()
+                            to_add = prompts.prompt_id_list("Student IDs to add")
+                            to_remove = set(prompts.prompt_id_list("Student IDs to remove"))
+                            known_ids = {u.get('_user_id') for u in session.students()}
+                            unknown = [sid for sid in to_add if sid not in known_ids]
+                            if unknown:
+                                prompts.display_error(f"Unknown student ID(s): {', '.join(unknown)}")
+                                continue
+
+                            members = [sid for sid in target_group['members'] if sid not in to_remove]
+                            members += [sid for sid in to_add if sid not in members]
+                            update_payload = {'group_id': g_id, 'members': members}
+                            if new_name:
+                                update_payload['name'] = new_name
+                            if current_user.update_group(update_payload):
+                                if storage.save_groups(current_user._groups):
+                                    prompts.display_message("Group updated successfully.")
+                                else:
+                                    prompts.display_error("Failed to save changes.")
+                            else:
+                                prompts.display_error("Update failed logic.")
+                        else:
+                            prompts.display_error("Group not found.")
 
                     elif action == '6': # Delete Group
-                         prompts.display_message("Delete Group feature is not persistent and skipped for CLI demo.")
+                        g_id = input("Enter Group ID to delete: ").strip()
+                        if current_user.remove_group(g_id):
+                            if storage.save_groups(current_user._groups):
+                                prompts.display_message("Group deleted successfully.")
+                            else:
+                                prompts.display_error("Failed to save deletion.")
+                        else:
+                            prompts.display_error("Group not found.")
 
                     elif action == '7': # Show Users
-                        raw_users = storage.load_users()
-                        if raw_users:
-                            print("\n--- Users List ---")
-                            for u in raw_users:
-                                print(f"ID: {u.get('_user_id')} | Role: {u.get('_role')} | Name: {u.get('_username')}")
-                        else:
+                        if not browse_users(storage, "Users List", lambda u: f"ID: {u.get('_user_id')} | Role: {u.get('_role')} | Name: {u.get('_username')}"):
                             prompts.display_message("No users found.")
 
                     elif action == '8': # Show Groups
-                        # Show session groups
                         if current_user._groups:
+                            print("\n--- Groups List ---")
                             for g in current_user._groups:
-                                print(f"ID: {g.get('group_id')} | Name: {g.get('name')}")
+                                print(f"ID: {g.get('group_id')} | Name: {g.get('name')} | Members ({len(g['members'])}): {', '.join(g['members'])}")
                         else:
-                            prompts.display_message("No groups active in this session.")
+                            prompts.display_message("No groups found.")
 
                     elif action == '9': # Course Management
-                        prompts.display_message("Course Management Module is currently a placeholder.")
+                        current_user._courses = storage.load_courses()
+                        enrollment_index = storage.load_enrollment_index()
+                        course_action = menus.course_menu()
+
+                        if course_action == '1': # List Courses
+                            if current_user._courses:
+                                print("\n--- Course Catalog ---")
+                                for c in current_user._courses:
+                                    capacity = c.get('capacity') or 'unlimited'
+                                    print(f"ID: {c['course_id']} | Name: {c.get('name')} | Teacher: {c.get('teacher') or 'n/a'} | Enrolled: {enrollment_index.roster_size(c['course_id'])}/{capacity}")
+                            else:
+                                prompts.display_message("No courses in the catalog.")
+
+                        elif course_action == '2': # Create/Update Course
+                            course_id = input("Enter Course ID (e.g. BIO-101): ").strip().upper()
+                            if not course_id:
+                                prompts.display_error("Course ID required.")
+                                continue
+                            existing = next((c for c in current_user._courses if c.get('course_id') == course_id), None)
+                            course_data = {'course_id': course_id, **prompts.prompt_course_details(existing)}
+                            if current_user.manage_course(course_data):
+                                if storage.save_courses(current_user._courses):
+                                    prompts.display_message(f"Course {course_id} {'updated' if existing else 'created'}.")
+                                else:
+                                    prompts.display_error("Failed to save course.")
+                            else:
+                                prompts.display_error("Course update failed logic.")
+
+                        elif course_action == '3': # Delete Course
+                            course_id = input("Enter Course ID to delete: ").strip().upper()
+                            roster = enrollment_index.roster(course_id)
+                            if current_user.remove_course(course_id):
+                                if storage.save_courses(current_user._courses):
+                                    # Close out the roster with one batched append
+                                    today = date.today().isoformat()
+                                    storage.append_enrollments([
+                                        {'student_id': sid, 'course_id': course_id, 'date': today, 'status': 'dropped'}
+                                        for sid in roster
+                                    ])
+                                    prompts.display_message(f"Course {course_id} deleted; {len(roster)} enrollment(s) dropped.")
+                                else:
+                                    prompts.display_error("Failed to save deletion.")
+                            else:
+                                prompts.display_error("Course not found.")
+
+                        elif course_action == '4': # View Roster
+                            course_id = input("Enter Course ID: ").strip().upper()
+                            roster = enrollment_index.roster(course_id)
+                            if roster:
+                                print(f"\n--- Roster: {course_id} ({len(roster)} students) ---")
+                                for sid in roster:
+                                    print(sid)
+                            else:
+                                prompts.display_message("No students enrolled.")
 
                     elif action == '10': # System Reports
-                        att_records = storage.load_attendance()
-                        grades_records = storage.load_grades()
-                        
-                        # Utils likely expects lists of dicts, doing well.
-                        success_att = utils.generate_attendance_report(att_records)
-                        # Ensure grades are passed correctly
-                        success_prog = utils.generate_progress_report(grades_records)
-                        
-                        if success_att and success_prog:
-                            prompts.display_message("Reports generated in 'reports/' directory.")
+                        # Built on the scheduler's worker thread; the menu returns immediately
+                        job = scheduler.submit('all')
+                        prompts.display_message(f"Report job {job.job_id} queued ({job.status}). Output goes to 'reports/'.")
+                        at_risk = warnings.at_risk()
+                        for sid in sorted(at_risk):
+                            info = at_risk[sid]
+                            color = RED if info['level'] == 'Critical' else YELLOW
+                            print(f"{color}{sid:<10} | {info['level']:<8} | {', '.join(info['reasons'])}{RESET}")
+
+                    elif action == '11': # Report Jobs
+                        jobs = scheduler.jobs()
+                        if jobs:
+                            print("\n--- Report Jobs ---")
+                            for j in jobs:
+                                print(f"ID: {j['job_id']} | Kind: {j['kind']} | Source: {j['source']} | Status: {j['status']} | Progress: {j['progress']}% {j['message']}")
+                            job_id = input("Enter job ID to cancel (blank to go back): ").strip()
+                            if job_id:
+                                if scheduler.cancel(job_id):
+                                    prompts.display_message(f"Job {job_id} cancelled.")
+                                else:
+                                    prompts.display_error("Job not found or already finished.")
                         else:
-                            prompts.display_error("Failed to generate some reports.")
+                            prompts.display_message("No report jobs yet.")
 
-                    elif action == '11': # Logout
+                    elif action == '12': # Bulk User Import
+                        bulk_action = input("Action (add/update/remove): ").strip().lower()
+                        path = input("Path to CSV or JSON file: ").strip()
+                        if bulk_action not in bulk_users.ACTIONS:
+                            prompts.display_error("Invalid action.")
+                        else:
+                            try:
+                                records = bulk_users.read_records(path)
+                            except (IOError, ValueError) as e:
+                                records = None
+                                prompts.display_error(f"Cannot read file: {e}")
+                            if records is not None:
+                                result = bulk_users.apply_batch(current_user, bulk_action, records, storage)
+                                if not result['success']:
+                                    for error in result['errors']:
+                                        print(error)
+                                    prompts.display_error("Batch rejected; no changes were made.")
+                                else:
+                                    # One write for the whole batch
+                                    if session.save_users(current_user._users):
+                                        prompts.display_message(f"{result['count']} user(s) processed ({bulk_action}).")
+                                    else:
+                                        prompts.display_error("Failed to save users.")
+
+                    elif action == '13': # Performance Stats
+                        snapshot = metrics.registry.snapshot()
+                        if snapshot:
+                            display_performance_stats(snapshot)
+                        else:
+                            prompts.display_message("No actions recorded yet.")
+
+                    elif action == '14': # Logout
                         current_user = None
+                        session.logout()
                         prompts.display_message("Logged out.")
 
-                    elif action == '12': # Exit
+                    elif action == '15': # Exit
                         if prompts.prompt_confirmation("Are you sure you want to exit?"):
-                            print("Backing up data...")
-                            storage.backup_data()
-                            print("Goodbye!")
-                            sys.exit(0)
+                            return
                         else:
                              # If canceled, loop continues
                              pass
@@ -265,49 +655,30 @@ def main():
 
                 elif role == 'Teacher':
                     action = menus.teacher_menu()
+                    if not authorize(session, role, action):
+                        continue
+                    pending_action = start_menu_timer(role, action)
                     
-                    if action == '1': # Mark Attendance
-                        att_input = prompts.prompt_attendance_details()
-                        # Input typically: student_id, course_id, date, status
-                        # Teacher logic returns structured dict
-                        students_attending = [att_input['student_id']] # Wrapper for the logic method
-                        
-                        record_dict = current_user.mark_attendance(students_attending, att_input['date'])
-                        
-                        # Enrich record for generic storage (which expects flattened row usually)
-                        # Storage expects: student_id, course_id, date, status, marked_by
-                        # The dict returned by User.mark_attendance is:
-                        # {"date": date, "present_students": [list], "teacher_id": ..., "status": "recorded"}
-                        # We need to adapt this to the CSV structure (one row per student-course-date)
-                        
-                        # NOTE: The User model logic for mark_attendance was:
-                        # args: student_list, date
-                        # returns: dict with student_list
-                        # But storage is CSV with single rows. 
-                        # We must adapt here.
-                        
-                        all_att = storage.load_attendance()
-                        
-                        # Create row(s) per student
-                        saved_count = 0
-                        for sid in record_dict['present_students']:
-                            row = {
-                                'student_id': sid,
-                                'course_id': att_input['course_id'],
-                                'date': record_dict['date'],
-                                'status': att_input['status'],
-                                'marked_by': record_dict['teacher_id']
-                            }
-                            all_att.append(row)
-                            saved_count += 1
-                        
-                        if storage.save_attendance(all_att):
-                            prompts.display_message(f"Attendance marked for {saved_count} student(s).")
-                        else:
-                            prompts.display_error("Failed to save attendance.")
+                    if action == '1': # Mark Class Attendance
+                        class_session = prompts.prompt_class_session()
+                        course_id, session_date = class_session['course_id'], class_session['date']
+                        # The roster is read once for the whole class instead of prompting per student
+                        active_ids = {u.get('_user_id') for u in session.students() if u.get('_is_active', True)}
+                        roster = [sid for sid in storage.load_enrollment_index().roster(course_id) if sid in active_ids]
+                        if not roster:
+                            prompts.display_error(f"No active students are enrolled in {course_id}.")
+                            continue
+                        print(f"\n[Class Attendance] {course_id} on {session_date}: {len(roster)} student(s)")
+                        print(f"Roster: {', '.join(roster)}")
+                        already = storage.load_attendance_index().marked_on(course_id, session_date)
+                        if already and not prompts.prompt_confirmation(
+                                f"{len(already)} student(s) already have attendance for this session. Record again?"):
+                            continue
+                        save_class_attendance(storage, warnings, current_user, roster, class_session)
 
                     elif action == '2': # Assign Grade
-                        g_input = prompts.prompt_grade_details()
+                        g_input = prompts.prompt_grade_details(
+                            resolve_student=lambda text: (resolve_user(storage, text, 'Student') or {}).get('_user_id'))
                         # Input: student_id, course_id, score, max_score, weight
                         
                         # User logic
@@ -324,36 +695,77 @@ def main():
                             'assigned_by': rec_dict['assigned_by']
                         }
                         
-                        all_grades = storage.load_grades()
-                        all_grades.append(row)
-                        
-                        if storage.save_grades(all_grades):
+                        graded_at = time.time()
+                        if storage.append_grades([row]):
                             prompts.display_message("Grade assigned successfully.")
+                            display_risk_crossings(warnings, graded_at)
                         else:
                             prompts.display_error("Failed to save grade.")
 
                     elif action == '3': # View Students
-                        students = storage.load_students()
-                        if students:
-                            print("\n--- Student List ---")
-                            for u in students:
-                                print(f"ID: {u.get('_user_id')} | Name: {u.get('_username')}")
-                        else:
+                        if not browse_users(storage, "Student List", lambda u: f"ID: {u.get('_user_id')} | Name: {u.get('_username')}", role='Student'):
                             prompts.display_message("No students found.")
 
-                    elif action == '4': # Logout
+                    elif action == '4': # Course Leaderboard
+                        course_id = input("Enter Course ID (blank for overall): ").strip() or OVERALL
+                        leaders = rankings.top_n(course_id, 10)
+                        if leaders:
+                            print(f"\n{BLUE}--- Leaderboard: {course_id or 'Overall'} ({rankings.size(course_id)} students) ---{RESET}")
+                            for sid, score in leaders:
+                                print(f"#{rankings.rank(sid, course_id):<4} {sid:<10} | {score:.1f}%")
+                        else:
+                            prompts.display_message("No grades found for that course.")
+
+                    elif action == '5': # Mark Group Attendance
+                        group_index = storage.load_group_index()
+                        g_id = input("Enter Group ID: ").strip()
+                        roster = group_index.members(g_id)
+                        if not roster:
+                            prompts.display_error("Group not found or has no members.")
+                            continue
+                        print(f"\n[Group Attendance] {g_id}: {len(roster)} student(s)")
+                        class_session = prompts.prompt_class_session()
+                        # The whole group goes to storage in one append
+                        save_class_attendance(storage, warnings, current_user, roster, class_session)
+
+                    elif action == '6': # Group Progress
+                        group_index = storage.load_group_index()
+                        g_id = input("Enter Group ID: ").strip()
+                        roster = group_index.members(g_id)
+                        if not roster:
+                            prompts.display_error("Group not found or has no members.")
+                            continue
+                        # One streamed pass over grades.csv for the whole group
+                        summary = utils.summarize_grades(storage.iter_grades(), group_index.member_set(g_id))
+                        print(f"\n{BLUE}--- Group Progress: {g_id} ---{RESET}")
+                        print(f"{BLUE}{'Student':<10} | {'Grades':<6} | {'Average':<8} | {'Attendance':<10} | {'Risk':<8}{RESET}")
+                        print("-" * 55)
+                        for sid in roster:
+                            grades_info = summary.get(sid)
+                            average = f"{grades_info['average']:.1f}%" if grades_info else "n/a"
+                            rate = warnings.attendance_rate(sid)
+                            attendance = f"{rate:.0f}%" if rate is not None else "n/a"
+                            level = warnings.risk_level(sid)
+                            color = RED if level == 'Critical' else (YELLOW if level == 'Moderate' else RESET)
+                            print(f"{color}{sid:<10} | {grades_info['count'] if grades_info else 0:<6} | {average:<8} | {attendance:<10} | {level:<8}{RESET}")
+                        averages = [info['average'] for info in summary.values()]
+                        if averages:
+                            print(f"\nGroup average: {sum(averages) / len(averages):.1f}% over {len(averages)} graded student(s)")
+
+                    elif action == '7': # Logout
                         current_user = None
+                        session.logout()
                         prompts.display_message("Logged out.")
                     
-                    elif action == '5': # Exit
+                    elif action == '8': # Exit
                         if prompts.prompt_confirmation("Are you sure you want to exit?"):
-                            print("Backing up data...")
-                            storage.backup_data()
-                            print("Goodbye!")
-                            sys.exit(0)
+                            return
 
                 elif role == 'Student':
                     action = menus.student_menu()
+                    if not authorize(session, role, action):
+                        continue
+                    pending_action = start_menu_timer(role, action)
                     
                     if action == '1': # Check Attendance
                         my_id = getattr(current_user, '_user_id', None)
@@ -379,6 +791,17 @@ def main():
                                 status_code = r.get('status', '?')
                                 color = RED if status_code == 'A' else (GREEN if status_code == 'P' else YELLOW)
                                 print(f"{color}{r.get('date', 'N/A') :<12} | {r.get('course_id', 'N/A') :<10} | {status_code :<6}{RESET}")
+
+                            # Rolling rates come from the date index (bisect lookups, no rescans)
+                            att_index = storage.load_attendance_index()
+                            windows = config.ATTENDANCE_WINDOWS
+                            print(f"\n{BLUE}{'Course':<10} | " + " | ".join(f"{f'{d}d':<6}" for d in windows) + f" | {'Term':<6} | {'Absent Streak':<13}{RESET}")
+                            for cid in att_index.courses_for_student(my_id):
+                                rates = att_index.rolling_rates(my_id, cid, windows, config.TERM_START)
+                                cells = [f"{rates[d]:.0f}%" if rates[d] is not None else "n/a" for d in windows + ('term',)]
+                                streak = att_index.consecutive_absences(my_id, cid)
+                                color = RED if streak >= 3 else RESET
+                                print(f"{color}{cid:<10} | " + " | ".join(f"{c:<6}" for c in cells) + f" | {streak:<13}{RESET}")
                         else:
                             prompts.display_message("No attendance records found.")
 
@@ -421,54 +844,73 @@ def main():
                             # Display
                             color = GREEN if gpa > 3.0 else (YELLOW if 2.0 < gpa <= 3.0 else RED)
                             print(f"\n{color}Estimated GPA (Simple Avg): {gpa:.2f}{RESET}")
+
+                            for cid in sorted(grades_map) + [OVERALL]:
+                                rank = rankings.rank(my_id, cid)
+                                if rank is not None:
+                                    print(f"{cid or 'Overall':<10} | Rank {rank}/{rankings.size(cid)} | Percentile {rankings.percentile(my_id, cid):.0f}")
                         else:
                             prompts.display_message("No grades found.")
 
                     elif action == '3': # View Courses
-                        # Logic: Enrollment logic
-                        course_id = input("Enter Course ID to enroll (or view): ")
-                        if current_user.enroll_course(course_id):
-                             prompts.display_message(f"Enrolled in {course_id} (Session Only).")
-                             # Note: Persistence of enrollment requires updating the User object in storage.
-                             # This would require loading all users, finding self, updating 'enrolled_courses' field, and saving.
-                             # For this refactor, we stick to in-memory simply or try to save if ambitious.
-                             # Let's try to save for completeness if possible.
-                             all_users = storage.load_users()
-                             me_in_storage = next((u for u in all_users if u.get('_user_id') == my_id), None)
-                             if me_in_storage:
-                                 # 'enrolled_courses' key?
-                                 # We need to adapt keys. Domain: _enrolled_courses. Storage: _enrolled_courses
-                                 curr_list = me_in_storage.get('_enrolled_courses', [])
-                                 if course_id not in curr_list:
-                                     curr_list.append(course_id)
-                                     me_in_storage['_enrolled_courses'] = curr_list
-                                     storage.save_users(all_users)
-                                     prompts.display_message("Enrollment saved.")
-                        else:
-                             prompts.display_message("Already enrolled.")
-                             
-                        print(f"Current Enrollments: {current_user._enrolled_courses}")
+                        my_id = getattr(current_user, '_user_id', None)
+                        if not my_id:
+                            prompts.display_error("User ID not found.")
+                            continue
+
+                        enrollment_index = storage.load_enrollment_index()
+                        current_user._enrolled_courses = enrollment_index.schedule(my_id)
+                        catalog = {c.get('course_id'): c for c in storage.load_courses()}
+                        if catalog:
+                            print(f"\n{BLUE}--- Course Catalog ---{RESET}")
+                            for cid, c in catalog.items():
+                                capacity = c.get('capacity') or 'unlimited'
+                                marker = " (enrolled)" if cid in current_user._enrolled_courses else ""
+                                print(f"{cid:<10} | {c.get('name', ''):<25} | {enrollment_index.roster_size(cid)}/{capacity}{marker}")
+
+                        course_id = input("Enter Course ID to enroll (blank to go back): ").strip().upper()
+                        if course_id:
+                            course = catalog.get(course_id)
+                            capacity = course.get('capacity') if course else None
+                            if not course:
+                                prompts.display_error("Course not found in the catalog.")
+                            elif capacity and enrollment_index.roster_size(course_id) >= capacity:
+                                prompts.display_error("Course is full.")
+                            elif current_user.enroll_course(course_id):
+                                # One small appended record instead of rewriting users.json
+                                record = {'student_id': my_id, 'course_id': course_id, 'date': date.today().isoformat(), 'status': 'enrolled'}
+                                if storage.append_enrollments([record]):
+                                    prompts.display_message(f"Enrolled in {course_id}.")
+                                else:
+                                    current_user._enrolled_courses.remove(course_id)
+                                    prompts.display_error("Failed to save enrollment.")
+                            else:
+                                prompts.display_message("Already enrolled.")
+
+                        print(f"Current Enrollments: {', '.join(current_user._enrolled_courses) or 'none'}")
 
                     elif action == '4': # Logout
                         current_user = None
+                        session.logout()
                         prompts.display_message("Logged out.")
                     
                     elif action == '5': # Exit
                         if prompts.prompt_confirmation("Are you sure you want to exit?"):
-                            print("Backing up data...")
-                            storage.backup_data()
-                            print("Goodbye!")
-                            sys.exit(0)
+                            return
                 else:
                     prompts.display_error(f"Error: Unknown role {role}. Logging out.")
                     current_user = None
+                    session.logout()
 
-    except KeyboardInterrupt:
-        print("\n\nShutdown requested via Ctrl+C.")
-        print("Backing up data...")
-        storage.backup_data()
-        print("Goodbye!")
-        sys.exit(0)
+    finally:
+        if pending_action is not None:
+            finish_menu_timer(pending_action)
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ['serve']:
+        sys.exit(serve(sys.argv[2:]))
+    if len(sys.argv) > 1:
+        # Arguments select the non-interactive batch CLI (see student_management_system/cli.py)
+        from student_management_system import cli
+        sys.exit(cli.main(sys.argv[1:]))
     main()
@@ -0,0 +1,339 @@
+"""
+Read-only HTTP JSON API for dashboards and in-house tools.
+
+    python -m student_management_system.api [--host 127.0.0.1] [--port 8765]
+
+Endpoints (GET):
+    /health
+    /students                                   ID, username, active flag, enrolled courses
+    /students/<id>/attendance[?course=&since=&until=]
+    /students/<id>/grades                       grade rows plus the average
+    /courses/<id>/roster
+    /courses/<id>/attendance[?since=&until=]    per-student rates and the course rate
+    /leaderboard[?course=&n=10]
+    /reports                                    files in the reports directory
+    /reports/<name>                             one report, as text
+
+Responses are built from indexes shared by all request threads and rebuilt
+only when their file changes. Every response carries an ETag derived from
+the versions (mtime, size) of the files it reads, so a client sending
+If-None-Match gets 304 without any work being done, and recent bodies are
+kept in a bounded LRU cache keyed by path and ETag.
+"""
+import argparse
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl, unquote
+
+from student_management_system import config, metrics
+from student_management_system.utils import validate_date, summarize_grades
+
+EPOCH = '1970-01-01'
+
+
+class ApiError(Exception):
+    """An HTTP error response with a JSON body."""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class ResponseCache:
+    """Bounded LRU of encoded response bodies keyed by (path, etag)."""
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # {(path, etag): (content_type, body)}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, entry: tuple) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReadApi:
+    """
+    Routes GET requests to handlers over one StorageManager.
+
+    StorageManager's index caches are not thread-safe, so response building
+    (cache misses only) is serialized; ETag checks and cache hits are not.
+    """
+    def __init__(self, storage, reports_dir: str = 'reports', cache_entries: int = None):
+        self._storage = storage
+        self._reports_dir = reports_dir
+        self.cache = ResponseCache(config.API_CACHE_ENTRIES if cache_entries is None else cache_entries)
+        self._build_lock = threading.Lock()
+        self._grades = None  # (version, {student_id: [rows]}, RankingIndex)
+        # (name, pattern, data files the response depends on, handler)
+        self._routes = [
+            ('health', re.compile(r'^/health$'), (), self._health),
+            ('students', re.compile(r'^/students$'), ('users.json', 'enrollments.csv'), self._students),
+            ('student attendance', re.compile(r'^/students/([^/]+)/attendance$'), ('attendance.csv',), self._student_attendance),
+            ('student grades', re.compile(r'^/students/([^/]+)/grades$'), ('grades.csv',), self._student_grades),
+            ('course roster', re.compile(r'^/courses/([^/]+)/roster$'), ('users.json', 'enrollments.csv'), self._course_roster),
+            ('course attendance', re.compile(r'^/courses/([^/]+)/attendance$'), ('attendance.csv',), self._course_attendance),
+            ('leaderboard', re.compile(r'^/leaderboard$'), ('grades.csv',), self._leaderboard),
+            ('reports', re.compile(r'^/reports$'), None, self._reports),
+            ('report', re.compile(r'^/reports/([^/]+)$'), None, self._report),
+        ]
+
+    def _versions(self, files) -> tuple:
+        if files is None:
+            # Report files live outside the data directory
+            try:
+                with os.scandir(self._reports_dir) as entries:
+                    return tuple(sorted((e.name, e.stat().st_mtime_ns, e.stat().st_size) for e in entries if e.is_file()))
+            except OSError:
+                return ()
+        return self._storage.versions(*files)
+
+    def handle(self, target: str, if_none_match: str = None) -> tuple:
+        """
+        Serve one GET request.
+        Args:
+            target (str): Request path with optional query string.
+            if_none_match (str): The If-None-Match header, if any.
+        Returns:
+            tuple: (status, headers dict, body bytes)
+        """
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip('/') or '/'
+        query = dict(parse_qsl(parts.query))
+        for name, pattern, files, handler in self._routes:
+            match = pattern.match(path)
+            if match:
+                break
+        else:
+            return self._error(ApiError(404, f"No endpoint {path}."))
+
+        started = metrics.start_timer()
+        try:
+            # Today's date is part of the tag because date ranges default to "until today"
+            key = (path, tuple(sorted(query.items())))
+            tag_source = repr((key, self._versions(files), date.today().isoformat()))
+            etag = f'"{hashlib.blake2b(tag_source.encode(), digest_size=8).hexdigest()}"'
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+            if if_none_match and etag in [t.strip() for t in if_none_match.split(',')]:
+                return 304, headers, b''
+            entry = self.cache.get((key, etag))
+            if entry is None:
+                with self._build_lock:
+                    result = handler(*match.groups(), query)
+                if isinstance(result, tuple):
+                    entry = result
+                else:
+                    entry = ('application/json', json.dumps(result).encode())
+                self.cache.put((key, etag), entry)
+            headers['Content-Type'] = entry[0]
+            return 200, headers, entry[1]
+        except ApiError as e:
+            return self._error(e)
+        finally:
+            metrics.stop_timer(f"API: {name}", started)
+
+    @staticmethod
+    def _error(error: ApiError) -> tuple:
+        body = json.dumps({'error': str(error)}).encode()
+        return error.status, {'Content-Type': 'application/json'}, body
+
+    @staticmethod
+    def _date_range(query: dict) -> tuple:
+        since = query.get('since', EPOCH)
+        until = query.get('until', date.today().isoformat())
+        for value in (since, until):
+            if not validate_date(value):
+                raise ApiError(400, f"Invalid date '{value}', use YYYY-MM-DD.")
+        return since, until
+
+    def _grade_indexes(self) -> tuple:
+        from student_management_system.ranking import RankingIndex
+        version = self._storage.versions('grades.csv')
+        if self._grades is None or self._grades[0] != version:
+            by_student = {}
+            rows = self._storage.load_grades()
+            for row in rows:
+                by_student.setdefault(row.get('student_id'), []).append(row)
+            rankings = RankingIndex()
+            rankings.add_grades(rows)
+            self._grades = (version, by_student, rankings)
+        return self._grades[1], self._grades[2]
+
+    # Handlers; called with the route's path groups and the query dict
+
+    def _health(self, query):
+        return {'status': 'ok'}
+
+    def _students(self, query):
+        enrollments = self._storage.load_enrollment_index()
+        return [
+            {
+                'student_id': u.get('_user_id'),
+                'username': u.get('_username'),
+                'is_active': u.get('_is_active', True),
+                'courses': enrollments.schedule(u.get('_user_id')),
+            }
+            for u in self._storage.load_students()
+        ]
+
+    def _student_attendance(self, student_id, query):
+        index = self._storage.load_attendance_index()
+        since, until = self._date_range(query)
+        courses = [query['course']] if query.get('course') else index.courses_for_student(student_id)
+        return {
+            'student_id': student_id,
+            'since': since,
+            'until': until,
+            'courses': {
+                course_id: {
+                    'rate': index.attendance_rate(student_id, course_id, since, until),
+                    'records': index.query_range(student_id, course_id, since, until),
+                }
+                for course_id in courses
+            },
+        }
+
+    def _student_grades(self, student_id, query):
+        by_student, _ = self._grade_indexes()
+        rows = by_student.get(student_id, [])
+        summary = summarize_grades(rows).get(student_id, {'average': None, 'count': 0})
+        return {'student_id': student_id, 'average': summary['average'], 'count': summary['count'], 'grades': rows}
+
+    def _course_roster(self, course_id, query):
+        return {'course_id': course_id, 'students': self._storage.load_enrollment_index().roster(course_id)}
+
+    def _course_attendance(self, course_id, query):
+        index = self._storage.load_attendance_index()
+        since, until = self._date_range(query)
+        return {
+            'course_id': course_id,
+            'since': since,
+            'until': until,
+            'rate': index.course_rate(course_id, since, until),
+            'students': {
+                sid: index.attendance_rate(sid, course_id, since, until)
+                for sid in index.students_for_course(course_id)
+            },
+        }
+
+    def _leaderboard(self, query):
+        from student_management_system.ranking import OVERALL
+        _, rankings = self._grade_indexes()
+        course_id = query.get('course') or OVERALL
+        try:
+            n = max(1, min(int(query.get('n', 10)), 1000))
+        except ValueError:
+            raise ApiError(400, "n must be an integer.")
+        return {
+            'course_id': course_id,
+            'size': rankings.size(course_id),
+            'leaders': [{'student_id': sid, 'score': score} for sid, score in rankings.top_n(course_id, n)],
+        }
+
+    def _reports(self, query):
+        return [{'name': name, 'modified_ns': mtime, 'size': size} for name, mtime, size in self._versions(None)]
+
+    def _report(self, name, query):
+        # Only names listed in the directory are served, which rules out path traversal
+        if name not in {entry[0] for entry in self._versions(None)}:
+            raise ApiError(404, f"No report {name}.")
+        with open(os.path.join(self._reports_dir, name), 'rb') as f:
+            body = f.read()
+        content_type = mimetypes.guess_type(name)[0] or 'text/plain'
+        return f"{content_type}; charset=utf-8", body
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so clients can reuse connections
+    # Headers and body are separate writes; without this, Nagle plus delayed ACKs adds ~40 ms per response
+    disable_nagle_algorithm = True
+    api = None
+
+    def do_GET(self):
+        status, headers, body = self.api.handle(self.path, self.headers.get('If-None-Match'))
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Per-request latency goes to the metrics registry instead of stderr
+        pass
+
+
+def make_server(storage, host: str = None, port: int = None, reports_dir: str = 'reports',
+                cache_entries: int = None) -> ThreadingHTTPServer:
+    """
+    Build (but do not start) a threaded server for the read API.
+    Args:
+        storage (StorageManager): The storage to serve.
+        host (str): Bind address; defaults to config.API_HOST.
+        port (int): Port; defaults to config.API_PORT (0 picks a free port).
+        reports_dir (str): Directory served under /reports.
+        cache_entries (int): LRU size; defaults to config.API_CACHE_ENTRIES (0 disables caching).
+    Returns:
+        ThreadingHTTPServer: Call serve_forever() on it; the ReadApi is its `api` attribute.
+    """
+    api = ReadApi(storage, reports_dir, cache_entries)
+    handler = type('ApiHandler', (_Handler,), {'api': api})
+    server = ThreadingHTTPServer((host or config.API_HOST, config.API_PORT if port is None else port), handler)
+    server.daemon_threads = True
+    server.api = api
+    return server
+
+
+def main(argv=None) -> int:
+    from student_management_system.storage.storage_manager import StorageManager
+
+    parser = argparse.ArgumentParser(prog='python -m student_management_system.api')
+    parser.add_argument('--host', default=config.API_HOST)
+    parser.add_argument('--port', type=int, default=config.API_PORT)
+    parser.add_argument('--data-dir', default='student_management_system/data')
+    parser.add_argument('--reports-dir', default='reports')
+    parser.add_argument('--cache-entries', type=int, default=config.API_CACHE_ENTRIES)
+    args = parser.parse_args(argv)
+
+    server = make_server(StorageManager(args.data_dir), args.host, args.port, args.reports_dir, args.cache_entries)
+    print(f"Serving the read API on http://{server.server_address[0]}:{server.server_address[1]} (Ctrl+C to stop)")
+    dumper = metrics.MetricsDumper()
+    dumper.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        dumper.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
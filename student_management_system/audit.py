@@ -0,0 +1,249 @@
+"""
+Structured audit trail written by log_action.
+
+Each record is one JSON line in a per-day segment:
+    logs/audit/audit-YYYY-MM-DD.jsonl
+    {"ts": "...", "user": "T-001", "action": "Mark Attendance", "status": "SUCCESS",
+     "duration_ms": 1.2, "error": null}
+
+Next to each segment a sidecar (audit-YYYY-MM-DD.idx.json) maps every user
+to the byte offsets of their records, so a query reads only the segments in
+its date range and seeks straight to the matching lines:
+
+    python -m student_management_system.audit query --user T-001 --days 7
+    python -m student_management_system.audit query --since 2026-10-01 --until 2026-10-07 --status FAILURE
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from datetime import date, timedelta
+
+from student_management_system import config
+
+SEGMENT_PATTERN = re.compile(r'^audit-(\d{4}-\d{2}-\d{2})\.jsonl$')
+
+
+def segment_path(directory: str, day: str) -> str:
+    return os.path.join(directory, f"audit-{day}.jsonl")
+
+
+def sidecar_path(directory: str, day: str) -> str:
+    return os.path.join(directory, f"audit-{day}.idx.json")
+
+
+def build_sidecar(directory: str, day: str) -> dict:
+    """
+    Rebuild a day's sidecar by scanning its segment once.
+    Returns:
+        dict: {'size': bytes indexed, 'users': {user_id: [offset, ...]}}
+    """
+    users = {}
+    size = 0
+    try:
+        with open(segment_path(directory, day), 'rb') as f:
+            for line in iter(f.readline, b''):
+                if line.endswith(b'\n'):
+                    try:
+                        users.setdefault(json.loads(line).get('user'), []).append(size)
+                    except ValueError:
+                        pass  # Damaged line; skip it
+                    size += len(line)
+                else:
+                    break  # Partial last line from an interrupted write
+    except IOError:
+        pass
+    return {'size': size, 'users': users}
+
+
+def load_sidecar(directory: str, day: str) -> dict:
+    """
+    Load a day's sidecar, rebuilding it if it is missing or behind its segment.
+    Returns:
+        dict: {'size': bytes indexed, 'users': {user_id: [offset, ...]}}
+    """
+    try:
+        with open(sidecar_path(directory, day), 'r') as f:
+            sidecar = json.load(f)
+        if sidecar.get('size') == os.path.getsize(segment_path(directory, day)):
+            return sidecar
+    except (IOError, OSError, ValueError):
+        pass
+    return build_sidecar(directory, day)
+
+
+def _write_sidecar(directory: str, day: str, sidecar: dict) -> None:
+    path = sidecar_path(directory, day)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(sidecar, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+class AuditSegmentHandler(logging.Handler):
+    """
+    Appends audit records (record.audit) to the day's segment and keeps its sidecar.
+
+    Runs on the logging listener thread; the sidecar is rewritten on flush,
+    i.e. once per batch rather than once per record.
+    """
+    def __init__(self, directory: str):
+        super().__init__()
+        self._dir = directory
+        self._day = None
+        self._stream = None
+        self._sidecar = None
+        self._dirty = False
+
+    def _open_day(self, day: str):
+        self._close_day()
+        os.makedirs(self._dir, exist_ok=True)
+        sidecar = load_sidecar(self._dir, day)
+        path = segment_path(self._dir, day)
+        if os.path.exists(path) and os.path.getsize(path) != sidecar['size']:
+            # Drop a partial trailing line so every indexed offset starts a record
+            with open(path, 'r+b') as f:
+                f.truncate(sidecar['size'])
+        self._stream = open(path, 'ab')
+        self._sidecar = sidecar
+        self._day = day
+
+    def _close_day(self):
+        if self._stream is not None:
+            self.flush()
+            self._stream.close()
+            self._stream = None
+
+    def emit(self, record):
+        entry = getattr(record, 'audit', None)
+        if entry is None:
+            return
+        try:
+            day = entry['ts'][:10]
+            if day != self._day:
+                self._open_day(day)
+            line = (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+            offset = self._sidecar['size']
+            self._stream.write(line)
+            self._sidecar['users'].setdefault(entry.get('user'), []).append(offset)
+            self._sidecar['size'] = offset + len(line)
+            self._dirty = True
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._stream is not None:
+                self._stream.flush()
+                if self._dirty:
+                    if os.path.getsize(segment_path(self._dir, self._day)) != self._sidecar['size']:
+                        # Another process appended to the same segment; re-derive the offsets
+                        self._sidecar = build_sidecar(self._dir, self._day)
+                    _write_sidecar(self._dir, self._day, self._sidecar)
+                    self._dirty = False
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            self._close_day()
+        finally:
+            self.release()
+        super().close()
+
+
+def segment_days(directory: str, since: str = None, until: str = None) -> list:
+    """Sorted days ('YYYY-MM-DD') that have a segment, limited to [since, until]."""
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    days = []
+    for name in names:
+        match = SEGMENT_PATTERN.match(name)
+        if match:
+            day = match.group(1)
+            if (since is None or day >= since) and (until is None or day <= until):
+                days.append(day)
+    return sorted(days)
+
+
+def query(directory: str = None, user: str = None, since: str = None, until: str = None,
+          action: str = None, status: str = None):
+    """
+    Stream audit records matching the filters, oldest first.
+    Args:
+        directory (str): Audit directory (defaults to config.AUDIT_DIR).
+        user (str): Only this user's records; uses the sidecar offsets instead of a scan.
+        since (str): First day, 'YYYY-MM-DD' (inclusive).
+        until (str): Last day, 'YYYY-MM-DD' (inclusive).
+        action (str): Only this action name.
+        status (str): Only 'SUCCESS' or 'FAILURE'.
+    Yields:
+        dict: One audit record per iteration.
+    """
+    directory = directory or config.AUDIT_DIR
+    for day in segment_days(directory, since, until):
+        sidecar = load_sidecar(directory, day)
+        try:
+            with open(segment_path(directory, day), 'rb') as f:
+                if user is not None:
+                    lines = []
+                    for offset in sidecar['users'].get(user, []):
+                        f.seek(offset)
+                        lines.append(f.readline())
+                else:
+                    lines = iter(f.readline, b'')
+                for line in lines:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if action is not None and entry.get('action') != action:
+                        continue
+                    if status is not None and entry.get('status') != status:
+                        continue
+                    yield entry
+        except IOError:
+            continue
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m student_management_system.audit')
+    sub = parser.add_subparsers(dest='command', required=True)
+    q = sub.add_parser('query', help="print audit records matching the filters")
+    q.add_argument('--dir', default=config.AUDIT_DIR)
+    q.add_argument('--user')
+    q.add_argument('--since', help="first day, YYYY-MM-DD")
+    q.add_argument('--until', help="last day, YYYY-MM-DD")
+    q.add_argument('--days', type=int, help="shorthand for --since N-1 days ago (today included)")
+    q.add_argument('--action')
+    q.add_argument('--status', choices=('SUCCESS', 'FAILURE'))
+    q.add_argument('--json', action='store_true', help="print raw JSON lines")
+    args = parser.parse_args(argv)
+
+    since = args.since
+    if args.days:
+        since = (date.today() - timedelta(days=args.days - 1)).isoformat()
+
+    count = 0
+    for entry in query(args.dir, args.user, since, args.until, args.action, args.status):
+        count += 1
+        if args.json:
+            print(json.dumps(entry))
+        else:
+            duration = entry.get('duration_ms')
+            duration = f"{duration:.1f}ms" if duration is not None else "-"
+            error = f" | {entry['error']}" if entry.get('error') else ""
+            print(f"{entry.get('ts')} | {str(entry.get('user')):<8} | {entry.get('status'):<7} | {duration:>9} | {entry.get('action')}{error}")
+    if not args.json:
+        print(f"{count} record(s).", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
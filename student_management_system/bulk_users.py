@@ -0,0 +1,164 @@
+"""
+File-driven bulk user provisioning.
+
+    python -m student_management_system.bulk_users add users.csv
+    python -m student_management_system.bulk_users update changes.json
+    python -m student_management_system.bulk_users remove leavers.csv
+
+Files are CSV (with a header row) or a JSON list of objects, using the
+keys: username, password, role, is_active, user_id (updates and removals
+identify users by user_id, or by current_username / username respectively).
+Each run validates the whole batch, applies it all-or-nothing through the
+Admin batch APIs and writes users.json once.
+"""
+import argparse
+import csv
+import json
+import sys
+
+from student_management_system import passwords
+from student_management_system.models.user import Admin, User, validate_new_users
+
+ACTIONS = ('add', 'update', 'remove')
+
+
+def read_records(path: str) -> list:
+    """
+    Read user records from a CSV or JSON file.
+    Args:
+        path (str): Path ending in .json or .csv.
+    Returns:
+        list: Record dictionaries.
+    Raises:
+        ValueError: If the file content is not a list of records.
+    """
+    with open(path, 'r', newline='') as f:
+        if path.lower().endswith('.json'):
+            records = json.load(f)
+            if not isinstance(records, list):
+                raise ValueError("JSON input must be a list of objects.")
+            return records
+        return [dict(row) for row in csv.DictReader(f)]
+
+
+def parse_bool(value) -> bool:
+    """Interpret CSV-style truthy strings ('true', 'yes', 'y', '1')."""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('true', 'yes', 'y', '1')
+
+
+def assign_ids(records: list, storage) -> None:
+    """
+    Give records without a _user_id IDs from one reserved block per role prefix.
+    Args:
+        records (list): Storage records; updated in place.
+        storage (StorageManager): Owner of the persisted ID allocator.
+    """
+    by_role = {}
+    for record in records:
+        if not record.get('_user_id'):
+            by_role.setdefault(str(record.get('_role') or 'User'), []).append(record)
+    for role, pending in by_role.items():
+        for record, user_id in zip(pending, storage.reserve_user_ids(role, len(pending))):
+            record['_user_id'] = user_id
+
+
+def apply_batch(admin: Admin, action: str, records: list, storage, workers: int = None) -> dict:
+    """
+    Validate and apply one batch to an Admin's user list (in memory only).
+    Args:
+        admin (Admin): Admin whose _users holds the current storage records.
+        action (str): 'add', 'update' or 'remove'.
+        records (list): Input records, keyed as described above.
+        storage (StorageManager): Used to reserve IDs for new users.
+        workers (int): Processes used to hash new passwords.
+    Returns:
+        dict: {"success": bool, "count": int, "errors": list}
+    """
+    if action == 'add':
+        new_users = []
+        for record in records:
+            user = {f"_{k}": v for k, v in record.items() if k != 'password' and v not in (None, '')}
+            user['_role'] = str(user.get('_role', '')).capitalize()
+            user['_is_active'] = parse_bool(record.get('is_active', True))
+            new_users.append(user)
+        # Validate with placeholder IDs first, so a rejected batch neither
+        # burns reserved IDs nor pays for password hashing
+        placeholders = [dict(user, _user_id=user.get('_user_id') or f"pending-{row}") for row, user in enumerate(new_users)]
+        errors = validate_new_users(admin._users, placeholders)
+        errors += [f"Row {row}: password is required." for row, record in enumerate(records, start=1) if not record.get('password')]
+        if errors:
+            return {"success": False, "count": 0, "errors": errors}
+        assign_ids(new_users, storage)
+        hashes = passwords.hash_passwords([record['password'] for record in records], workers)
+        for user, password_hash in zip(new_users, hashes):
+            passwords.set_password_hash(user, password_hash)
+        # Through the model classes, so new records carry their role's fields
+        return admin.add_users([User.from_record(user).to_record() for user in new_users])
+
+    by_username = {user.get('_username'): user.get('_user_id') for user in admin._users}
+    if action == 'update':
+        updates = []
+        for record in records:
+            update = {'_user_id': record.get('user_id') or by_username.get(record.get('current_username'), record.get('current_username'))}
+            if record.get('username'):
+                update['_username'] = record['username']
+            if record.get('is_active') not in (None, ''):
+                update['_is_active'] = parse_bool(record['is_active'])
+            updates.append(update)
+        return admin.update_users(updates)
+
+    if action == 'remove':
+        user_ids = [record.get('user_id') or by_username.get(record.get('username'), record.get('username')) for record in records]
+        return admin.remove_users(user_ids)
+
+    return {"success": False, "count": 0, "errors": [f"Unknown action '{action}'."]}
+
+
+def run(storage, action: str, records: list, admin: Admin = None, workers: int = None) -> dict:
+    """
+    Apply a batch against storage and persist it with a single write.
+    Args:
+        storage (StorageManager): The storage to read and write users.json.
+        action (str): 'add', 'update' or 'remove'.
+        records (list): Input records, keyed as described above.
+        admin (Admin): Acting admin; a transient one is used if omitted.
+        workers (int): Processes used to hash new passwords.
+    Returns:
+        dict: {"success": bool, "count": int, "errors": list}
+    """
+    if admin is None:
+        admin = Admin('bulk_import', None)
+        admin._users = storage.load_users()
+    result = apply_batch(admin, action, records, storage, workers)
+    if result['success'] and result['count']:
+        if not storage.save_users(admin._users):
+            return {"success": False, "count": 0, "errors": ["Failed to save users."]}
+    return result
+
+
+def main(argv=None) -> int:
+    from student_management_system.storage.storage_manager import StorageManager
+
+    parser = argparse.ArgumentParser(prog='python -m student_management_system.bulk_users')
+    parser.add_argument('action', choices=ACTIONS)
+    parser.add_argument('file', help="CSV or JSON file of user records")
+    parser.add_argument('--data-dir', default='student_management_system/data')
+    parser.add_argument('--workers', type=int, default=None, help="processes for password hashing")
+    args = parser.parse_args(argv)
+
+    try:
+        records = read_records(args.file)
+    except (IOError, ValueError, csv.Error) as e:
+        print(f"Cannot read {args.file}: {e}", file=sys.stderr)
+        return 1
+    result = run(StorageManager(args.data_dir), args.action, records, workers=args.workers)
+    for error in result['errors']:
+        print(error, file=sys.stderr)
+    print(f"{args.action}: {result['count']} user(s) {'applied' if result['success'] else 'rejected'}.")
+    return 0 if result['success'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+"""
+Non-interactive command line for scripts and cron jobs.
+
+    python main.py attendance mark --as T-001 --course CS101 S-001 S-002=A S-003=L
+    python main.py grades assign --as T-001 --course CS101 --max-score 100 S-001=88 S-002=92.5
+    python main.py users add --as A-001 new_users.csv
+    python main.py users remove --as A-001 S-007 S-008
+    python main.py reports build --as A-001 --kind progress
+
+(`python -m student_management_system.cli ...` is equivalent.)
+
+Records come from positional arguments, --file PATH (CSV with a header row
+or a JSON list of objects) or --file - (stdin, either format). An argument is
+a bare ID, ID=VALUE (the status for attendance, the score for grades) or
+comma-separated key=value pairs such as student_id=S-001,course_id=CS101,status=L.
+Options like --course and --date fill in keys a record leaves out. Every
+command runs as the user given by --as and is refused unless that user's
+role grants the command's permission.
+
+Each invocation validates the whole batch first and then writes once, so it
+is applied entirely or not at all. A summary with the throughput goes to
+stdout and errors to stderr. Exit codes:
+    0  success
+    1  batch rejected by validation or permissions; nothing was written
+    2  usage error
+    3  input unreadable or the write failed
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from datetime import date
+
+from student_management_system import config, permissions
+from student_management_system.utils import validate_date
+
+EXIT_OK = 0
+EXIT_REJECTED = 1
+EXIT_USAGE = 2
+EXIT_IO = 3
+
+ATTENDANCE_STATUSES = ('P', 'A', 'L', 'E')
+ATTENDANCE_FIELDS = ('student_id', 'course_id', 'date', 'status')
+GRADE_FIELDS = ('student_id', 'course_id', 'score', 'max_score', 'weight')
+USER_FIELDS = ('user_id', 'username', 'password', 'role', 'is_active', 'current_username')
+
+
+class BatchError(Exception):
+    """A batch that must not be written; carries the exit code and messages."""
+    def __init__(self, errors: list, code: int = EXIT_REJECTED):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+        self.code = code
+
+
+def parse_record(text: str, fields: tuple, primary: str = None, value_key: str = None) -> dict:
+    """
+    Parse one positional record.
+    Args:
+        text (str): 'ID', 'ID=VALUE' or 'key=value,key=value'.
+        fields (tuple): Keys accepted in key=value form.
+        primary (str): Key a bare ID fills.
+        value_key (str): Key the VALUE in ID=VALUE fills.
+    Returns:
+        dict: The record.
+    Raises:
+        ValueError: If the text does not fit any form.
+    """
+    pairs = [part.partition('=') for part in text.split(',')]
+    key, sep, value = pairs[0]
+    if len(pairs) == 1 and key.strip() not in fields:
+        if primary is None or (sep and value_key is None):
+            raise ValueError(f"Cannot parse '{text}'; use key=value pairs ({', '.join(fields)}).")
+        record = {primary: key.strip()}
+        if sep:
+            record[value_key] = value.strip()
+        return record
+    record = {}
+    for key, sep, value in pairs:
+        key = key.strip()
+        if not sep or key not in fields:
+            raise ValueError(f"Cannot parse '{text}'; unknown or missing key '{key}'.")
+        record[key] = value.strip()
+    return record
+
+
+def read_stream(stream) -> list:
+    """Read records from an open text stream holding CSV (with a header) or a JSON list."""
+    text = stream.read()
+    if text.lstrip().startswith('['):
+        records = json.loads(text)
+        if not isinstance(records, list):
+            raise ValueError("JSON input must be a list of objects.")
+        return records
+    return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+
+def collect_records(args, fields: tuple, primary: str = None, value_key: str = None) -> list:
+    """
+    Records from --file and the positional arguments, in that order.
+    Raises:
+        BatchError: If the input cannot be read or parsed.
+    """
+    records = []
+    if args.file:
+        from student_management_system.bulk_users import read_records
+        try:
+            records.extend(read_stream(sys.stdin) if args.file == '-' else read_records(args.file))
+        except (IOError, ValueError, csv.Error) as e:
+            raise BatchError([f"Cannot read {args.file}: {e}"], EXIT_IO)
+    errors = []
+    for text in args.records:
+        try:
+            records.append(parse_record(text, fields, primary, value_key))
+        except ValueError as e:
+            errors.append(str(e))
+    if errors:
+        raise BatchError(errors, EXIT_USAGE)
+    if not records:
+        raise BatchError(["No records given (use arguments, --file PATH or --file -)."], EXIT_USAGE)
+    return records
+
+
+def load_actor(storage, user_id: str, permission: str, role: str = None):
+    """
+    Build the acting user from users.json and check one permission.
+    Args:
+        storage (StorageManager): The storage.
+        user_id (str): The --as user ID.
+        permission (str): Permission name the command needs.
+        role (str): Role the command also requires, if any.
+    Returns:
+        User: The acting user, with _user_id set.
+    Raises:
+        BatchError: If the user is missing, unknown, inactive or not permitted.
+    """
+    from student_management_system.models.user import User, ROLE_CLASSES
+    if not user_id:
+        raise BatchError(["--as USER_ID is required for this command."], EXIT_USAGE)
+    data = next((u for u in storage.load_users() if u.get('_user_id') == user_id), None)
+    if data is None:
+        raise BatchError([f"Unknown user '{user_id}'."])
+    if not data.get('_is_active', True):
+        raise BatchError([f"User '{user_id}' is inactive."])
+    if data.get('_role') not in ROLE_CLASSES:
+        raise BatchError([f"User '{user_id}' has unknown role '{data.get('_role')}'."])
+    if role and data['_role'] != role:
+        raise BatchError([f"User '{user_id}' does not have the {role} role."])
+    user = User.from_record(data)
+    mask = permissions.table.mask(permission)
+    permissions.grant(user, data.get('_permissions'))
+    if not permissions.has_permission(user, mask):
+        from student_management_system.decorators.logger import audit
+        audit(f"CLI {permission}", user_id, "FAILURE", error="Permission denied")
+        raise BatchError([f"User '{user_id}' lacks permission '{permission}'."])
+    return user
+
+
+def _number(record: dict, key: str, row: int, errors: list):
+    try:
+        return float(record.get(key))
+    except (TypeError, ValueError):
+        errors.append(f"Row {row}: {key} must be a number.")
+        return None
+
+
+def mark_attendance(storage, args) -> int:
+    teacher = load_actor(storage, args.actor, 'attendance.mark', 'Teacher')
+    records = collect_records(args, ATTENDANCE_FIELDS, 'student_id', 'status')
+    students = {u.get('_user_id') for u in storage.load_students() if u.get('_is_active', True)}
+    courses = {c.get('course_id') for c in storage.load_courses()}
+    enrollments = storage.load_enrollment_index()
+    rows, errors = [], []
+    for row, record in enumerate(records, 1):
+        entry = {
+            'student_id': str(record.get('student_id') or '').strip(),
+            'course_id': str(record.get('course_id') or args.course or '').strip(),
+            'date': str(record.get('date') or args.date).strip(),
+            'status': str(record.get('status') or args.status).strip().upper(),
+            'marked_by': teacher._teacher_id,
+        }
+        if entry['student_id'] not in students:
+            errors.append(f"Row {row}: '{entry['student_id']}' is not an active student.")
+        if not entry['course_id']:
+            errors.append(f"Row {row}: course_id is required (or pass --course).")
+        elif entry['course_id'] not in courses:
+            errors.append(f"Row {row}: unknown course '{entry['course_id']}'.")
+        elif entry['student_id'] in students and not enrollments.is_enrolled(entry['student_id'], entry['course_id']):
+            errors.append(f"Row {row}: '{entry['student_id']}' is not enrolled in {entry['course_id']}.")
+        if not validate_date(entry['date']):
+            errors.append(f"Row {row}: invalid date '{entry['date']}', use YYYY-MM-DD.")
+        if entry['status'] not in ATTENDANCE_STATUSES:
+            errors.append(f"Row {row}: status must be one of {', '.join(ATTENDANCE_STATUSES)}.")
+        rows.append(entry)
+    if errors:
+        raise BatchError(errors)
+    # One log/audit entry per date in the batch, as in the menu's whole-class marking
+    by_date = {}
+    for entry in rows:
+        by_date.setdefault(entry['date'], []).append(entry['student_id'])
+    for day, student_ids in by_date.items():
+        teacher.mark_attendance(student_ids, day)
+    if not storage.append_attendance(rows):
+        raise BatchError(["Failed to save attendance."], EXIT_IO)
+    return len(rows)
+
+
+def assign_grades(storage, args) -> int:
+    teacher = load_actor(storage, args.actor, 'grades.assign', 'Teacher')
+    records = collect_records(args, GRADE_FIELDS, 'student_id', 'score')
+    students = {u.get('_user_id') for u in storage.load_students() if u.get('_is_active', True)}
+    parsed, errors = [], []
+    for row, record in enumerate(records, 1):
+        record = dict(record)
+        record['course_id'] = record.get('course_id') or args.course
+        record['max_score'] = record.get('max_score') or args.max_score
+        record['weight'] = record.get('weight') or args.weight
+        student_id = str(record.get('student_id') or '').strip()
+        if student_id not in students:
+            errors.append(f"Row {row}: '{student_id}' is not an active student.")
+        if not record['course_id']:
+            errors.append(f"Row {row}: course_id is required (or pass --course).")
+        score = _number(record, 'score', row, errors)
+        max_score = _number(record, 'max_score', row, errors)
+        weight = _number(record, 'weight', row, errors)
+        if score is not None and score < 0:
+            errors.append(f"Row {row}: score must be non-negative.")
+        if max_score is not None and max_score <= 0:
+            errors.append(f"Row {row}: max_score must be positive.")
+        if weight is not None and not 0 <= weight <= 1.0:
+            errors.append(f"Row {row}: weight must be between 0 and 1.0.")
+        parsed.append((student_id, str(record['course_id']).strip(), score, max_score, weight))
+    if errors:
+        raise BatchError(errors)
+    rows = []
+    for student_id, course_id, score, max_score, weight in parsed:
+        grade = teacher.assign_grade(student_id, course_id, score)
+        rows.append({
+            'student_id': grade['student_id'],
+            'course_id': grade['course_id'],
+            'score': grade['grade'],
+            'max_score': max_score,
+            'weight': weight,
+            'assigned_by': grade['assigned_by'],
+        })
+    if not storage.append_grades(rows):
+        raise BatchError(["Failed to save grades."], EXIT_IO)
+    return len(rows)
+
+
+def manage_users(storage, args) -> int:
+    from student_management_system import bulk_users
+    admin = load_actor(storage, args.actor, 'users.manage', 'Admin')
+    admin._users = storage.load_users()
+    primary = None if args.action == 'add' else 'user_id'
+    records = collect_records(args, USER_FIELDS, primary)
+    if primary:
+        # A bare argument may be a username rather than an ID
+        ids = {u.get('_user_id') for u in storage.load_users()}
+        name_key = 'username' if args.action == 'remove' else 'current_username'
+        for record in records:
+            if record.get('user_id') and record['user_id'] not in ids and not record.get(name_key):
+                record[name_key] = record.pop('user_id')
+    result = bulk_users.run(storage, args.action, records, admin=admin, workers=args.workers)
+    if not result['success']:
+        code = EXIT_IO if result['errors'] == ["Failed to save users."] else EXIT_REJECTED
+        raise BatchError(result['errors'], code)
+    return result['count']
+
+
+def build_reports(storage, args) -> int:
+    from student_management_system.scheduler import ReportScheduler
+    load_actor(storage, args.actor, 'reports.generate')
+    job = ReportScheduler(storage, reports_dir=args.out).run_now(args.kind, source='cli')
+    if job.status != 'done':
+        raise BatchError([job.message or f"Report job {job.job_id} {job.status}."], EXIT_IO)
+    return len(job.outputs)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from student_management_system.scheduler import REPORT_KINDS
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--data-dir', default='student_management_system/data')
+    common.add_argument('--as', dest='actor', metavar='USER_ID',
+                        help="acting user (required); their role must grant the command's permission")
+
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument('records', nargs='*', metavar='RECORD', help="ID, ID=VALUE or key=value,key=value")
+    batch.add_argument('--file', '-f', metavar='PATH', help="CSV or JSON file of records; '-' reads stdin")
+
+    parser = argparse.ArgumentParser(prog='python main.py', description="Scripted batch operations.")
+    groups = parser.add_subparsers(dest='group', required=True)
+
+    attendance = groups.add_parser('attendance').add_subparsers(dest='command', required=True)
+    mark = attendance.add_parser('mark', parents=[common, batch], help="append attendance rows")
+    mark.add_argument('--course', help="course_id for records that leave it out")
+    mark.add_argument('--date', default=date.today().isoformat(), help="YYYY-MM-DD (default: today)")
+    mark.add_argument('--status', default='P', type=str.upper, choices=ATTENDANCE_STATUSES,
+                      help="status for records that leave it out (default: P)")
+    mark.set_defaults(handler=mark_attendance, noun='attendance row')
+
+    grades = groups.add_parser('grades').add_subparsers(dest='command', required=True)
+    assign = grades.add_parser('assign', parents=[common, batch], help="append grade rows")
+    assign.add_argument('--course', help="course_id for records that leave it out")
+    assign.add_argument('--max-score', default='100')
+    assign.add_argument('--weight', default='1.0')
+    assign.set_defaults(handler=assign_grades, noun='grade')
+
+    users = groups.add_parser('users').add_subparsers(dest='action', required=True)
+    for action in ('add', 'update', 'remove'):
+        command = users.add_parser(action, parents=[common, batch], help=f"{action} users (one write to users.json)")
+        command.add_argument('--workers', type=int, default=None, help="processes for password hashing")
+        command.set_defaults(handler=manage_users, noun='user', command=action)
+
+    reports = groups.add_parser('reports').add_subparsers(dest='command', required=True)
+    build = reports.add_parser('build', parents=[common], help="build reports synchronously")
+    build.add_argument('--kind', default='all', choices=sorted(REPORT_KINDS))
+    build.add_argument('--out', default='reports', help="output directory")
+    build.set_defaults(handler=build_reports, noun='report file')
+    return parser
+
+
+def main(argv=None) -> int:
+    from student_management_system.storage.storage_manager import StorageManager
+    from student_management_system.decorators.logger import shutdown_logging
+
+    args = build_parser().parse_args(argv)
+    label = f"{args.group} {args.command}"
+    storage = StorageManager(args.data_dir)
+    permissions.table.set_source(os.path.join(args.data_dir, config.PERMISSIONS_FILE))
+
+    started = time.perf_counter()
+    try:
+        count = args.handler(storage, args)
+    except BatchError as e:
+        for error in e.errors:
+            print(error, file=sys.stderr)
+        print(f"{label}: rejected, nothing written.", file=sys.stderr)
+        return e.code
+    finally:
+        shutdown_logging()
+    elapsed = time.perf_counter() - started
+    rate = f", {count / elapsed:,.0f}/s" if elapsed > 0 and args.group != 'reports' else ""
+    print(f"{label}: {count} {args.noun}(s) written in {elapsed * 1000:.1f} ms{rate}.")
+    return EXIT_OK
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+# Attendance analytics
+ATTENDANCE_WINDOWS = (7, 30)   # Rolling windows (days) for attendance rates
+TERM_START = None              # 'YYYY-MM-DD'; None means since the first recorded session
+
+# Early-warning risk thresholds
+RISK_GRADE_CRITICAL = 60.0          # Average grade (%) below this is Critical
+RISK_GRADE_MODERATE = 75.0          # Average grade (%) below this is Moderate
+RISK_ATTENDANCE_CRITICAL = 70.0     # Attendance rate (%) below this is Critical
+RISK_ATTENDANCE_MODERATE = 85.0     # Attendance rate (%) below this is Moderate
+RISK_ABSENCE_RUN_CRITICAL = 5       # Consecutive absences in a course
+RISK_ABSENCE_RUN_MODERATE = 3
+
+# Background reports
+NIGHTLY_REPORT_TIME = '02:00'  # 'HH:MM' local time for the nightly full report; None disables it
+
+# Password hashing (see benchmarks/bench_login.py for the login-throughput cost of each setting)
+PASSWORD_SCHEME = 'scrypt'     # 'scrypt' or 'pbkdf2_sha256'
+SCRYPT_N = 2 ** 14             # CPU/memory cost; memory use is about 128 * N * R bytes
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 310000
+
+# Role-based permissions; data/permissions.json (same shape) overrides this and is reloaded on change
+PERMISSIONS_FILE = 'permissions.json'
+ROLE_PERMISSIONS = {
+    'Admin': ['users.view', 'users.manage', 'groups.view', 'groups.manage', 'courses.manage',
+              'reports.generate', 'reports.view', 'system.stats'],
+    'Teacher': ['attendance.mark', 'grades.assign', 'students.view', 'reports.view', 'groups.view'],
+    'Student': ['attendance.view_own', 'grades.view_own', 'courses.enroll'],
+}
+
+PAGE_SIZE = 20  # Rows per page in the user and student listings
+SEARCH_SUGGESTIONS = 8  # Matches offered when a typed username or ID is not exact
+
+# Logging (decorators/logger.py): writes are queued and flushed in batches by a background thread
+LOG_MAX_BYTES = 5 * 1024 * 1024   # Rotate a log file once it reaches this size
+LOG_ROTATE_SECONDS = 24 * 3600    # ...or once it is this old; 0 disables time-based rotation
+LOG_BACKUP_COUNT = 7              # Rotated files kept per log (gzip-compressed)
+LOG_BATCH_SIZE = 500              # Flush at least every N records while the queue stays busy
+AUDIT_DIR = 'logs/audit'          # Per-day JSON-lines audit segments and their sidecar indexes
+
+# Latency metrics (metrics.py)
+METRICS_FILE = 'logs/metrics.json'   # Periodic dump of per-action p50/p95/p99
+METRICS_DUMP_SECONDS = 60
+
+# Read-only HTTP JSON API (api.py)
+API_HOST = '127.0.0.1'     # Local only; put a reverse proxy in front for anything wider
+API_PORT = 8765
+API_CACHE_ENTRIES = 512    # Response bodies kept in the LRU cache
+
+# Multi-session server (server.py, `python main.py serve`)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8766
+SERVER_MAX_SESSIONS = 64        # One thread per connected session
+SERVER_COMMIT_DELAY = 0.05      # Seconds the writer waits to gather concurrent writes into one commit
+SERVER_COMMIT_RETRY_DELAY = 1.0 # Seconds before a failed commit is retried (with any writes queued since)
+SERVER_SHUTDOWN_RETRIES = 3     # Retries of a failed commit when stopping, before its writes are given up
+
+# Opt-in profiling (profiling.py); SMS_PROFILE* environment variables override these
+PROFILE_MODE = None                # None (off), 'cpu' (cProfile), 'memory' (tracemalloc) or 'both'
+PROFILE_ACTIONS = ()               # fnmatch patterns of action names, e.g. ('Menu: *: System Reports',); empty = all
+PROFILE_SAMPLE_RATE = 1.0          # Fraction of matching invocations to profile
+PROFILE_MAX_PER_ACTION = 20        # Cap per action per process, to bound disk use
+PROFILE_DIR = 'profiles'
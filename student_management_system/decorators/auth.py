@@ -1,4 +1,5 @@
 from functools import wraps
+from student_management_system.permissions import table
 
 def require_role(required_role: str):
     """
@@ -18,3 +19,27 @@ def require_role(required_role: str):
             return func(*args, **kwargs)
         return wrapper
     return decorator
+
+def require_permission(*permissions: str):
+    """
+    Decorator to check that the current user holds every listed permission.
+    The required mask is computed once here; each call is a single bitwise
+    test against the bitset compiled onto the user at login.
+    Raises PermissionError if unauthorized.
+    """
+    required = table.mask(*permissions)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                mask = kwargs['current_user']._permission_mask
+            except KeyError:
+                raise PermissionError("Authorization failed: No user provided.")
+            except AttributeError:
+                mask = 0
+            if mask & required != required:
+                raise PermissionError(f"Authorization failed: User lacks permission {', '.join(permissions)}.")
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
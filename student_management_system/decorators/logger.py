@@ -1,53 +1,247 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 import functools
 from datetime import datetime
+from student_management_system import config
+from student_management_system.audit import AuditSegmentHandler
+from student_management_system import metrics
+from student_management_system.profiling import profiler
 
-def _setup_logger(name, log_file, level=logging.INFO):
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    # Rotated files are compressed; the live log stays plain text
+    import gzip
+    import shutil
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    File handler that rotates on size or age and gzips rotated files
+    (system.log.1.gz, system.log.2.gz, ...).
+
+    It does not flush after every record; the queue listener flushes once per
+    batch, so a burst of records costs one write-through instead of many.
+    """
+    def __init__(self, filename: str, max_bytes: int, backup_count: int, rotate_seconds: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = _gzip_rotator
+        self.rotate_seconds = rotate_seconds
+        try:
+            started = os.path.getmtime(self.baseFilename)
+        except OSError:
+            started = time.time()
+        self._rollover_at = started + rotate_seconds
+
+    def shouldRollover(self, record) -> bool:
+        if self.rotate_seconds and time.time() >= self._rollover_at:
+            if self.stream is None:
+                self.stream = self._open()
+            # Never rotate an empty file just because time passed
+            if self.stream.tell() > 0:
+                return True
+            self._rollover_at = time.time() + self.rotate_seconds
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        super().doRollover()
+        self._rollover_at = time.time() + self.rotate_seconds
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    # Drains whatever is queued, then flushes the handlers once for the batch
+    def __init__(self, log_queue, *handlers, batch_size: int = 500):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self._batch_size = batch_size
+        self._pending = 0
+
+    def _flush(self):
+        for handler in self.handlers:
+            handler.flush()
+        self._pending = 0
+
+    def dequeue(self, block):
+        if self._pending >= self._batch_size:
+            self._flush()
+        try:
+            record = self.queue.get_nowait()
+        except queue.Empty:
+            if self._pending:
+                self._flush()
+            record = self.queue.get(block)
+        self._pending += 1
+        return record
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    # Records never leave the process, so skip the stock pre-format and copy;
+    # formatting happens once, on the listener thread
+    def prepare(self, record):
+        return record
+
+    def emit(self, record):
+        if _listener is None and self.queue is _log_queue:
+            # First record: only now create the log files and the listener thread
+            _start_listener()
+        super().emit(record)
+
+
+_log_queue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+_closed = False
+_handler_factories = []  # Build each logger's file handler when the listener starts
+
+
+def _file_handler(name, log_file):
     log_dir = os.path.dirname(log_file)
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir)
-
-    handler = logging.FileHandler(log_file)        
+    handler = CompressingRotatingFileHandler(
+        log_file, config.LOG_MAX_BYTES, config.LOG_BACKUP_COUNT, config.LOG_ROTATE_SECONDS
+    )
     formatter = logging.Formatter('%(asctime)s %(levelname)s %(message)s')
     handler.setFormatter(formatter)
+    return handler
+
+
+def _setup_logger(name, log_file, level=logging.INFO, make_handler=None):
+    # No I/O here: the handler is created by _start_listener() on first use
+    def factory():
+        handler = make_handler() if make_handler else _file_handler(name, log_file)
+        # One listener serves every log file; route records by logger name
+        handler.addFilter(logging.Filter(name))
+        return handler
+    _handler_factories.append(factory)
 
     logger = logging.getLogger(name)
     logger.setLevel(level)
+    logger.propagate = False
     if not logger.handlers:
-        logger.addHandler(handler)
+        # The caller's thread only enqueues; file I/O happens on the listener thread
+        logger.addHandler(_InProcessQueueHandler(_log_queue))
     return logger
 
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None or _closed:
+            return
+        handlers = [factory() for factory in _handler_factories]
+        listener = _BatchingQueueListener(_log_queue, *handlers, batch_size=config.LOG_BATCH_SIZE)
+        listener.start()
+        _listener = listener
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    Write out every pending record and close the log files.
+    Safe to call more than once (and if nothing was ever logged); also registered with atexit.
+    """
+    global _listener, _closed
+    with _listener_lock:
+        listener, _listener = _listener, None
+        _closed = True
+    if listener is None:
+        return
+    # stop() enqueues a sentinel behind the pending records and joins the thread
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
+        handler.close()
+
+
 system_logger = _setup_logger('system_logger', 'logs/system.log')
 security_logger = _setup_logger('security_logger', 'logs/security.log')
+audit_logger = _setup_logger('audit_logger', None, make_handler=lambda: AuditSegmentHandler(config.AUDIT_DIR))
+
+def audit(action: str, user_id: str, status: str, duration_ms: float = None, error: str = None) -> None:
+    """
+    Queue one structured audit record (see student_management_system/audit.py).
+    Args:
+        action (str): Action name, e.g. 'Add User'.
+        user_id (str): The acting user's ID.
+        status (str): 'SUCCESS' or 'FAILURE'.
+        duration_ms (float): Wall-clock duration of the action.
+        error (str): Error message for failures.
+    """
+    entry = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'user': user_id,
+        'action': action,
+        'status': status,
+        'duration_ms': round(duration_ms, 3) if duration_ms is not None else None,
+        'error': error,
+    }
+    audit_logger.info(action, extra={'audit': entry})
+
+def _acting_user_id(args, kwargs) -> str:
+    # The current_user keyword, or `self` when decorating a User method
+    user = kwargs.get('current_user')
+    if user is None and args:
+        user = args[0]
+    user_id = getattr(user, '_user_id', None)
+    return str(user_id) if user_id is not None else "Unknown"
+
+def _failed(result) -> bool:
+    # Domain methods report failure as False or {"success": False, ...}
+    return result is False or (isinstance(result, dict) and result.get('success') is False)
 
 def log_action(action_name: str):
     """
     Decorator to log actions.
-    Logs to system.log and security.log (for failures).
+    Logs to system.log and security.log (for failures), writes a structured
+    audit record, and records wall/CPU time in the latency histograms.
     """
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            user_id = "Unknown"
-            if 'current_user' in kwargs:
-                user = kwargs['current_user']
-                if hasattr(user, '_user_id'):
-                    user_id = str(user._user_id)
+            user_id = _acting_user_id(args, kwargs)
+            profile_token = profiler.begin(action_name)
+            started = metrics.start_timer()
             
             try:
                 result = func(*args, **kwargs)
-                msg = f"Action: {action_name} | UserID: {user_id} | Status: SUCCESS"
+                duration_ms = metrics.stop_timer(action_name, started) / 1e6
+                status = "FAILURE" if _failed(result) else "SUCCESS"
+                msg = f"Action: {action_name} | UserID: {user_id} | Status: {status}"
                 system_logger.info(msg)
+                audit(action_name, user_id, status, duration_ms)
                 return result
             except PermissionError as e:
+                duration_ms = metrics.stop_timer(action_name, started) / 1e6
                 msg = f"Action: {action_name} | UserID: {user_id} | Status: FAILURE | Error: {str(e)}"
                 security_logger.warning(msg)
+                audit(action_name, user_id, "FAILURE", duration_ms, str(e))
                 raise e
             except Exception as e:
+                duration_ms = metrics.stop_timer(action_name, started) / 1e6
                 msg = f"Action: {action_name} | UserID: {user_id} | Status: FAILURE | Error: {str(e)}"
                 system_logger.error(msg)
+                audit(action_name, user_id, "FAILURE", duration_ms, str(e))
                 raise e
+            finally:
+                profiler.finish(profile_token)
                 
         return wrapper
     return decorator
@@ -0,0 +1,36 @@
+import threading
+
+
+class Deferred:
+    """
+    Runs a function on a background thread; result() waits for it.
+
+    Used at startup for work the login prompt does not need, so it overlaps
+    with the user typing instead of delaying the first prompt.
+    """
+    def __init__(self, func, *args, name: str = 'deferred'):
+        self._result = None
+        self._error = None
+        self._thread = threading.Thread(target=self._run, args=(func, args), name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self, func, args):
+        try:
+            self._result = func(*args)
+        except BaseException as e:
+            self._error = e
+
+    def done(self) -> bool:
+        """True once the function has returned or raised."""
+        return not self._thread.is_alive()
+
+    def result(self):
+        """
+        Wait for the function and return its result.
+        Raises:
+            Exception: Whatever the function raised.
+        """
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
@@ -0,0 +1,219 @@
+import bisect
+import time
+
+from student_management_system import config
+from student_management_system.storage.attendance_index import AttendanceIndex, PRESENT_STATUSES
+
+RISK_LEVELS = ('OK', 'Moderate', 'Critical')
+
+
+class EarlyWarningEngine:
+    """
+    Keeps a risk level per student up to date as grades and attendance are written.
+
+    Each write only touches the affected students, and every change of level is
+    appended to a time-ordered event log so "who crossed a threshold since T"
+    is a bisect instead of a full scan.
+    """
+    def __init__(self):
+        self._grades = {}       # {sid: [weighted_sum, total_weight, perc_sum, count]}
+        self._attendance = {}   # {sid: [total, present]}
+        self._attendance_index = AttendanceIndex()
+        self._levels = {}       # {sid: (level, reasons)}
+        self._event_times = []
+        self._events = []
+
+    @classmethod
+    def from_storage(cls, storage) -> 'EarlyWarningEngine':
+        """
+        Prime an engine from existing data without emitting crossing events.
+        Args:
+            storage (StorageManager): The storage to read grades and attendance from.
+        Returns:
+            EarlyWarningEngine: The primed engine.
+        """
+        engine = cls()
+        attendance = storage.load_attendance()
+        engine._attendance_index = AttendanceIndex.from_records(attendance)
+        touched = engine._apply_attendance(attendance, index=False)
+        touched |= engine._apply_grades(storage.load_grades())
+        for sid in touched:
+            engine._levels[sid] = engine._evaluate(sid)
+        return engine
+
+    def on_storage_write(self, kind: str, records: list) -> None:
+        """
+        Storage listener; register with StorageManager.add_listener().
+        Args:
+            kind (str): 'attendance' or 'grades'.
+            records (list): The rows just written.
+        """
+        if kind == 'attendance':
+            self.record_attendance(records)
+        elif kind == 'grades':
+            self.record_grades(records)
+
+    def record_attendance(self, records: list) -> list:
+        """
+        Fold new attendance rows into the risk state.
+        Returns:
+            list: Crossing events produced by these rows.
+        """
+        return self._refresh(self._apply_attendance(records))
+
+    def record_grades(self, grades: list) -> list:
+        """
+        Fold new grade rows into the risk state.
+        Returns:
+            list: Crossing events produced by these rows.
+        """
+        return self._refresh(self._apply_grades(grades))
+
+    def _apply_attendance(self, records, index: bool = True) -> set:
+        touched = set()
+        for record in records:
+            sid = record.get('student_id')
+            if not sid:
+                continue
+            if index and not self._attendance_index.add(record):
+                continue
+            counts = self._attendance.setdefault(sid, [0, 0])
+            counts[0] += 1
+            if record.get('status') in PRESENT_STATUSES:
+                counts[1] += 1
+            touched.add(sid)
+        return touched
+
+    def _apply_grades(self, grades) -> set:
+        touched = set()
+        for g in grades:
+            sid = g.get('student_id')
+            try:
+                score = float(g.get('score', 0))
+                max_score = float(g.get('max_score', 100))
+                weight = float(g.get('weight', 0) or 0)
+            except (TypeError, ValueError):
+                continue
+            if not sid:
+                continue
+            perc = (score / max_score * 100) if max_score > 0 else 0
+            acc = self._grades.setdefault(sid, [0.0, 0.0, 0.0, 0])
+            if weight > 0:
+                acc[0] += perc * weight
+                acc[1] += weight
+            acc[2] += perc
+            acc[3] += 1
+            touched.add(sid)
+        return touched
+
+    def _refresh(self, touched: set) -> list:
+        now = time.time()
+        events = []
+        for sid in sorted(touched):
+            previous = self._levels.get(sid, ('OK', []))[0]
+            level, reasons = self._evaluate(sid)
+            self._levels[sid] = (level, reasons)
+            if level != previous:
+                event = {
+                    'student_id': sid,
+                    'from': previous,
+                    'to': level,
+                    'reasons': reasons,
+                    'timestamp': now
+                }
+                self._event_times.append(now)
+                self._events.append(event)
+                events.append(event)
+        return events
+
+    def grade_average(self, student_id: str):
+        """Weighted grade average (%) using the same rules as the progress report, or None."""
+        acc = self._grades.get(student_id)
+        if not acc or acc[3] == 0:
+            return None
+        if acc[1] > 0:
+            return acc[0] / acc[1]
+        return acc[2] / acc[3]
+
+    def attendance_rate(self, student_id: str):
+        """Overall attendance rate (%) across all courses, or None."""
+        counts = self._attendance.get(student_id)
+        if not counts or counts[0] == 0:
+            return None
+        return counts[1] / counts[0] * 100
+
+    def _evaluate(self, sid: str) -> tuple:
+        severity = 0
+        reasons = []
+
+        avg = self.grade_average(sid)
+        if avg is not None:
+            if avg < config.RISK_GRADE_CRITICAL:
+                severity = max(severity, 2)
+                reasons.append(f"average {avg:.1f}%")
+            elif avg < config.RISK_GRADE_MODERATE:
+                severity = max(severity, 1)
+                reasons.append(f"average {avg:.1f}%")
+
+        rate = self.attendance_rate(sid)
+        if rate is not None:
+            if rate < config.RISK_ATTENDANCE_CRITICAL:
+                severity = max(severity, 2)
+                reasons.append(f"attendance {rate:.0f}%")
+            elif rate < config.RISK_ATTENDANCE_MODERATE:
+                severity = max(severity, 1)
+                reasons.append(f"attendance {rate:.0f}%")
+
+        run = self._attendance_index.max_consecutive_absences(sid)
+        if run >= config.RISK_ABSENCE_RUN_CRITICAL:
+            severity = max(severity, 2)
+            reasons.append(f"{run} consecutive absences")
+        elif run >= config.RISK_ABSENCE_RUN_MODERATE:
+            severity = max(severity, 1)
+            reasons.append(f"{run} consecutive absences")
+
+        return RISK_LEVELS[severity], reasons
+
+    def risk_level(self, student_id: str) -> str:
+        """Current risk level ('OK', 'Moderate' or 'Critical') of a student."""
+        return self._levels.get(student_id, ('OK', []))[0]
+
+    def at_risk(self) -> dict:
+        """
+        All students currently above 'OK'.
+        Returns:
+            dict: {student_id: {'level': str, 'reasons': list}}
+        """
+        return {
+            sid: {'level': level, 'reasons': reasons}
+            for sid, (level, reasons) in self._levels.items()
+            if level != 'OK'
+        }
+
+    def crossed_since(self, since: float, escalations_only: bool = True) -> list:
+        """
+        Students whose risk level changed at or after a point in time.
+        Args:
+            since (float): Epoch timestamp (time.time()).
+            escalations_only (bool): Only report moves to a higher risk level.
+        Returns:
+            list: One event per student describing the net change, ordered by student ID.
+        """
+        start = bisect.bisect_left(self._event_times, since)
+        latest = {}
+        for event in self._events[start:]:
+            sid = event['student_id']
+            if sid in latest:
+                # Net change since `since`: first level seen versus current one
+                latest[sid] = dict(event, **{'from': latest[sid]['from']})
+            else:
+                latest[sid] = event
+        results = []
+        for sid in sorted(latest):
+            event = latest[sid]
+            if event['from'] == event['to']:
+                continue
+            if escalations_only and RISK_LEVELS.index(event['to']) < RISK_LEVELS.index(event['from']):
+                continue
+            results.append(event)
+        return results
@@ -0,0 +1,180 @@
+"""
+In-process latency metrics with fixed log-scale histograms.
+
+log_action and the menu dispatch in main.py record the wall-clock and CPU
+(thread) time of every action. Each histogram is a fixed array of counters
+with SUB_BUCKETS linear buckets per power of two, so recording is one
+frexp() and one increment, memory per action is constant, and percentiles
+are accurate to within one bucket (about 6%).
+"""
+import json
+import math
+import os
+import threading
+import time
+
+from student_management_system import config
+
+SUB_BUCKETS = 8      # Buckets per power of two
+MAX_EXPONENT = 40    # Values up to 2**40 ns (~18 minutes); anything longer lands in the last bucket
+BUCKET_COUNT = (MAX_EXPONENT + 1) * SUB_BUCKETS
+
+
+def bucket_index(value_ns: int) -> int:
+    """Histogram bucket for a duration in nanoseconds."""
+    if value_ns < 1:
+        return 0
+    mantissa, exponent = math.frexp(value_ns)  # value = mantissa * 2**exponent, 0.5 <= mantissa < 1
+    if exponent > MAX_EXPONENT:
+        return BUCKET_COUNT - 1
+    return exponent * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Largest duration (ns) that falls into a bucket."""
+    exponent, sub = divmod(index, SUB_BUCKETS)
+    return (0.5 + (sub + 1) / (2 * SUB_BUCKETS)) * 2 ** exponent
+
+
+class LatencyHistogram:
+    """Fixed log-scale histogram of durations in nanoseconds."""
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value_ns: int) -> None:
+        self.counts[bucket_index(value_ns)] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def percentile(self, p: float) -> float:
+        """
+        Approximate p-th percentile in nanoseconds (upper bound of its bucket, capped at max).
+        Args:
+            p (float): Percentile in [0, 100].
+        Returns:
+            float: The duration, or 0.0 if the histogram is empty.
+        """
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(bucket_upper_bound(index), float(self.max))
+        return float(self.max)
+
+    def summary(self) -> dict:
+        """Count, mean, p50/p95/p99 and max, in milliseconds."""
+        return {
+            'count': self.count,
+            'mean_ms': self.total / self.count / 1e6 if self.count else 0.0,
+            'p50_ms': self.percentile(50) / 1e6,
+            'p95_ms': self.percentile(95) / 1e6,
+            'p99_ms': self.percentile(99) / 1e6,
+            'max_ms': self.max / 1e6,
+        }
+
+
+class MetricsRegistry:
+    """
+    Wall and CPU histograms per action name.
+
+    Recording takes a short lock so threaded callers (report workers, servers)
+    never lose counts.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._actions = {}  # {action: (wall_histogram, cpu_histogram)}
+        self.started = time.time()
+
+    def record(self, action: str, wall_ns: int, cpu_ns: int) -> None:
+        with self._lock:
+            pair = self._actions.get(action)
+            if pair is None:
+                pair = self._actions[action] = (LatencyHistogram(), LatencyHistogram())
+            pair[0].record(wall_ns)
+            pair[1].record(cpu_ns)
+
+    def snapshot(self) -> dict:
+        """
+        Summaries of every action.
+        Returns:
+            dict: {action: {'wall': summary, 'cpu': summary}}
+        """
+        with self._lock:
+            return {
+                action: {'wall': wall.summary(), 'cpu': cpu.summary()}
+                for action, (wall, cpu) in sorted(self._actions.items())
+            }
+
+    def dump(self, path: str) -> bool:
+        """
+        Write the current summaries to a JSON file (atomically).
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        payload = {'since': self.started, 'written': time.time(), 'actions': self.snapshot()}
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(payload, f, indent=4)
+            os.replace(tmp_path, path)
+            return True
+        except IOError:
+            return False
+
+
+# Shared registry fed by log_action and the menu dispatch
+registry = MetricsRegistry()
+
+
+def start_timer() -> tuple:
+    """Wall and thread-CPU clocks, to pass to stop_timer()."""
+    return time.perf_counter_ns(), time.thread_time_ns()
+
+
+def stop_timer(action: str, started: tuple) -> int:
+    """
+    Record the time elapsed since start_timer() for an action.
+    Returns:
+        int: Wall-clock nanoseconds elapsed.
+    """
+    wall_ns = time.perf_counter_ns() - started[0]
+    registry.record(action, wall_ns, time.thread_time_ns() - started[1])
+    return wall_ns
+
+
+class MetricsDumper:
+    """Background thread that writes the registry to a metrics file periodically."""
+    def __init__(self, path: str = None, interval: float = None, metrics: MetricsRegistry = None):
+        self._path = path or config.METRICS_FILE
+        self._interval = interval or config.METRICS_DUMP_SECONDS
+        self._registry = metrics or registry
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='metrics-dumper', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self._registry.dump(self._path)
+
+    def stop(self) -> None:
+        """Stop the thread and write a final dump."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._registry.dump(self._path)
@@ -1,13 +1,50 @@
-# NOTE: IDs and data operations are placeholders.
-# Persistence and ID generation are handled by StorageManager.
+# NOTE: Persistence and ID generation are handled by StorageManager.
+# Users are stored as dicts with underscored keys ('_user_id', '_username', ...);
+# User.from_record() and to_record() convert between those and the classes.
 
 from abc import ABC, abstractmethod
+from student_management_system.passwords import verify_password, stored_password
+from student_management_system.decorators.logger import log_action
+
+VALID_ROLES = ('Admin', 'Teacher', 'Student')
+
+def validate_new_users(existing_users: list, users_data: list) -> list:
+    """
+    Check a batch of new storage records before any of it is added.
+    
+    Args:
+        existing_users (list): Current storage records.
+        users_data (list): New records with _username, _user_id and _role.
+        
+    Returns:
+        list: One message per problem, prefixed with the 1-based row; empty if valid.
+    """
+    usernames = {user.get("_username") for user in existing_users}
+    user_ids = {user.get("_user_id") for user in existing_users}
+    errors = []
+    for row, user_data in enumerate(users_data, start=1):
+        username = user_data.get("_username")
+        user_id = user_data.get("_user_id")
+        if not username:
+            errors.append(f"Row {row}: username is required.")
+        elif username in usernames:
+            errors.append(f"Row {row}: username '{username}' already exists.")
+        if not user_id:
+            errors.append(f"Row {row}: user_id is required.")
+        elif user_id in user_ids:
+            errors.append(f"Row {row}: user_id '{user_id}' already exists.")
+        if user_data.get("_role") not in VALID_ROLES:
+            errors.append(f"Row {row}: role must be one of {', '.join(VALID_ROLES)}.")
+        usernames.add(username)
+        user_ids.add(user_id)
+    return errors
+
 
 class User(ABC):
     """
     Abstract Base Class representing a generic user in the system.
     """
-    def __init__(self, username: str, password_hash: str, role: str, is_active: bool = True):
+    def __init__(self, username: str, password_hash: str, role: str, is_active: bool = True, user_id: str = None):
         """
         Initialize the User.
         
@@ -16,25 +53,72 @@ class User(ABC):
             password_hash (str): The hashed password.
             role (str): The role of the user (e.g., 'Admin', 'Teacher', 'Student').
             is_active (bool): Whether the user account is active. Defaults to True.
+            user_id (str): The ID allocated by StorageManager; a placeholder if omitted.
         """
-        self._user_id = "U-000"  # Placeholder ID
+        self._user_id = user_id or "U-000"  # Placeholder until stored
         self._username = username
         self._password_hash = password_hash
         self._role = role
         self._is_active = is_active
+        self._extra = {}  # Stored keys no class reads, written back unchanged
+
+    @classmethod
+    def from_record(cls, record: dict):
+        """
+        Build the subclass matching a storage record's role.
+        
+        Args:
+            record (dict): A users.json entry.
+            
+        Returns:
+            User: The Admin, Teacher or Student, or None if the role is unknown.
+        """
+        user_class = ROLE_CLASSES.get(record.get('_role'))
+        if user_class is None:
+            return None
+        user = user_class(record.get('_username'), stored_password(record),
+                          record.get('_is_active', True), user_id=record.get('_user_id'))
+        user._load_record(record)
+        # Anything to_record() does not produce is kept as is; the legacy
+        # '_password' key is superseded by '_password_hash'
+        known = user.to_record()
+        user._extra = {k: v for k, v in record.items() if k not in known and k != '_password'}
+        return user
+
+    def _load_record(self, record: dict) -> None:
+        """Hook for subclasses to read their own stored fields (see to_record())."""
+
+    def to_record(self) -> dict:
+        """
+        Serialize to the users.json format. Subclasses add their own fields,
+        so from_record(r).to_record() loses nothing from r.
+        
+        Returns:
+            dict: The storage record.
+        """
+        record = {
+            '_user_id': self._user_id,
+            '_username': self._username,
+            '_password_hash': self._password_hash,
+            '_role': self._role,
+            '_is_active': self._is_active,
+        }
+        record.update(self._extra)
+        return record
 
+    @log_action("Login")
     def authenticate(self, input_password: str) -> bool:
         """
-        Authenticate the user by comparing hashes.
+        Authenticate the user against the stored password hash.
         
         Args:
-            input_password (str): The password hash to check against.
+            input_password (str): The plaintext password typed by the user.
             
         Returns:
             bool: True if authentication succeeds, False otherwise.
         """
-        # Actual hashing is handled elsewhere; compare hashes only
-        return self._is_active and self._password_hash == input_password
+        # Legacy plaintext values are still accepted until they are re-hashed
+        return self._is_active and verify_password(input_password, self._password_hash)
 
     @abstractmethod
     def view_profile(self) -> dict:
@@ -46,6 +130,7 @@ class User(ABC):
         """
         raise NotImplementedError("Subclasses must implement view_profile")
 
+    @log_action("Change Password")
     def change_password(self, new_password_hash: str) -> bool:
         """
         Change the user's password.
@@ -68,30 +153,61 @@ class Admin(User):
     """
     Admin subclass representing an administrator.
     """
-    def __init__(self, username: str, password_hash: str, is_active: bool = True):
-        super().__init__(username, password_hash, "Admin", is_active)
-        self._admin_id = "A-000"  # Placeholder ID
+    def __init__(self, username: str, password_hash: str, is_active: bool = True, user_id: str = None):
+        super().__init__(username, password_hash, "Admin", is_active, user_id)
+        self._admin_id = user_id or "A-000"  # Placeholder until stored
         self._permissions = []    # List of permissions
         self._groups = []         # Internal list of groups
-        self._users = []          # Internal list of users
+        self._users = []          # Internal list of users, as storage records
+        self._courses = []        # Internal list of courses (the catalog)
+
+    def _load_record(self, record: dict) -> None:
+        self._admin_id = record.get('_admin_id', self._admin_id)
+        self._permissions = list(record.get('_permissions', []))
 
+    def to_record(self) -> dict:
+        record = super().to_record()
+        record['_admin_id'] = self._admin_id
+        record['_permissions'] = list(self._permissions)
+        return record
+
+    @log_action("Add User")
     def add_user(self, user_data: dict) -> bool:
         """
         Add a new user to the system.
         
         Args:
-            user_data (dict): Dictionary containing new user information.
+            user_data (dict): Storage record of the new user.
             
         Returns:
             bool: True if successful.
         """
         # Check if user already exists based on username or user_id
         for user in self._users:
-            if user.get("username") == user_data.get("username"):
+            if user.get("_username") == user_data.get("_username"):
                 return False
         self._users.append(user_data)
         return True
 
+    @log_action("Add Users (Batch)")
+    def add_users(self, users_data: list) -> dict:
+        """
+        Add a batch of users atomically: either every user is added or none is.
+        
+        Args:
+            users_data (list): Storage records with at least _username, _user_id and _role.
+            
+        Returns:
+            dict: {"success": bool, "count": int, "errors": list}
+        """
+        # Validate the whole batch against the existing users (and against itself) first
+        errors = validate_new_users(self._users, users_data)
+        if errors:
+            return {"success": False, "count": 0, "errors": errors}
+        self._users.extend(users_data)
+        return {"success": True, "count": len(users_data), "errors": []}
+
+    @log_action("Create Group")
     def add_group(self, group_data: dict) -> bool:
         """
         Add a new group to the system.
@@ -111,6 +227,7 @@ class Admin(User):
         self._groups.append(group_data)
         return True
 
+    @log_action("Delete User")
     def remove_user(self, user_id: str) -> bool:
         """
         Remove a user from the system.
@@ -122,11 +239,32 @@ class Admin(User):
             bool: True if successful.
         """
         for i, user in enumerate(self._users):
-            if user.get("user_id") == user_id:
+            if user.get("_user_id") == user_id:
                 self._users.pop(i)
                 return True
         return False
 
+    @log_action("Delete Users (Batch)")
+    def remove_users(self, user_ids: list) -> dict:
+        """
+        Remove a batch of users atomically: either every user is removed or none is.
+
+        Args:
+            user_ids (list): IDs of the users to remove.
+
+        Returns:
+            dict: {"success": bool, "count": int, "errors": list}
+        """
+        existing = {user.get("_user_id") for user in self._users}
+        errors = [f"User '{user_id}' not found." for user_id in user_ids if user_id not in existing]
+        if errors:
+            return {"success": False, "count": 0, "errors": errors}
+
+        to_remove = set(user_ids)
+        self._users[:] = [user for user in self._users if user.get("_user_id") not in to_remove]
+        return {"success": True, "count": len(to_remove), "errors": []}
+
+    @log_action("Delete Group")
     def remove_group(self, group_id: str) -> bool:
         """
         Remove a group from the system.
@@ -143,30 +281,71 @@ class Admin(User):
                 return True
         return False
 
+    @log_action("Update User")
     def update_user(self, user_data: dict) -> bool:
         """
         Update user information.
 
         Args:
-            user_data (dict): Dictionary containing user information.
+            user_data (dict): _user_id plus the storage fields to change.
 
         Returns:
             bool: True if successful.
         """
-        # Update allowed fields (username, is_active) from dict input
-        user_id = user_data.get("user_id")
+        # Update allowed fields (_username, _is_active) from dict input
+        user_id = user_data.get("_user_id")
         if not user_id:
             return False
 
         for user in self._users:
-            if user.get("user_id") == user_id:
-                if "username" in user_data:
-                    user["username"] = user_data["username"]
-                if "is_active" in user_data:
-                    user["is_active"] = user_data["is_active"]
+            if user.get("_user_id") == user_id:
+                if "_username" in user_data:
+                    user["_username"] = user_data["_username"]
+                if "_is_active" in user_data:
+                    user["_is_active"] = user_data["_is_active"]
                 return True
         return False
 
+    @log_action("Update Users (Batch)")
+    def update_users(self, updates: list) -> dict:
+        """
+        Update a batch of users atomically: either every update applies or none does.
+
+        Args:
+            updates (list): Dictionaries with _user_id plus _username and/or _is_active.
+
+        Returns:
+            dict: {"success": bool, "count": int, "errors": list}
+        """
+        by_id = {user.get("_user_id"): user for user in self._users}
+        usernames = {user.get("_username"): user.get("_user_id") for user in self._users}
+        errors = []
+
+        for row, user_data in enumerate(updates, start=1):
+            user_id = user_data.get("_user_id")
+            if user_id not in by_id:
+                errors.append(f"Row {row}: user '{user_id}' not found.")
+                continue
+            new_username = user_data.get("_username")
+            if new_username:
+                owner = usernames.get(new_username)
+                if owner is not None and owner != user_id:
+                    errors.append(f"Row {row}: username '{new_username}' already exists.")
+                    continue
+                usernames.pop(by_id[user_id].get("_username"), None)
+                usernames[new_username] = user_id
+
+        if errors:
+            return {"success": False, "count": 0, "errors": errors}
+        for user_data in updates:
+            user = by_id[user_data["_user_id"]]
+            if user_data.get("_username"):
+                user["_username"] = user_data["_username"]
+            if "_is_active" in user_data:
+                user["_is_active"] = user_data["_is_active"]
+        return {"success": True, "count": len(updates), "errors": []}
+
+    @log_action("Update Group")
     def update_group(self, group_data: dict) -> bool:
         """
         Update group information.
@@ -187,6 +366,7 @@ class Admin(User):
                 return True
         return False
 
+    @log_action("Manage Course")
     def manage_course(self, course_data: dict) -> bool:
         """
         Create or update course information.
@@ -197,9 +377,39 @@ class Admin(User):
         Returns:
             bool: True if successful.
         """
-        # Placeholder for course management logic (not fully specified in requirements, but returns Boolean)
+        # Update the course if it exists, otherwise create it (a new course needs a name)
+        course_id = course_data.get("course_id")
+        if not course_id:
+            return False
+
+        for course in self._courses:
+            if course.get("course_id") == course_id:
+                course.update(course_data)
+                return True
+
+        if not course_data.get("name"):
+            return False
+        self._courses.append(course_data)
         return True
 
+    @log_action("Delete Course")
+    def remove_course(self, course_id: str) -> bool:
+        """
+        Remove a course from the catalog.
+
+        Args:
+            course_id (str): The ID of the course to remove.
+
+        Returns:
+            bool: True if successful.
+        """
+        for i, course in enumerate(self._courses):
+            if course.get("course_id") == course_id:
+                self._courses.pop(i)
+                return True
+        return False
+
+    @log_action("System Report")
     def generate_system_report(self) -> dict:
         """
         Generate a system-wide report.
@@ -228,12 +438,25 @@ class Teacher(User):
     """
     Teacher subclass representing an instructor.
     """
-    def __init__(self, username: str, password_hash: str, is_active: bool = True):
-        super().__init__(username, password_hash, "Teacher", is_active)
-        self._teacher_id = "T-000"  # Placeholder ID
+    def __init__(self, username: str, password_hash: str, is_active: bool = True, user_id: str = None):
+        super().__init__(username, password_hash, "Teacher", is_active, user_id)
+        self._teacher_id = user_id or "T-000"  # Placeholder until stored
         self._department = "General"
         self._assigned_courses = []
 
+    def _load_record(self, record: dict) -> None:
+        self._teacher_id = record.get('_teacher_id', self._teacher_id)
+        self._department = record.get('_department', self._department)
+        self._assigned_courses = list(record.get('_assigned_courses', []))
+
+    def to_record(self) -> dict:
+        record = super().to_record()
+        record['_teacher_id'] = self._teacher_id
+        record['_department'] = self._department
+        record['_assigned_courses'] = list(self._assigned_courses)
+        return record
+
+    @log_action("Mark Attendance")
     def mark_attendance(self, student_list: list, date: str) -> dict:
         """
         Mark attendance for a list of students.
@@ -253,6 +476,7 @@ class Teacher(User):
             "status": "recorded"
         }
 
+    @log_action("Assign Grade")
     def assign_grade(self, student_id: str, course_id: str, grade: float) -> dict:
         """
         Assign a grade to a student.
@@ -313,9 +537,9 @@ class Student(User):
     """
     Student subclass representing a student user.
     """
-    def __init__(self, username: str, password_hash: str, is_active: bool = True):
-        super().__init__(username, password_hash, "Student", is_active)
-        self._student_id = "S-000"  # Placeholder ID
+    def __init__(self, username: str, password_hash: str, is_active: bool = True, user_id: str = None):
+        super().__init__(username, password_hash, "Student", is_active, user_id)
+        self._student_id = user_id or "S-000"  # Placeholder until stored
         self._enrolled_courses = []
         self._academic_year = 1
         self._grades = {} # Dictionary to store grades: {course_id: grade}
@@ -355,6 +579,7 @@ class Student(User):
         total_points = sum(self._grades.values())
         return total_points / len(self._grades)
 
+    @log_action("Enroll Course")
     def enroll_course(self, course_id: str) -> bool:
         """
         Enroll in a course.
@@ -371,6 +596,19 @@ class Student(User):
             return True
         return False
 
+    def _load_record(self, record: dict) -> None:
+        self._student_id = record.get('_student_id', self._student_id)
+        self._academic_year = record.get('_academic_year', self._academic_year)
+        # Legacy enrollments kept in users.json (enrollments.csv is the current source)
+        self._enrolled_courses = list(record.get('_enrolled_courses', []))
+
+    def to_record(self) -> dict:
+        record = super().to_record()
+        record['_student_id'] = self._student_id
+        record['_academic_year'] = self._academic_year
+        record['_enrolled_courses'] = list(self._enrolled_courses)
+        return record
+
     def view_profile(self) -> dict:
         """Override to view Student profile."""
         return {
@@ -381,3 +619,6 @@ class Student(User):
             "academic_year": self._academic_year,
             "enrolled_courses": self._enrolled_courses
         }
+
+
+ROLE_CLASSES = {'Admin': Admin, 'Teacher': Teacher, 'Student': Student}
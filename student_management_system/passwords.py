@@ -0,0 +1,197 @@
+"""
+Password hashing with tunable cost (stdlib scrypt / PBKDF2).
+
+Stored format:
+    scrypt$<n>$<r>$<p>$<salt_b64>$<hash_b64>
+    pbkdf2_sha256$<iterations>$<salt_b64>$<hash_b64>
+
+Anything else is treated as a legacy plaintext value so existing accounts
+keep working until they are re-hashed on login or by the bulk migration:
+
+    python -m student_management_system.passwords migrate [--data-dir DIR] [--workers N]
+"""
+import base64
+import hashlib
+import hmac
+import os
+import sys
+
+from student_management_system import config
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def current_policy() -> dict:
+    """
+    The hashing policy configured in config.py.
+    Returns:
+        dict: {'scheme': ..., plus the scheme's cost parameters}
+    """
+    if config.PASSWORD_SCHEME == 'pbkdf2_sha256':
+        return {'scheme': 'pbkdf2_sha256', 'iterations': config.PBKDF2_ITERATIONS}
+    return {'scheme': 'scrypt', 'n': config.SCRYPT_N, 'r': config.SCRYPT_R, 'p': config.SCRYPT_P}
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode('ascii')
+
+
+def _derive(password: str, salt: bytes, policy: dict) -> bytes:
+    if policy['scheme'] == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, policy['iterations'], KEY_BYTES)
+    n, r, p = policy['n'], policy['r'], policy['p']
+    # scrypt needs ~128*r*n bytes; raise OpenSSL's 32 MiB default when the cost asks for more
+    maxmem = max(32 * 1024 * 1024, 256 * r * (n + p))
+    return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=KEY_BYTES)
+
+
+def hash_password(password: str, policy: dict = None, salt: bytes = None) -> str:
+    """
+    Hash a password with a fresh random salt.
+    Args:
+        password (str): The plaintext password.
+        policy (dict): Optional policy; defaults to current_policy().
+        salt (bytes): Fixed salt, only for reproducible generated data.
+    Returns:
+        str: The encoded hash.
+    """
+    policy = policy or current_policy()
+    salt = salt or os.urandom(SALT_BYTES)
+    digest = _derive(password, salt, policy)
+    if policy['scheme'] == 'pbkdf2_sha256':
+        return f"pbkdf2_sha256${policy['iterations']}${_b64(salt)}${_b64(digest)}"
+    return f"scrypt${policy['n']}${policy['r']}${policy['p']}${_b64(salt)}${_b64(digest)}"
+
+
+def _parse(stored: str):
+    # Returns (policy, salt, digest), or None for legacy plaintext values
+    if not isinstance(stored, str):
+        return None
+    parts = stored.split('$')
+    try:
+        if parts[0] == 'scrypt' and len(parts) == 6:
+            policy = {'scheme': 'scrypt', 'n': int(parts[1]), 'r': int(parts[2]), 'p': int(parts[3])}
+            return policy, base64.b64decode(parts[4]), base64.b64decode(parts[5])
+        if parts[0] == 'pbkdf2_sha256' and len(parts) == 4:
+            policy = {'scheme': 'pbkdf2_sha256', 'iterations': int(parts[1])}
+            return policy, base64.b64decode(parts[2]), base64.b64decode(parts[3])
+    except (ValueError, TypeError):
+        return None
+    return None
+
+
+def is_hashed(stored: str) -> bool:
+    """Return True if `stored` is in one of the supported hash formats."""
+    return _parse(stored) is not None
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """
+    Check a plaintext password against a stored hash (or legacy plaintext).
+    Args:
+        password (str): The password typed by the user.
+        stored (str): The stored value.
+    Returns:
+        bool: True if they match.
+    """
+    if stored is None or password is None:
+        return False
+    parsed = _parse(stored)
+    if parsed is None:
+        return hmac.compare_digest(str(stored).encode('utf-8'), password.encode('utf-8'))
+    policy, salt, digest = parsed
+    return hmac.compare_digest(_derive(password, salt, policy), digest)
+
+
+def needs_rehash(stored: str, policy: dict = None) -> bool:
+    """
+    Return True if a stored value is plaintext or uses a different policy than the current one.
+    """
+    parsed = _parse(stored)
+    return parsed is None or parsed[0] != (policy or current_policy())
+
+
+def stored_password(record: dict):
+    """
+    The password value of a storage record; older records used a '_password' key.
+    """
+    return record.get('_password_hash', record.get('_password'))
+
+
+def set_password_hash(record: dict, password_hash: str) -> None:
+    """Store a hash on a storage record and drop any legacy plaintext key."""
+    record['_password_hash'] = password_hash
+    record.pop('_password', None)
+
+
+def _hash_with_policy(args: tuple) -> str:
+    password, policy = args
+    return hash_password(password, policy)
+
+
+def hash_passwords(plaintexts: list, workers: int = None, policy: dict = None) -> list:
+    """
+    Hash many passwords, spreading the work across processes.
+    Args:
+        plaintexts (list): Plaintext passwords.
+        workers (int): Worker processes; defaults to os.cpu_count().
+        policy (dict): Optional policy; defaults to current_policy().
+    Returns:
+        list: Encoded hashes, in input order.
+    """
+    policy = policy or current_policy()
+    jobs = [(str(password), policy) for password in plaintexts]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        return [_hash_with_policy(job) for job in jobs]
+    # Only bulk operations need a process pool; keep it off the import path
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        return list(pool.map(_hash_with_policy, jobs, chunksize=chunksize))
+
+
+def migrate_users(users: list, workers: int = None, policy: dict = None) -> int:
+    """
+    Re-hash every plaintext password in a list of storage records, in parallel.
+    Records already hashed (under any policy) are left for lazy rehash on login.
+    Args:
+        users (list): Storage-format user dictionaries; updated in place.
+        workers (int): Worker processes; defaults to os.cpu_count().
+        policy (dict): Optional policy; defaults to current_policy().
+    Returns:
+        int: Number of records converted.
+    """
+    pending = [u for u in users if stored_password(u) is not None and not is_hashed(stored_password(u))]
+    hashes = hash_passwords([stored_password(u) for u in pending], workers, policy)
+    for user, password_hash in zip(pending, hashes):
+        set_password_hash(user, password_hash)
+    return len(pending)
+
+
+def main(argv=None) -> int:
+    import argparse
+    from student_management_system.storage.storage_manager import StorageManager
+
+    parser = argparse.ArgumentParser(prog='python -m student_management_system.passwords')
+    sub = parser.add_subparsers(dest='command', required=True)
+    migrate = sub.add_parser('migrate', help="hash every plaintext password in users.json")
+    migrate.add_argument('--data-dir', default='student_management_system/data')
+    migrate.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    storage = StorageManager(args.data_dir)
+    users = storage.load_users()
+    storage.backup_data()
+    converted = migrate_users(users, args.workers)
+    if converted and not storage.save_users(users):
+        print("Failed to save users.json.", file=sys.stderr)
+        return 1
+    print(f"Converted {converted} of {len(users)} accounts to {current_policy()['scheme']}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import json
+import os
+
+from student_management_system import config
+
+ALL = 'all'  # Wildcard permission granting every known permission
+
+
+class PermissionTable:
+    """
+    Maps permission names to bit positions and roles to permission masks.
+
+    Bit positions are append-only, so masks computed once (for example by
+    require_permission at decoration time) stay valid after a reload. The
+    table can be reloaded from a JSON file without restarting; `generation`
+    increases on every reload so cached user masks know to recompile.
+    """
+    def __init__(self, role_permissions: dict = None, path: str = None):
+        self._bits = {}
+        self._roles = {}
+        self._path = path
+        self._version = None
+        self.generation = 0
+        self._apply(role_permissions or config.ROLE_PERMISSIONS)
+
+    def _bit(self, name: str) -> int:
+        bit = self._bits.get(name)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[name] = bit
+            # 'all' masks compiled earlier do not include the new bit
+            self.generation += 1
+        return bit
+
+    def _apply(self, role_permissions: dict):
+        self._roles = {role: list(names) for role, names in role_permissions.items()}
+        for names in self._roles.values():
+            for name in names:
+                if name != ALL:
+                    self._bit(name)
+        self.generation += 1
+
+    def set_source(self, path: str) -> bool:
+        """
+        Use a JSON file ({"Role": ["permission", ...]}) as the table source.
+        Returns:
+            bool: True if the table changed.
+        """
+        self._path = path
+        self._version = None
+        return self.reload()
+
+    def reload(self) -> bool:
+        """
+        Re-read the source file if it changed since the last load.
+        Returns:
+            bool: True if the table changed.
+        """
+        if not self._path:
+            return False
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return False
+        version = (st.st_mtime_ns, st.st_size)
+        if version == self._version:
+            return False
+        try:
+            with open(self._path, 'r') as f:
+                role_permissions = json.load(f)
+        except (IOError, ValueError):
+            return False
+        self._version = version
+        self._apply(role_permissions)
+        return True
+
+    def mask(self, *names) -> int:
+        """
+        Bitmask for a set of permission names ('all' means every known permission).
+        """
+        value = 0
+        for name in names:
+            if name == ALL:
+                value |= (1 << len(self._bits)) - 1
+            else:
+                value |= self._bit(name)
+        return value
+
+    def names(self, mask: int) -> list:
+        """Permission names contained in a mask, sorted."""
+        return sorted(name for name, bit in self._bits.items() if mask & bit)
+
+    def compile(self, role: str, extra_permissions=None) -> int:
+        """
+        Compile a user's role and per-user permission list into one mask.
+        Args:
+            role (str): The user's role.
+            extra_permissions (list): Per-user permissions (the stored '_permissions').
+        Returns:
+            int: The user's permission bitset.
+        """
+        return self.mask(*self._roles.get(role, ()), *(extra_permissions or ()))
+
+
+# Shared table used by require_permission and the session
+table = PermissionTable()
+
+
+def grant(user, extra_permissions=None) -> int:
+    """
+    Compile and cache a user's permission mask on the user object.
+    Args:
+        user (User): The logged-in user.
+        extra_permissions (list): Per-user permissions from storage.
+    Returns:
+        int: The mask stored in user._permission_mask.
+    """
+    user._permission_mask = table.compile(user._role, extra_permissions)
+    user._permission_generation = table.generation
+    return user._permission_mask
+
+
+def has_permission(user, required_mask: int) -> bool:
+    """Single bitwise test of a precomputed mask against the user's cached bitset."""
+    return (getattr(user, '_permission_mask', 0) & required_mask) == required_mask
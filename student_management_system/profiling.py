@@ -0,0 +1,180 @@
+"""
+Opt-in, sampled profiling of individual actions.
+
+Disabled by default. Enable it in config.py or through the environment:
+
+    SMS_PROFILE=cpu|memory|both               what to collect (cProfile, tracemalloc or both)
+    SMS_PROFILE_ACTIONS='Menu: *: System Reports,Report: *'
+                                              comma-separated fnmatch patterns of action names
+    SMS_PROFILE_SAMPLE=0.1                    fraction of matching invocations to profile
+    SMS_PROFILE_MAX=20                        profiles kept per action per process
+    SMS_PROFILE_DIR=profiles                  output directory
+
+Action names are the log_action names ('Add User'), the menu dispatch names
+('Menu: Admin: System Reports') and background report jobs ('Report: all').
+Each profiled invocation writes <time>-<action>-<pid>-<n>.prof (open with
+pstats or snakeviz) and/or a matching -alloc.txt with the top allocations.
+When disabled, or when an invocation is not sampled, the cost is one check.
+"""
+import fnmatch
+import itertools
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from student_management_system import config
+
+MODES = ('cpu', 'memory', 'both')
+TOP_ALLOCATIONS = 25
+
+
+class Profiler:
+    """
+    Decides which invocations to profile and writes their results.
+
+    Only one invocation per thread is profiled at a time (nested actions are
+    covered by the outer profile). tracemalloc and cProfile are both
+    process-wide (Python 3.12+ refuses a second active cProfile), so each is
+    used by one invocation at a time; concurrent invocations go unprofiled.
+    """
+    def __init__(self, mode: str = None, actions=(), sample_rate: float = 1.0,
+                 max_per_action: int = 20, directory: str = 'profiles', seed: int = None):
+        self.mode = mode if mode in MODES else None
+        self.patterns = tuple(actions) or ('*',)
+        self.sample_rate = sample_rate
+        self.max_per_action = max_per_action
+        self.directory = directory
+        self._seed = seed
+        self._random = None  # Created on first sampling decision
+        self._matches = {}   # {action: bool}, fnmatch results cached per name
+        self._taken = {}     # {action: profiles written}
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._tracing = False
+        self._cpu_busy = False
+
+    @classmethod
+    def from_config(cls) -> 'Profiler':
+        """Build a profiler from config.py, overridden by SMS_PROFILE* environment variables."""
+        env = os.environ
+        actions = env.get('SMS_PROFILE_ACTIONS')
+        actions = [a.strip() for a in actions.split(',') if a.strip()] if actions else config.PROFILE_ACTIONS
+        return cls(
+            mode=env.get('SMS_PROFILE', config.PROFILE_MODE),
+            actions=actions,
+            sample_rate=float(env.get('SMS_PROFILE_SAMPLE', config.PROFILE_SAMPLE_RATE)),
+            max_per_action=int(env.get('SMS_PROFILE_MAX', config.PROFILE_MAX_PER_ACTION)),
+            directory=env.get('SMS_PROFILE_DIR', config.PROFILE_DIR),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode is not None
+
+    def _selected(self, action: str) -> bool:
+        matched = self._matches.get(action)
+        if matched is None:
+            matched = any(fnmatch.fnmatchcase(action, p) for p in self.patterns)
+            self._matches[action] = matched
+        if not matched or getattr(self._local, 'active', False):
+            return False
+        with self._lock:
+            if self._taken.get(action, 0) >= self.max_per_action:
+                return False
+            if self.sample_rate < 1.0:
+                if self._random is None:
+                    import random
+                    self._random = random.Random(self._seed)
+                if self._random.random() >= self.sample_rate:
+                    return False
+            self._taken[action] = self._taken.get(action, 0) + 1
+        return True
+
+    def begin(self, action: str):
+        """
+        Start profiling an invocation if it is selected.
+        Returns:
+            tuple|None: Token for finish(), or None if this invocation is not profiled.
+        """
+        if self.mode is None or not self._selected(action):
+            return None
+        # Imported here so that importing this module stays cheap when profiling is off
+        import cProfile
+        import tracemalloc
+        profile = None
+        memory_before = None
+        with self._lock:
+            if self.mode in ('memory', 'both') and not self._tracing and not tracemalloc.is_tracing():
+                self._tracing = True
+                tracemalloc.start()
+                memory_before = tracemalloc.take_snapshot()
+            if self.mode in ('cpu', 'both') and not self._cpu_busy:
+                profile = cProfile.Profile()
+                try:
+                    profile.enable()
+                    self._cpu_busy = True
+                except ValueError:  # Another profiler (e.g. an outside cProfile run) is active
+                    profile = None
+            if profile is None and memory_before is None:
+                self._taken[action] -= 1  # Nothing will be written; leave the quota for a later call
+                return None
+        self._local.active = True
+        return (action, profile, memory_before)
+
+    def finish(self, token) -> list:
+        """
+        Stop profiling and write the results.
+        Returns:
+            list: Paths written (empty if nothing was profiled).
+        """
+        if token is None:
+            return []
+        import tracemalloc
+        action, profile, memory_before = token
+        if profile is not None:
+            profile.disable()
+            with self._lock:
+                self._cpu_busy = False
+        memory_after = None
+        if memory_before is not None:
+            memory_after = tracemalloc.take_snapshot()
+            with self._lock:
+                tracemalloc.stop()
+                self._tracing = False
+        self._local.active = False
+
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', action).strip('_')
+        base = os.path.join(
+            self.directory,
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}-{slug}-{os.getpid()}-{next(self._seq)}"
+        )
+        written = []
+        if profile is not None:
+            profile.dump_stats(f"{base}.prof")
+            written.append(f"{base}.prof")
+        if memory_after is not None:
+            stats = memory_after.compare_to(memory_before, 'lineno')
+            with open(f"{base}-alloc.txt", 'w') as f:
+                f.write(f"Top {TOP_ALLOCATIONS} allocation changes during '{action}'\n")
+                f.write(f"Traced memory now: {sum(s.size for s in memory_after.statistics('filename')) / 1024:.1f} KiB\n\n")
+                for stat in stats[:TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+            written.append(f"{base}-alloc.txt")
+        return written
+
+    @contextmanager
+    def profile(self, action: str):
+        """Context manager form of begin()/finish()."""
+        token = self.begin(action)
+        try:
+            yield
+        finally:
+            self.finish(token)
+
+
+# Shared profiler used by log_action, the menu dispatch and the report scheduler
+profiler = Profiler.from_config()
@@ -0,0 +1,152 @@
+import bisect
+
+OVERALL = None  # Board key for the cross-course ranking
+
+
+class _Board:
+    """
+    Order-statistic structure for one course: a sorted array of (-score, student_id).
+    """
+    __slots__ = ('keys', 'scores')
+
+    def __init__(self):
+        self.keys = []
+        self.scores = {}
+
+    def update(self, student_id: str, score: float):
+        old = self.scores.get(student_id)
+        if old is not None:
+            if old == score:
+                return
+            pos = bisect.bisect_left(self.keys, (-old, student_id))
+            del self.keys[pos]
+        self.scores[student_id] = score
+        bisect.insort(self.keys, (-score, student_id))
+
+    def better_than(self, score: float) -> int:
+        # Number of students with a strictly higher score
+        return bisect.bisect_left(self.keys, (-score, ''))
+
+
+class RankingIndex:
+    """
+    Class rank, percentile and leaderboards per course and overall.
+
+    Each new grade re-scores a single student and moves them within a sorted
+    array, so rank and percentile are bisect lookups rather than a sort of the
+    whole grades list per request.
+    """
+    def __init__(self):
+        self._acc = {}      # {(sid, course_id): [weighted_sum, total_weight, perc_sum, count]}
+        self._boards = {}   # {course_id or OVERALL: _Board}
+
+    @classmethod
+    def from_storage(cls, storage) -> 'RankingIndex':
+        """
+        Build rankings from all stored grades.
+        Args:
+            storage (StorageManager): Storage to read grades.csv from.
+        Returns:
+            RankingIndex: The populated index.
+        """
+        index = cls()
+        index.add_grades(storage.load_grades())
+        return index
+
+    def on_storage_write(self, kind: str, records: list) -> None:
+        """Storage listener; register with StorageManager.add_listener()."""
+        if kind == 'grades':
+            self.add_grades(records)
+
+    def add_grades(self, grades) -> int:
+        """
+        Fold grade rows into the rankings.
+        Args:
+            grades (iterable): Grade dictionaries as stored in grades.csv.
+        Returns:
+            int: Number of rows applied.
+        """
+        touched = set()
+        for g in grades:
+            sid = g.get('student_id')
+            cid = g.get('course_id')
+            try:
+                score = float(g.get('score', 0))
+                max_score = float(g.get('max_score', 100))
+                weight = float(g.get('weight', 0) or 0)
+            except (TypeError, ValueError):
+                continue
+            if not sid or not cid:
+                continue
+            perc = (score / max_score * 100) if max_score > 0 else 0
+            for key in ((sid, cid), (sid, OVERALL)):
+                acc = self._acc.setdefault(key, [0.0, 0.0, 0.0, 0])
+                if weight > 0:
+                    acc[0] += perc * weight
+                    acc[1] += weight
+                acc[2] += perc
+                acc[3] += 1
+                touched.add(key)
+
+        # Re-rank each affected (student, board) once per batch
+        for key in touched:
+            sid, board_key = key
+            self._boards.setdefault(board_key, _Board()).update(sid, self._average(key))
+        return sum(1 for key in touched if key[1] is not OVERALL)
+
+    def _average(self, key: tuple) -> float:
+        acc = self._acc[key]
+        if acc[1] > 0:
+            return acc[0] / acc[1]
+        return acc[2] / acc[3]
+
+    def courses(self) -> list:
+        """Return the sorted IDs of courses that have grades."""
+        return sorted(k for k in self._boards if k is not OVERALL)
+
+    def score(self, student_id: str, course_id: str = OVERALL):
+        """Average percentage of a student in a course (or overall), or None."""
+        board = self._boards.get(course_id)
+        return board.scores.get(student_id) if board else None
+
+    def size(self, course_id: str = OVERALL) -> int:
+        """Number of ranked students in a course (or overall)."""
+        board = self._boards.get(course_id)
+        return len(board.keys) if board else 0
+
+    def rank(self, student_id: str, course_id: str = OVERALL):
+        """
+        Competition rank of a student (1 = best; ties share a rank).
+        Args:
+            student_id (str): The student's ID.
+            course_id (str): The course ID, or OVERALL for the cross-course rank.
+        Returns:
+            int|None: The rank, or None if the student has no grades there.
+        """
+        board = self._boards.get(course_id)
+        if board is None or student_id not in board.scores:
+            return None
+        return board.better_than(board.scores[student_id]) + 1
+
+    def percentile(self, student_id: str, course_id: str = OVERALL):
+        """
+        Percentile rank: share of the class scoring at or below the student.
+        Returns:
+            float|None: Percentile (0-100], or None if the student has no grades there.
+        """
+        board = self._boards.get(course_id)
+        if board is None or student_id not in board.scores:
+            return None
+        n = len(board.keys)
+        return (n - board.better_than(board.scores[student_id])) / n * 100
+
+    def top_n(self, course_id: str = OVERALL, n: int = 10) -> list:
+        """
+        Leaderboard for a course (or overall).
+        Returns:
+            list: (student_id, score) tuples, best first.
+        """
+        board = self._boards.get(course_id)
+        if board is None:
+            return []
+        return [(sid, -neg_score) for neg_score, sid in board.keys[:n]]
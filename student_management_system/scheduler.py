@@ -0,0 +1,307 @@
+import itertools
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from student_management_system import utils
+from student_management_system.profiling import profiler
+
+JOB_STATUSES = ('pending', 'running', 'done', 'failed', 'cancelled')
+
+
+def _attendance_step(storage, path):
+    return utils.generate_attendance_report(storage.load_attendance(), path)
+
+
+def _progress_step(storage, path):
+    return utils.generate_progress_report(storage.load_grades(), path)
+
+
+def _distribution_step(storage, path):
+    return utils.generate_distribution_report(storage.iter_grades(), path)
+
+
+# Each report kind is a list of (output filename, builder) steps
+REPORT_KINDS = {
+    'attendance': [('attendance_report.txt', _attendance_step)],
+    'progress': [('progress_report.csv', _progress_step)],
+    'distribution': [('grade_distribution.csv', _distribution_step)],
+}
+REPORT_KINDS['all'] = REPORT_KINDS['attendance'] + REPORT_KINDS['progress'] + REPORT_KINDS['distribution']
+
+
+class ReportJob:
+    """
+    A queued or finished report generation request.
+    """
+    def __init__(self, job_id: str, kind: str, source: str = 'menu'):
+        self.job_id = job_id
+        self.kind = kind
+        self.source = source
+        self.status = 'pending'
+        self.progress = 0
+        self.message = ''
+        self.outputs = []
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+
+    def to_dict(self) -> dict:
+        """
+        Snapshot of the job for display.
+        Returns:
+            dict: The job's public fields.
+        """
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'source': self.source,
+            'status': self.status,
+            'progress': self.progress,
+            'message': self.message,
+            'outputs': list(self.outputs),
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+
+class ReportScheduler:
+    """
+    Builds reports on a worker thread so the admin menu never blocks.
+
+    Duplicate pending jobs of the same kind are coalesced, jobs can be
+    cancelled while pending or between steps, and every report is written
+    to a temporary file and moved into place with os.replace().
+    """
+    def __init__(self, storage, reports_dir: str = 'reports', history: int = 50):
+        self._storage = storage
+        self._reports_dir = reports_dir
+        self._history = history
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._jobs = {}             # {job_id: ReportJob}, insertion ordered
+        self._pending_by_kind = {}  # {kind: ReportJob}
+        self._periodic = []         # [{'kind', 'interval', 'at', 'next_run'}]
+        self._ids = itertools.count(1)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start the worker thread (idempotent)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='report-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Cancel pending jobs and stop the worker, letting a running step finish.
+        Args:
+            timeout (float): Seconds to wait for the worker to exit.
+        """
+        self._stop.set()
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == 'pending':
+                    self._mark_cancelled(job)
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, kind: str = 'all', source: str = 'menu') -> ReportJob:
+        """
+        Queue a report job, reusing an identical job that is still pending.
+        Args:
+            kind (str): One of REPORT_KINDS.
+            source (str): Who asked for it ('menu', 'schedule', ...).
+        Returns:
+            ReportJob: The queued (or coalesced) job.
+        Raises:
+            ValueError: If the report kind is unknown.
+        """
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"Unknown report kind '{kind}'.")
+        with self._lock:
+            pending = self._pending_by_kind.get(kind)
+            if pending is not None and pending.status == 'pending':
+                return pending
+            job = ReportJob(f"R-{next(self._ids):04d}", kind, source)
+            self._jobs[job.job_id] = job
+            self._pending_by_kind[kind] = job
+            self._trim_history()
+        self._queue.put(job)
+        return job
+
+    def run_now(self, kind: str = 'all', source: str = 'cli') -> ReportJob:
+        """
+        Build a report on the calling thread; the worker does not need to be running.
+        Args:
+            kind (str): One of REPORT_KINDS.
+            source (str): Who asked for it.
+        Returns:
+            ReportJob: The finished job ('done' or 'failed').
+        Raises:
+            ValueError: If the report kind is unknown.
+        """
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"Unknown report kind '{kind}'.")
+        with self._lock:
+            job = ReportJob(f"R-{next(self._ids):04d}", kind, source)
+            self._jobs[job.job_id] = job
+            self._trim_history()
+        with profiler.profile(f"Report: {job.kind}"):
+            self._execute(job)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a pending or running job.
+        Args:
+            job_id (str): The job ID.
+        Returns:
+            bool: True if the job will not complete, False if unknown or already finished.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in ('pending', 'running'):
+                return False
+            job._cancel.set()
+            if job.status == 'pending':
+                self._mark_cancelled(job)
+            return True
+
+    def status(self, job_id: str):
+        """
+        Returns:
+            dict|None: Snapshot of the job, or None if unknown.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.to_dict() if job else None
+
+    def jobs(self) -> list:
+        """
+        Returns:
+            list: Snapshots of recent jobs, oldest first.
+        """
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def schedule_every(self, kind: str, seconds: float) -> None:
+        """Submit `kind` every `seconds` seconds, starting one interval from now."""
+        with self._lock:
+            self._periodic.append({'kind': kind, 'interval': seconds, 'at': None, 'next_run': time.time() + seconds})
+        self._queue.put(None)  # Wake the worker so it recomputes its timeout
+
+    def schedule_daily(self, kind: str, at: str = '02:00') -> None:
+        """
+        Submit `kind` once a day at a local wall-clock time.
+        Args:
+            kind (str): One of REPORT_KINDS.
+            at (str): 'HH:MM' in local time.
+        """
+        with self._lock:
+            self._periodic.append({'kind': kind, 'interval': None, 'at': at, 'next_run': self._next_daily(at)})
+        self._queue.put(None)
+
+    @staticmethod
+    def _next_daily(at: str) -> float:
+        hour, minute = (int(part) for part in at.split(':'))
+        now = datetime.now()
+        run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if run <= now:
+            run += timedelta(days=1)
+        return run.timestamp()
+
+    def _due_periodic(self) -> float:
+        # Submit anything due and return seconds until the next scheduled run
+        now = time.time()
+        due = []
+        with self._lock:
+            for entry in self._periodic:
+                if entry['next_run'] <= now:
+                    due.append(entry['kind'])
+                    if entry['interval'] is not None:
+                        entry['next_run'] = now + entry['interval']
+                    else:
+                        entry['next_run'] = self._next_daily(entry['at'])
+            next_run = min((entry['next_run'] for entry in self._periodic), default=None)
+        for kind in due:
+            self.submit(kind, source='schedule')
+        return None if next_run is None else max(0.0, next_run - time.time())
+
+    def _run(self):
+        while not self._stop.is_set():
+            timeout = self._due_periodic()
+            try:
+                job = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if job is None or self._stop.is_set():
+                continue
+            with profiler.profile(f"Report: {job.kind}"):
+                self._execute(job)
+
+    def _execute(self, job: ReportJob):
+        with self._lock:
+            if job.status != 'pending':
+                return
+            job.status = 'running'
+            job.started_at = time.time()
+            if self._pending_by_kind.get(job.kind) is job:
+                del self._pending_by_kind[job.kind]
+
+        os.makedirs(self._reports_dir, exist_ok=True)
+        steps = REPORT_KINDS[job.kind]
+        for number, (filename, build) in enumerate(steps):
+            if job._cancel.is_set():
+                with self._lock:
+                    self._mark_cancelled(job)
+                return
+            final_path = os.path.join(self._reports_dir, filename)
+            tmp_path = os.path.join(self._reports_dir, f".{filename}.{job.job_id}.tmp")
+            try:
+                ok = build(self._storage, tmp_path)
+                # A cancel that arrived during the build leaves the old file in place
+                if ok and not job._cancel.is_set():
+                    os.replace(tmp_path, final_path)
+            except Exception as e:
+                ok = False
+                job.message = str(e)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            if not ok:
+                with self._lock:
+                    job.status = 'failed'
+                    job.message = job.message or f"Failed to build {filename}."
+                    job.finished_at = time.time()
+                return
+            with self._lock:
+                if job._cancel.is_set():
+                    self._mark_cancelled(job)
+                    return
+                job.outputs.append(final_path)
+                job.progress = int((number + 1) / len(steps) * 100)
+
+        with self._lock:
+            if job._cancel.is_set():
+                self._mark_cancelled(job)
+                return
+            job.status = 'done'
+            job.finished_at = time.time()
+
+    def _mark_cancelled(self, job: ReportJob):
+        job.status = 'cancelled'
+        job.finished_at = time.time()
+        if self._pending_by_kind.get(job.kind) is job:
+            del self._pending_by_kind[job.kind]
+
+    def _trim_history(self):
+        finished = [jid for jid, job in self._jobs.items() if job.status in ('done', 'failed', 'cancelled')]
+        for jid in finished[:max(0, len(self._jobs) - self._history)]:
+            del self._jobs[jid]
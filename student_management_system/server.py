@@ -0,0 +1,277 @@
+"""
+Many interactive sessions in one process, over TCP.
+
+    python main.py serve [--host 127.0.0.1] [--port 8766]
+    python -m student_management_system.server connect [--host 127.0.0.1] [--port 8766]
+
+(`nc` or `telnet` work as clients too.) Every connection runs the ordinary
+menu loop on its own thread, with input() and print() routed to that
+connection. All sessions share one SharedStore, so reads come from memory;
+writes are applied in memory and queued for a single asyncio writer task,
+which waits config.SERVER_COMMIT_DELAY seconds to gather concurrent writes
+and commits each batch with one disk write per file. A file that fails to
+write is logged and retried with the writes queued after it.
+"""
+import argparse
+import asyncio
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from student_management_system import config
+
+
+class _SessionInput:
+    """Line source for one session; readline() blocks the session thread only."""
+    def __init__(self):
+        self._lines = queue.Queue()
+
+    def feed(self, line: str) -> None:
+        self._lines.put(line)
+
+    def close(self) -> None:
+        self._lines.put('')  # readline() returns '' -> input() raises EOFError
+
+    def readline(self) -> str:
+        line = self._lines.get()
+        if line == '':
+            self._lines.put('')  # Stay at EOF for later reads
+        return line
+
+
+class _SessionOutput:
+    """Text sink for one session; writes are handed to the event loop."""
+    def __init__(self, loop, writer):
+        self._loop = loop
+        self._writer = writer
+
+    def write(self, text: str) -> int:
+        if text and not self._writer.is_closing():
+            self._loop.call_soon_threadsafe(self._writer.write, text.encode())
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class _ThreadStreams:
+    """
+    Stand-in for sys.stdin / sys.stdout that forwards to the calling thread's
+    session streams, or to the real stream on threads without a session.
+    """
+    def __init__(self, default, local: threading.local, name: str):
+        self._default = default
+        self._local = local
+        self._name = name
+
+    def _target(self):
+        return getattr(self._local, self._name, None) or self._default
+
+    def __getattr__(self, attr):
+        return getattr(self._target(), attr)
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def readline(self, *args) -> str:
+        return self._target().readline(*args)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+
+class SessionServer:
+    """
+    Accepts connections and runs `run_session()` for each one on a thread.
+    Args:
+        store (SharedStore): The store every session reads and writes.
+        run_session (callable): The interactive loop; returns when the user exits.
+        host (str): Bind address.
+        port (int): TCP port (0 picks a free one).
+        max_sessions (int): Concurrent sessions; further connections are turned away.
+        commit_delay (float): Seconds the writer waits to gather writes into one commit.
+    """
+    def __init__(self, store, run_session, host: str = None, port: int = None,
+                 max_sessions: int = None, commit_delay: float = None):
+        self._store = store
+        self._run_session = run_session
+        self._host = host or config.SERVER_HOST
+        self._port = config.SERVER_PORT if port is None else port
+        self._max_sessions = max_sessions or config.SERVER_MAX_SESSIONS
+        self._commit_delay = config.SERVER_COMMIT_DELAY if commit_delay is None else commit_delay
+        self._retry_delay = config.SERVER_COMMIT_RETRY_DELAY
+        self._sessions = ThreadPoolExecutor(max_workers=self._max_sessions, thread_name_prefix='session')
+        self._disk = ThreadPoolExecutor(max_workers=1, thread_name_prefix='store-writer')
+        self._local = threading.local()
+        self._inputs = set()   # _SessionInput of every live session
+        self._futures = set()
+        self._loop = None
+        self._writes = None
+        self.address = None
+        self.ready = threading.Event()
+
+    def _queue_write(self, filename: str, op: str, payload: list) -> None:
+        # Called by session threads with the store lock held; never blocks on disk
+        self._loop.call_soon_threadsafe(self._writes.put_nowait, (filename, op, payload))
+
+    async def _writer(self):
+        # A failed commit stays pending and is retried together with the writes
+        # queued since, so the on-disk order matches the order the writes were made
+        failed, stop, attempts = [], False, 0
+        while True:
+            if failed:
+                if stop and attempts > config.SERVER_SHUTDOWN_RETRIES:
+                    from student_management_system.decorators.logger import system_logger
+                    system_logger.error(f"Store writer stopped with {len(failed)} uncommitted write(s) to "
+                                        f"{', '.join(filename for filename, _, _ in failed)}.")
+                    return
+                await asyncio.sleep(self._retry_delay)
+                batch = failed
+            elif stop:
+                return
+            else:
+                first = await self._writes.get()
+                if first is None:
+                    return
+                if self._commit_delay:
+                    await asyncio.sleep(self._commit_delay)
+                batch = [first]
+            while not stop and not self._writes.empty():
+                item = self._writes.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            failed = await self._commit(batch)
+            attempts = attempts + 1 if failed else 0
+
+    async def _commit(self, batch: list) -> list:
+        # Returns the writes still to be persisted; never raises, so the writer task survives
+        from student_management_system.decorators.logger import system_logger
+        try:
+            failed = await self._loop.run_in_executor(self._disk, self._store.commit, batch)
+        except Exception as e:
+            system_logger.error(f"Store commit of {len(batch)} write(s) raised {e!r}; retrying.")
+            return batch
+        if failed:
+            system_logger.error(f"Store commit failed for {', '.join(filename for filename, _, _ in failed)}; "
+                                f"retrying in {self._retry_delay:g} s.")
+        return failed
+
+    def _session_thread(self, session_input: _SessionInput, output: _SessionOutput):
+        self._local.stdin, self._local.stdout = session_input, output
+        try:
+            self._run_session()
+        except EOFError:
+            pass  # Client disconnected or the server is stopping
+        except Exception as e:
+            from student_management_system.decorators.logger import system_logger
+            system_logger.error(f"Session ended with an error: {e!r}")
+        finally:
+            self._local.stdin = self._local.stdout = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self._inputs) >= self._max_sessions:
+            writer.write(b"Server is full, try again later.\n")
+            await writer.drain()
+            writer.close()
+            return
+        session_input = _SessionInput()
+        self._inputs.add(session_input)
+        future = self._loop.run_in_executor(self._sessions, self._session_thread,
+                                            session_input, _SessionOutput(self._loop, writer))
+        self._futures.add(future)
+
+        async def pump():
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                session_input.feed(line.decode(errors='replace').rstrip('\r\n') + '\n')
+            session_input.close()
+
+        pump_task = asyncio.ensure_future(pump())
+        try:
+            await future
+        finally:
+            pump_task.cancel()
+            self._inputs.discard(session_input)
+            self._futures.discard(future)
+            if not writer.is_closing():
+                await writer.drain()
+                writer.close()
+
+    async def serve(self) -> None:
+        """Serve until cancelled, then end every session and commit all pending writes."""
+        self._loop = asyncio.get_running_loop()
+        self._writes = asyncio.Queue()
+        self._store.set_persister(self._queue_write)
+        writer_task = asyncio.ensure_future(self._writer())
+
+        real_stdin, real_stdout = sys.stdin, sys.stdout
+        sys.stdin = _ThreadStreams(real_stdin, self._local, 'stdin')
+        sys.stdout = _ThreadStreams(real_stdout, self._local, 'stdout')
+        server = await asyncio.start_server(self._handle, self._host, self._port)
+        self.address = server.sockets[0].getsockname()[:2]
+        self.ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            # Sessions waiting for input see EOF; running actions finish first
+            for session_input in list(self._inputs):
+                session_input.close()
+            if self._futures:
+                await asyncio.wait(list(self._futures), timeout=10)
+            self._store.set_persister(None)
+            self._writes.put_nowait(None)
+            await writer_task
+            sys.stdin, sys.stdout = real_stdin, real_stdout
+            self._sessions.shutdown(wait=False)
+            self._disk.shutdown(wait=True)
+
+
+async def _connect(host: str, port: int) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+
+    def send(data):
+        if not writer.is_closing():
+            writer.write(data) if data else writer.write_eof()
+
+    def read_stdin():
+        # A daemon thread, so a pending readline() does not keep the client alive
+        for line in sys.stdin:
+            loop.call_soon_threadsafe(send, line.encode())
+        loop.call_soon_threadsafe(send, b'')
+
+    threading.Thread(target=read_stdin, name='stdin', daemon=True).start()
+    while True:
+        data = await reader.read(4096)
+        if not data:
+            break
+        sys.stdout.write(data.decode(errors='replace'))
+        sys.stdout.flush()
+    writer.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m student_management_system.server')
+    sub = parser.add_subparsers(dest='command', required=True)
+    connect = sub.add_parser('connect', help="open an interactive session on a running server")
+    connect.add_argument('--host', default=config.SERVER_HOST)
+    connect.add_argument('--port', type=int, default=config.SERVER_PORT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_connect(args.host, args.port))
+    except ConnectionRefusedError:
+        print(f"No server on {args.host}:{args.port} (start one with: python main.py serve).", file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
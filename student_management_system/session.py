@@ -0,0 +1,100 @@
+from student_management_system import permissions
+
+
+class Session:
+    """
+    The logged-in user plus a versioned snapshot of users.json.
+
+    The snapshot is reused between menu actions and reloaded only when the
+    storage version changes: writes made through the session refresh it in
+    place, and writes by other processes are picked up by a stat() check.
+    """
+    def __init__(self, storage):
+        self._storage = storage
+        self.current_user = None
+        self._extra_permissions = []
+        self._users = None
+        self._users_version = None
+
+    def login(self, user, extra_permissions=None) -> None:
+        """
+        Attach an authenticated user and compile their permission bitset once.
+        Args:
+            user (User): The authenticated user.
+            extra_permissions (list): Per-user permissions stored in '_permissions'.
+        """
+        self.current_user = user
+        self._extra_permissions = list(extra_permissions or [])
+        permissions.grant(user, self._extra_permissions)
+
+    def logout(self) -> None:
+        """Detach the current user; the user snapshot stays cached."""
+        self.current_user = None
+        self._extra_permissions = []
+
+    def refresh_permissions(self) -> bool:
+        """
+        Reload the permission table if its file changed and recompile the user's
+        bitset when the table generation moved on.
+        Returns:
+            bool: True if the user's mask was recompiled.
+        """
+        permissions.table.reload()
+        user = self.current_user
+        if user is None or getattr(user, '_permission_generation', None) == permissions.table.generation:
+            return False
+        permissions.grant(user, self._extra_permissions)
+        return True
+
+    def can(self, required_mask: int) -> bool:
+        """Single bitwise test of a precomputed mask against the cached bitset."""
+        return self.current_user is not None and permissions.has_permission(self.current_user, required_mask)
+
+    def users_version(self):
+        """The storage version the current snapshot was taken at (None if not loaded)."""
+        return self._users_version
+
+    def _refresh(self) -> bool:
+        version = self._storage.users_version()
+        if self._users is None or version != self._users_version:
+            self._users = self._storage.load_users()
+            self._users_version = version
+            return True
+        return False
+
+    def users(self) -> list:
+        """
+        Storage-format user records, reloaded only if users.json changed.
+        Returns:
+            list: The shared snapshot; callers that modify it must save_users() or invalidate().
+        """
+        self._refresh()
+        return self._users
+
+    def find_user(self, username: str):
+        """Return the storage record with this username, or None."""
+        return next((u for u in self.users() if u.get('_username') == username), None)
+
+    def students(self) -> list:
+        """Storage-format records of all students in the snapshot."""
+        return [u for u in self.users() if u.get('_role') == 'Student']
+
+    def save_users(self, users: list) -> bool:
+        """
+        Persist users and adopt them as the new snapshot without re-reading the file.
+        Args:
+            users (list): Storage-format user records.
+        Returns:
+            bool: True if saved.
+        """
+        if not self._storage.save_users(users):
+            self.invalidate()
+            return False
+        self._users = users
+        self._users_version = self._storage.users_version()
+        return True
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next access reloads from storage."""
+        self._users = None
+        self._users_version = None
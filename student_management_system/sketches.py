@@ -0,0 +1,345 @@
+import math
+import random
+
+ALL = 'all'  # Key used for "every course" / "every term"
+
+
+class KLLSketch:
+    """
+    Memory-bounded streaming quantile sketch (Karnin-Lang-Liberty compactors).
+
+    Keeps O(k log(n/k)) values regardless of stream length. Sketches built on
+    separate shards can be merged, and the result has the same error guarantee
+    as a sketch fed the concatenated stream.
+    """
+    def __init__(self, k: int = 200, seed=None):
+        """
+        Args:
+            k (int): Accuracy parameter; larger is more accurate and uses more memory.
+            seed (int): Optional seed for the compaction coin flips (reproducible runs).
+        """
+        self.k = k
+        self.count = 0
+        self.min = None
+        self.max = None
+        self._rng = random.Random(seed)
+        self._compactors = [[]]
+        self._size = 0
+        self._max_size = 0
+        self._update_max_size()
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self._compactors) - height - 1
+        return int(math.ceil((2 / 3) ** depth * self.k)) + 1
+
+    def _update_max_size(self):
+        self._max_size = sum(self._capacity(h) for h in range(len(self._compactors)))
+
+    @property
+    def rank_error(self) -> float:
+        """
+        Normalized rank error bound (99% confidence) for quantile queries.
+        Uses the empirical fit published with the DataSketches KLL implementation.
+        """
+        return 2.296 / self.k ** 0.9723
+
+    def retained(self) -> int:
+        """Number of values currently held in memory."""
+        return self._size
+
+    def update(self, value: float) -> None:
+        """Add one value to the sketch."""
+        self._compactors[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self._size >= self._max_size:
+            self._compress()
+
+    def _compress(self):
+        for height in range(len(self._compactors)):
+            level = self._compactors[height]
+            if len(level) < self._capacity(height):
+                continue
+            if height + 1 >= len(self._compactors):
+                self._compactors.append([])
+                self._update_max_size()
+            # Sort, then promote every other value with double weight
+            level.sort()
+            paired = len(level) - len(level) % 2
+            offset = self._rng.randint(0, 1)
+            self._compactors[height + 1].extend(level[offset:paired:2])
+            self._compactors[height] = level[paired:]
+            self._size -= paired // 2
+            if self._size < self._max_size:
+                break
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        Fold another sketch (e.g. from another shard) into this one.
+        Args:
+            other (KLLSketch): The sketch to merge.
+        Returns:
+            KLLSketch: self, for chaining.
+        """
+        if other.count == 0:
+            return self
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append([])
+        self._update_max_size()
+        for height, level in enumerate(other._compactors):
+            self._compactors[height].extend(level)
+        self._size = sum(len(level) for level in self._compactors)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted(self) -> list:
+        items = []
+        for height, level in enumerate(self._compactors):
+            weight = 1 << height
+            items.extend((value, weight) for value in level)
+        items.sort()
+        return items
+
+    def quantile(self, q: float):
+        """
+        Estimate the value at quantile q.
+        Args:
+            q (float): Quantile in [0, 1] (0.5 is the median).
+        Returns:
+            float|None: The estimate, or None if the sketch is empty.
+        """
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs) -> list:
+        """Estimate several quantiles with a single pass over the retained values."""
+        if self.count == 0:
+            return [None for _ in qs]
+        items = self._weighted()
+        total = sum(weight for _, weight in items)
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+                continue
+            if q >= 1:
+                results.append(self.max)
+                continue
+            target = q * total
+            cumulative = 0
+            estimate = items[-1][0]
+            for value, weight in items:
+                cumulative += weight
+                if cumulative >= target:
+                    estimate = value
+                    break
+            results.append(estimate)
+        return results
+
+    def rank(self, value: float) -> float:
+        """Estimated fraction of the stream that is <= value."""
+        if self.count == 0:
+            return 0.0
+        items = self._weighted()
+        total = sum(weight for _, weight in items)
+        return sum(weight for v, weight in items if v <= value) / total
+
+    def to_dict(self) -> dict:
+        """Serialize for shipping between processes or persisting partial results."""
+        return {
+            'k': self.k,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'compactors': [list(level) for level in self._compactors]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'KLLSketch':
+        """Rebuild a sketch serialized with to_dict()."""
+        sketch = cls(data['k'])
+        sketch._compactors = [list(level) for level in data['compactors']] or [[]]
+        sketch._update_max_size()
+        sketch._size = sum(len(level) for level in sketch._compactors)
+        sketch.count = data['count']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+
+class FixedHistogram:
+    """
+    Fixed-bucket histogram over percentages (0-100).
+
+    Values outside the range are clamped into the first/last bucket. Merging is
+    a bucket-wise sum; quantile estimates are within one bucket width.
+    """
+    def __init__(self, bucket_width: float = 10.0, low: float = 0.0, high: float = 100.0):
+        self.bucket_width = bucket_width
+        self.low = low
+        self.high = high
+        self.counts = [0] * int(math.ceil((high - low) / bucket_width))
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, value: float) -> None:
+        """Add one value."""
+        pos = int((value - self.low) // self.bucket_width)
+        pos = min(max(pos, 0), len(self.counts) - 1)
+        self.counts[pos] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: 'FixedHistogram') -> 'FixedHistogram':
+        """Add another histogram with the same bucket layout into this one."""
+        if (other.bucket_width, other.low, other.high) != (self.bucket_width, self.low, self.high):
+            raise ValueError("Cannot merge histograms with different bucket layouts.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def mean(self):
+        """Exact mean of the values seen, or None."""
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float):
+        """
+        Estimate a quantile by interpolating inside the matching bucket.
+        Returns:
+            float|None: Estimate (absolute error <= bucket_width), or None if empty.
+        """
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for pos, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= target:
+                fraction = (target - cumulative) / bucket_count
+                return self.low + (pos + fraction) * self.bucket_width
+            cumulative += bucket_count
+        return self.high
+
+    def buckets(self) -> list:
+        """
+        Returns:
+            list: (lower_edge, upper_edge, count) tuples.
+        """
+        return [
+            (self.low + pos * self.bucket_width, min(self.low + (pos + 1) * self.bucket_width, self.high), c)
+            for pos, c in enumerate(self.counts)
+        ]
+
+    def to_dict(self) -> dict:
+        """Serialize for shipping between processes."""
+        return {
+            'bucket_width': self.bucket_width,
+            'low': self.low,
+            'high': self.high,
+            'counts': list(self.counts),
+            'total': self.total
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FixedHistogram':
+        """Rebuild a histogram serialized with to_dict()."""
+        hist = cls(data['bucket_width'], data['low'], data['high'])
+        hist.counts = list(data['counts'])
+        hist.count = sum(hist.counts)
+        hist.total = data['total']
+        return hist
+
+
+class GradeDistribution:
+    """
+    Streaming grade-percentage distributions per course and per term.
+
+    Every row feeds four partitions: (course, term), (course, ALL),
+    (ALL, term) and (ALL, ALL). Rows without a 'term' column count as term ALL.
+    """
+    def __init__(self, k: int = 200, bucket_width: float = 10.0, seed=None):
+        self.k = k
+        self.bucket_width = bucket_width
+        self._seed = seed
+        self._parts = {}  # {(course_id, term): (KLLSketch, FixedHistogram)}
+
+    def _part(self, key: tuple) -> tuple:
+        part = self._parts.get(key)
+        if part is None:
+            part = (KLLSketch(self.k, self._seed), FixedHistogram(self.bucket_width))
+            self._parts[key] = part
+        return part
+
+    def add(self, grade: dict) -> bool:
+        """
+        Feed one grade row.
+        Args:
+            grade (dict): Grade dictionary as stored in grades.csv.
+        Returns:
+            bool: True if the row was used, False if malformed.
+        """
+        try:
+            score = float(grade.get('score', 0))
+            max_score = float(grade.get('max_score', 100))
+        except (TypeError, ValueError):
+            return False
+        perc = (score / max_score * 100) if max_score > 0 else 0
+        course_id = grade.get('course_id') or ALL
+        term = grade.get('term') or ALL
+        keys = {(course_id, term), (course_id, ALL), (ALL, term), (ALL, ALL)}
+        for key in keys:
+            sketch, hist = self._part(key)
+            sketch.update(perc)
+            hist.update(perc)
+        return True
+
+    @classmethod
+    def from_rows(cls, grades, **kwargs) -> 'GradeDistribution':
+        """Build a distribution from any iterable of grade rows (e.g. StorageManager.iter_grades())."""
+        dist = cls(**kwargs)
+        for grade in grades:
+            dist.add(grade)
+        return dist
+
+    def merge(self, other: 'GradeDistribution') -> 'GradeDistribution':
+        """Merge a distribution computed on another shard or partition into this one."""
+        for key, (sketch, hist) in other._parts.items():
+            own_sketch, own_hist = self._part(key)
+            own_sketch.merge(sketch)
+            own_hist.merge(hist)
+        return self
+
+    def keys(self) -> list:
+        """Return the sorted (course_id, term) partitions that have data."""
+        return sorted(self._parts)
+
+    def summary(self, course_id: str = ALL, term: str = ALL):
+        """
+        Distribution summary of one partition.
+        Returns:
+            dict|None: count, mean, min, q1, median, q3, max, rank_error and
+            histogram buckets; None if the partition is empty.
+        """
+        part = self._parts.get((course_id, term))
+        if part is None:
+            return None
+        sketch, hist = part
+        q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+        return {
+            'count': sketch.count,
+            'mean': hist.mean(),
+            'min': sketch.min,
+            'q1': q1,
+            'median': median,
+            'q3': q3,
+            'max': sketch.max,
+            'rank_error': sketch.rank_error,
+            'histogram': hist.buckets()
+        }
@@ -0,0 +1,324 @@
+import bisect
+from datetime import date
+from functools import lru_cache
+
+PRESENT_STATUSES = ('P',)
+ABSENT_STATUSES = ('A',)
+
+
+@lru_cache(maxsize=8192)
+def to_day_number(date_str: str) -> int:
+    """
+    Convert a YYYY-MM-DD string into a proleptic ordinal day number.
+    Args:
+        date_str (str): The date string.
+    Returns:
+        int: The day number (date.toordinal()).
+    Raises:
+        ValueError: If the string is not a valid ISO date.
+    """
+    return date.fromisoformat(date_str).toordinal()
+
+
+def _as_day_number(value) -> int:
+    if isinstance(value, int):
+        return value
+    if isinstance(value, date):
+        return value.toordinal()
+    return to_day_number(value)
+
+
+class _Series:
+    """
+    Attendance history of one (student, course) pair, sorted by day.
+    """
+    __slots__ = ('days', 'statuses', 'present_prefix')
+
+    def __init__(self):
+        self.days = []
+        self.statuses = []
+        # present_prefix[i] = number of present sessions among the first i entries
+        self.present_prefix = [0]
+
+    def insert(self, day: int, status: str):
+        pos = bisect.bisect_right(self.days, day)
+        self.days.insert(pos, day)
+        self.statuses.insert(pos, status)
+        if pos == len(self.days) - 1:
+            self.present_prefix.append(self.present_prefix[-1] + (status in PRESENT_STATUSES))
+        else:
+            self._rebuild_prefix(pos)
+
+    def _rebuild_prefix(self, start: int = 0):
+        del self.present_prefix[start + 1:]
+        running = self.present_prefix[start]
+        for status in self.statuses[start:]:
+            running += status in PRESENT_STATUSES
+            self.present_prefix.append(running)
+
+    def bounds(self, start_day: int, end_day: int) -> tuple:
+        lo = bisect.bisect_left(self.days, start_day)
+        hi = bisect.bisect_right(self.days, end_day)
+        return lo, hi
+
+    def trailing_run(self, statuses: tuple) -> int:
+        run = 0
+        for status in reversed(self.statuses):
+            if status not in statuses:
+                break
+            run += 1
+        return run
+
+
+class AttendanceIndex:
+    """
+    Per-(student, course) sorted date index over attendance records.
+
+    Range queries bisect on day numbers, so they cost O(log n + k) for k
+    matching rows, and attendance rates over a range cost O(log n) thanks
+    to a running count of present sessions.
+    """
+    def __init__(self):
+        self._series = {}              # {(student_id, course_id): _Series}
+        self._students_by_course = {}  # {course_id: set(student_id)}
+        self._courses_by_student = {}  # {student_id: set(course_id)}
+
+    @classmethod
+    def from_records(cls, records) -> 'AttendanceIndex':
+        """
+        Build an index from an iterable of attendance rows.
+        Args:
+            records (iterable): Attendance dictionaries as stored in attendance.csv.
+        Returns:
+            AttendanceIndex: The populated index.
+        """
+        index = cls()
+        grouped = {}
+        for record in records:
+            parsed = cls._parse(record)
+            if parsed is None:
+                continue
+            key, day, status = parsed
+            grouped.setdefault(key, []).append((day, status))
+
+        # Sort each group once instead of inserting row by row
+        for key, entries in grouped.items():
+            entries.sort(key=lambda entry: entry[0])
+            series = _Series()
+            series.days = [day for day, _ in entries]
+            series.statuses = [status for _, status in entries]
+            series._rebuild_prefix()
+            index._register(key, series)
+        return index
+
+    @staticmethod
+    def _parse(record: dict):
+        sid = record.get('student_id')
+        cid = record.get('course_id')
+        try:
+            day = to_day_number(record.get('date', ''))
+        except (TypeError, ValueError):
+            return None
+        if not sid or not cid:
+            return None
+        return (sid, cid), day, record.get('status')
+
+    def _register(self, key: tuple, series: _Series):
+        sid, cid = key
+        self._series[key] = series
+        self._students_by_course.setdefault(cid, set()).add(sid)
+        self._courses_by_student.setdefault(sid, set()).add(cid)
+
+    def add(self, record: dict) -> bool:
+        """
+        Insert a single attendance row into the index.
+        Args:
+            record (dict): Attendance dictionary (student_id, course_id, date, status).
+        Returns:
+            bool: True if indexed, False if the row was malformed.
+        """
+        parsed = self._parse(record)
+        if parsed is None:
+            return False
+        key, day, status = parsed
+        series = self._series.get(key)
+        if series is None:
+            series = _Series()
+            self._register(key, series)
+        series.insert(day, status)
+        return True
+
+    def add_many(self, records) -> int:
+        """
+        Insert several attendance rows.
+        Args:
+            records (iterable): Attendance dictionaries.
+        Returns:
+            int: Number of rows indexed.
+        """
+        return sum(1 for record in records if self.add(record))
+
+    def courses_for_student(self, student_id: str) -> list:
+        """Return the sorted course IDs with attendance for a student."""
+        return sorted(self._courses_by_student.get(student_id, ()))
+
+    def students_for_course(self, course_id: str) -> list:
+        """Return the sorted student IDs with attendance in a course."""
+        return sorted(self._students_by_course.get(course_id, ()))
+
+    def marked_on(self, course_id: str, day) -> list:
+        """Return the sorted student IDs with an attendance row for a course on one day."""
+        day = _as_day_number(day)
+        marked = []
+        for sid in self._students_by_course.get(course_id, ()):
+            lo, hi = self._series[(sid, course_id)].bounds(day, day)
+            if hi > lo:
+                marked.append(sid)
+        return sorted(marked)
+
+    def query_range(self, student_id: str, course_id: str, start, end) -> list:
+        """
+        Get attendance rows for a student in a course between two dates.
+        Args:
+            student_id (str): The student's ID.
+            course_id (str): The course ID.
+            start (str|date): First day of the range (inclusive).
+            end (str|date): Last day of the range (inclusive).
+        Returns:
+            list: Dictionaries with 'date' and 'status', ordered by date.
+        """
+        series = self._series.get((student_id, course_id))
+        if series is None:
+            return []
+        lo, hi = series.bounds(_as_day_number(start), _as_day_number(end))
+        return [
+            {'date': date.fromordinal(series.days[i]).isoformat(), 'status': series.statuses[i]}
+            for i in range(lo, hi)
+        ]
+
+    def counts_between(self, student_id: str, course_id: str, start, end) -> tuple:
+        """
+        Count sessions and present sessions in a date range.
+        Args:
+            student_id (str): The student's ID.
+            course_id (str): The course ID.
+            start (str|date): First day of the range (inclusive).
+            end (str|date): Last day of the range (inclusive).
+        Returns:
+            tuple: (total_sessions, present_sessions)
+        """
+        series = self._series.get((student_id, course_id))
+        if series is None:
+            return 0, 0
+        lo, hi = series.bounds(_as_day_number(start), _as_day_number(end))
+        return hi - lo, series.present_prefix[hi] - series.present_prefix[lo]
+
+    def attendance_rate(self, student_id: str, course_id: str, start, end):
+        """
+        Attendance percentage for a student in a course between two dates.
+        Returns:
+            float|None: Percentage (0-100), or None if no sessions in range.
+        """
+        total, present = self.counts_between(student_id, course_id, start, end)
+        if total == 0:
+            return None
+        return present / total * 100
+
+    def rolling_rate(self, student_id: str, course_id: str, days: int, as_of=None):
+        """
+        Attendance percentage over the trailing window of `days` days.
+        Args:
+            student_id (str): The student's ID.
+            course_id (str): The course ID.
+            days (int): Window length in days, including `as_of`.
+            as_of (str|date): Last day of the window. Defaults to today.
+        Returns:
+            float|None: Percentage (0-100), or None if no sessions in the window.
+        """
+        end_day = _as_day_number(as_of) if as_of is not None else date.today().toordinal()
+        return self.attendance_rate(student_id, course_id, end_day - days + 1, end_day)
+
+    def term_rate(self, student_id: str, course_id: str, term_start=None, as_of=None):
+        """
+        Attendance percentage since the start of term.
+        Args:
+            term_start (str|date): First day of term. Defaults to the first recorded session.
+            as_of (str|date): Last day to include. Defaults to today.
+        Returns:
+            float|None: Percentage (0-100), or None if no sessions.
+        """
+        series = self._series.get((student_id, course_id))
+        if series is None or not series.days:
+            return None
+        start_day = _as_day_number(term_start) if term_start is not None else series.days[0]
+        end_day = _as_day_number(as_of) if as_of is not None else date.today().toordinal()
+        return self.attendance_rate(student_id, course_id, start_day, end_day)
+
+    def rolling_rates(self, student_id: str, course_id: str, windows: tuple = (7, 30), term_start=None, as_of=None) -> dict:
+        """
+        Rolling attendance rates for several windows plus the term.
+        Returns:
+            dict: {window_days: rate, ..., 'term': rate}; rates may be None.
+        """
+        rates = {days: self.rolling_rate(student_id, course_id, days, as_of) for days in windows}
+        rates['term'] = self.term_rate(student_id, course_id, term_start, as_of)
+        return rates
+
+    def course_rate(self, course_id: str, start, end):
+        """
+        Attendance percentage across all students of a course in a date range.
+        Returns:
+            float|None: Percentage (0-100), or None if no sessions in range.
+        """
+        start_day, end_day = _as_day_number(start), _as_day_number(end)
+        total = present = 0
+        for sid in self._students_by_course.get(course_id, ()):
+            t, p = self.counts_between(sid, course_id, start_day, end_day)
+            total += t
+            present += p
+        return (present / total * 100) if total else None
+
+    def weekly_course_rates(self, course_id: str, start, end) -> list:
+        """
+        Attendance percentage of a course for consecutive 7-day buckets.
+        Args:
+            course_id (str): The course ID.
+            start (str|date): First day of the first week.
+            end (str|date): Last day to include.
+        Returns:
+            list: (week_start_iso, rate) tuples; rate may be None.
+        """
+        start_day, end_day = _as_day_number(start), _as_day_number(end)
+        weeks = []
+        for week_start in range(start_day, end_day + 1, 7):
+            week_end = min(week_start + 6, end_day)
+            weeks.append((date.fromordinal(week_start).isoformat(), self.course_rate(course_id, week_start, week_end)))
+        return weeks
+
+    def present_streak(self, student_id: str, course_id: str) -> int:
+        """Number of consecutive present sessions ending with the latest one."""
+        series = self._series.get((student_id, course_id))
+        return series.trailing_run(PRESENT_STATUSES) if series else 0
+
+    def consecutive_absences(self, student_id: str, course_id: str) -> int:
+        """Number of consecutive absences ending with the latest session."""
+        series = self._series.get((student_id, course_id))
+        return series.trailing_run(ABSENT_STATUSES) if series else 0
+
+    def longest_absence_run(self, student_id: str, course_id: str) -> int:
+        """Longest run of consecutive absences recorded for a student in a course."""
+        series = self._series.get((student_id, course_id))
+        if series is None:
+            return 0
+        longest = run = 0
+        for status in series.statuses:
+            run = run + 1 if status in ABSENT_STATUSES else 0
+            longest = max(longest, run)
+        return longest
+
+    def max_consecutive_absences(self, student_id: str) -> int:
+        """Largest current absence run for a student across all their courses."""
+        return max(
+            (self.consecutive_absences(student_id, cid) for cid in self._courses_by_student.get(student_id, ())),
+            default=0
+        )
@@ -0,0 +1,86 @@
+ENROLLED = 'enrolled'
+DROPPED = 'dropped'
+
+
+class EnrollmentIndex:
+    """
+    Enrollments indexed by course (roster) and by student (schedule).
+
+    Built by replaying enrollments.csv in file order, so a later 'dropped'
+    row cancels an earlier enrollment. Rosters are sets, making a roster or
+    membership lookup a single dictionary hit regardless of course size.
+    """
+    def __init__(self):
+        self._rosters = {}    # {course_id: set(student_id)}
+        self._schedules = {}  # {student_id: [course_id, ...]} in enrollment order
+
+    @staticmethod
+    def legacy_enrollments(users: list) -> tuple:
+        """
+        (student_id, course_id) pairs from the legacy '_enrolled_courses' of storage-format users.
+        """
+        return tuple((user['_user_id'], cid) for user in users if user.get('_user_id')
+                     for cid in user.get('_enrolled_courses', []))
+
+    @classmethod
+    def from_records(cls, records, legacy=()) -> 'EnrollmentIndex':
+        """
+        Build the index from enrollment rows.
+        Args:
+            records (iterable): Rows with student_id, course_id and status.
+            legacy (iterable): (student_id, course_id) pairs seeding the index (see legacy_enrollments()).
+        Returns:
+            EnrollmentIndex: The populated index.
+        """
+        index = cls()
+        for sid, cid in legacy:
+            index.enroll(sid, cid)
+        index.apply_many(records)
+        return index
+
+    def apply(self, record: dict) -> bool:
+        """
+        Replay one enrollment row.
+        Returns:
+            bool: True if the index changed.
+        """
+        sid, cid = record.get('student_id'), record.get('course_id')
+        if not sid or not cid:
+            return False
+        if record.get('status', ENROLLED) == DROPPED:
+            return self.drop(sid, cid)
+        return self.enroll(sid, cid)
+
+    def apply_many(self, records) -> None:
+        for record in records:
+            self.apply(record)
+
+    def enroll(self, student_id: str, course_id: str) -> bool:
+        roster = self._rosters.setdefault(course_id, set())
+        if student_id in roster:
+            return False
+        roster.add(student_id)
+        self._schedules.setdefault(student_id, []).append(course_id)
+        return True
+
+    def drop(self, student_id: str, course_id: str) -> bool:
+        roster = self._rosters.get(course_id)
+        if not roster or student_id not in roster:
+            return False
+        roster.discard(student_id)
+        self._schedules[student_id].remove(course_id)
+        return True
+
+    def is_enrolled(self, student_id: str, course_id: str) -> bool:
+        return student_id in self._rosters.get(course_id, ())
+
+    def roster(self, course_id: str) -> list:
+        """Sorted student IDs enrolled in a course."""
+        return sorted(self._rosters.get(course_id, ()))
+
+    def roster_size(self, course_id: str) -> int:
+        return len(self._rosters.get(course_id, ()))
+
+    def schedule(self, student_id: str) -> list:
+        """Course IDs a student is enrolled in, in enrollment order."""
+        return list(self._schedules.get(student_id, ()))
@@ -0,0 +1,95 @@
+class GroupIndex:
+    """
+    Bidirectional membership index over groups.json.
+
+    group -> students and student -> groups are both kept as sets, so
+    membership lookups in either direction are single dictionary hits.
+    """
+    def __init__(self, groups: list = None):
+        self.groups = []             # Group dictionaries, in storage order
+        self._by_id = {}             # {group_id: group}
+        self._members = {}           # {group_id: set(student_id)}
+        self._groups_by_student = {} # {student_id: set(group_id)}
+        for group in groups or []:
+            self.add_group(group)
+
+    def add_group(self, group: dict) -> bool:
+        """
+        Index a group dictionary ({'group_id', 'name', 'members'}).
+        Returns:
+            bool: False if the ID is missing or already indexed.
+        """
+        group_id = group.get('group_id')
+        if not group_id or group_id in self._by_id:
+            return False
+        group.setdefault('members', [])
+        self.groups.append(group)
+        self._by_id[group_id] = group
+        self._members[group_id] = set()
+        for student_id in group['members']:
+            self._link(group_id, student_id)
+        return True
+
+    def remove_group(self, group_id: str) -> bool:
+        """Drop a group and its memberships from the index."""
+        group = self._by_id.pop(group_id, None)
+        if group is None:
+            return False
+        for student_id in self._members.pop(group_id):
+            self._groups_by_student[student_id].discard(group_id)
+        self.groups.remove(group)
+        return True
+
+    def _link(self, group_id: str, student_id: str):
+        self._members[group_id].add(student_id)
+        self._groups_by_student.setdefault(student_id, set()).add(group_id)
+
+    def add_members(self, group_id: str, student_ids) -> int:
+        """
+        Add students to a group.
+        Returns:
+            int: Number of students newly added.
+        """
+        group = self._by_id.get(group_id)
+        if group is None:
+            return 0
+        added = 0
+        for student_id in student_ids:
+            if student_id not in self._members[group_id]:
+                self._link(group_id, student_id)
+                group['members'].append(student_id)
+                added += 1
+        return added
+
+    def remove_members(self, group_id: str, student_ids) -> int:
+        """
+        Remove students from a group.
+        Returns:
+            int: Number of students removed.
+        """
+        group = self._by_id.get(group_id)
+        if group is None:
+            return 0
+        to_remove = set(student_ids) & self._members[group_id]
+        for student_id in to_remove:
+            self._members[group_id].discard(student_id)
+            self._groups_by_student[student_id].discard(group_id)
+        if to_remove:
+            group['members'] = [sid for sid in group['members'] if sid not in to_remove]
+        return len(to_remove)
+
+    def get(self, group_id: str):
+        """Return the group dictionary, or None."""
+        return self._by_id.get(group_id)
+
+    def members(self, group_id: str) -> list:
+        """Sorted student IDs in a group."""
+        return sorted(self._members.get(group_id, ()))
+
+    def member_set(self, group_id: str) -> frozenset:
+        """Student IDs in a group, for fast membership filtering."""
+        return frozenset(self._members.get(group_id, ()))
+
+    def groups_for_student(self, student_id: str) -> list:
+        """Sorted IDs of the groups a student belongs to."""
+        return sorted(self._groups_by_student.get(student_id, ()))
@@ -0,0 +1,138 @@
+import json
+import os
+import re
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+ID_PATTERN = re.compile(r'^([A-Z]+)-(\d+)$')
+ID_KEYS = ('_user_id', 'group_id')  # Record keys holding allocator-issued IDs
+
+
+def format_id(prefix: str, number: int) -> str:
+    """
+    Render an ID such as 'S-007'. Numbers past 999 simply get more digits ('S-1000').
+    """
+    return f"{prefix}-{number:03d}"
+
+
+@contextmanager
+def _exclusive_lock(lock_path: str):
+    # Cross-process lock around the counter file's read-modify-write
+    with open(lock_path, 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class IdAllocator:
+    """
+    Persisted, monotonic ID allocator per prefix.
+
+    The high-water mark of each prefix lives in a small counters file that is
+    updated under an exclusive file lock, so IDs are never reused, even after
+    deletes or across processes. Allocation costs O(1) regardless of how many
+    users exist; bulk imports and parallel workers can reserve whole blocks.
+    """
+    def __init__(self, counters_path: str, recover_from=None):
+        """
+        Args:
+            counters_path (str): Path of the JSON counters file.
+            recover_from (callable): Returns existing records (users and groups); their
+                highest IDs seed missing counters and are reconciled once per process.
+        """
+        self._path = counters_path
+        self._lock_path = f"{counters_path}.lock"
+        self._recover_from = recover_from
+        self._reconciled = False
+
+    @staticmethod
+    def high_water_marks(records) -> dict:
+        """
+        Highest number used per prefix in a set of records.
+        Args:
+            records (iterable): Storage-format dictionaries with one of ID_KEYS.
+        Returns:
+            dict: {prefix: highest_number}
+        """
+        marks = {}
+        for record in records:
+            for key in ID_KEYS:
+                match = ID_PATTERN.match(str(record.get(key, '')))
+                if match:
+                    prefix, number = match.group(1), int(match.group(2))
+                    marks[prefix] = max(marks.get(prefix, 0), number)
+        return marks
+
+    def _read(self) -> dict:
+        try:
+            with open(self._path, 'r') as f:
+                counters = json.load(f)
+            if isinstance(counters, dict):
+                return counters
+        except (IOError, ValueError):
+            pass
+        # Missing or damaged: rebuild from the data so we never go backwards
+        return self.high_water_marks(self._recover_from()) if self._recover_from else {}
+
+    def _write(self, counters: dict) -> None:
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(counters, f, indent=4, sort_keys=True)
+        os.replace(tmp_path, self._path)
+
+    def reserve_block(self, prefix: str, count: int) -> range:
+        """
+        Reserve `count` consecutive numbers for a prefix.
+        Args:
+            prefix (str): ID prefix such as 'S'.
+            count (int): How many IDs to reserve.
+        Returns:
+            range: The reserved numbers; format them with format_id().
+        Raises:
+            ValueError: If count is not positive.
+        """
+        if count <= 0:
+            raise ValueError("count must be positive.")
+        with _exclusive_lock(self._lock_path):
+            counters = self._read()
+            if not self._reconciled and self._recover_from:
+                # Once per process: never fall behind IDs already present in the data
+                for key, number in self.high_water_marks(self._recover_from()).items():
+                    counters[key] = max(counters.get(key, 0), number)
+                self._reconciled = True
+            start = counters.get(prefix, 0) + 1
+            counters[prefix] = start + count - 1
+            self._write(counters)
+        return range(start, start + count)
+
+    def allocate(self, prefix: str) -> str:
+        """
+        Hand out the next ID for a prefix.
+        Returns:
+            str: A never-before-issued ID such as 'S-042'.
+        """
+        return format_id(prefix, self.reserve_block(prefix, 1)[0])
+
+    def allocate_many(self, prefix: str, count: int) -> list:
+        """Reserve a block and return its IDs formatted."""
+        return [format_id(prefix, number) for number in self.reserve_block(prefix, count)]
+
+    def peek(self, prefix: str) -> int:
+        """Current high-water mark of a prefix (0 if none issued)."""
+        with _exclusive_lock(self._lock_path):
+            return self._read().get(prefix, 0)
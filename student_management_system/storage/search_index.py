@@ -0,0 +1,309 @@
+import bisect
+import heapq
+from collections import Counter
+from itertools import islice
+
+BUCKET_SIZE = 32    # Terms a trie leaf holds before it is split into a node
+CANDIDATES = 200    # Best-counted fuzzy candidates re-counted against further trigrams
+VERIFY_LISTS = 5    # ...and how many of the next-rarest posting lists they are checked in
+_END = ''           # Node key marking that the path so far is itself a term
+
+
+def trigrams(text: str) -> set:
+    """Padded, lower-cased 3-grams of a string ('bob' -> '  b', ' bo', 'bob', 'ob ')."""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """
+    Prefix and fuzzy lookup of users by username or user ID.
+
+    Both fields are lower-cased into "terms" and kept in one burst trie per
+    role: inner nodes are dicts keyed by character and leaves are sorted
+    buckets of whole terms, split into a node once they outgrow
+    BUCKET_SIZE. A prefix query walks to the prefix's node or bucket and
+    reads terms in order until it has `limit` users (merging the roles'
+    tries when no role is given), so its cost does not grow with the
+    number of users, and a role filter never skips over other roles.
+
+    Fuzzy queries match usernames by shared trigrams. The query's posting
+    lists are counted rarest first until `scan_budget` entries have been
+    seen (common trigrams such as '_s' say little about a match and are
+    what would make the work grow with the user count). A typo usually
+    leaves many candidates tied on those few rare lists, so the best
+    CANDIDATES are also looked up in the next VERIFY_LISTS lists, one
+    dictionary hit each, and the leaders are ranked by their Dice
+    coefficient over all trigrams. Every stage is capped, so a query costs
+    the same whatever the user count or how common its trigrams are.
+
+    Users are added, changed and removed one at a time (see sync()), so
+    saving users.json after one edit does not rebuild the index.
+    """
+    def __init__(self, users: list = None, threshold: float = 0.3, scan_budget: int = 1000):
+        self.threshold = threshold
+        self.scan_budget = scan_budget
+        self._tries = {}        # {role: trie}
+        self._owners = {}       # {term: (user_id, ...)}
+        self._postings = {}     # {trigram: {username term: None}}, ordered sets
+        self._records = {}      # {user_id: storage record}
+        self._keys = {}         # {user_id: (username, role)}, what the terms were built from
+        self._by_username = {}  # {username: user_id}
+        for user in users or []:
+            self.add(user)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # Maintenance
+
+    def add(self, record: dict) -> bool:
+        """
+        Index one storage user record, replacing any record with the same ID.
+        Returns:
+            bool: False if it has no user ID.
+        """
+        user_id = record.get('_user_id')
+        if not user_id:
+            return False
+        if user_id in self._records:
+            self.remove(user_id)
+        username, role = record.get('_username') or '', record.get('_role')
+        self._records[user_id] = record
+        self._keys[user_id] = (username, role)
+        if username:
+            self._by_username[username] = user_id
+        trie = self._tries.setdefault(role, {})
+        for term in {username.lower(), user_id.lower()} - {''}:
+            owners = self._owners.get(term, ())
+            if not any(self._keys[uid][1] == role for uid in owners):
+                self._insert(trie, term)
+            if not owners and term == username.lower():
+                for gram in trigrams(term):
+                    self._postings.setdefault(gram, {})[term] = None
+            self._owners[term] = tuple(sorted(owners + (user_id,)))
+        return True
+
+    def remove(self, user_id: str) -> bool:
+        """Drop a user from the index; False if it was not indexed."""
+        if self._records.pop(user_id, None) is None:
+            return False
+        username, role = self._keys.pop(user_id)
+        if self._by_username.get(username) == user_id:
+            del self._by_username[username]
+        for term in {username.lower(), user_id.lower()} - {''}:
+            owners = tuple(uid for uid in self._owners[term] if uid != user_id)
+            if not any(self._keys[uid][1] == role for uid in owners):
+                self._delete(self._tries[role], term)
+            if owners:
+                self._owners[term] = owners
+                continue
+            del self._owners[term]
+            if term == username.lower():
+                for gram in trigrams(term):
+                    postings = self._postings[gram]
+                    del postings[term]
+                    if not postings:
+                        del self._postings[gram]
+        return True
+
+    def sync(self, users: list) -> int:
+        """
+        Bring the index in line with a full users list, touching only what changed.
+        Args:
+            users (list): All storage user records.
+        Returns:
+            int: Number of users added, changed or removed.
+        """
+        # One pass that keeps no per-user objects alive: on a heap holding the
+        # whole index, retaining 100k tuples here would trigger full GC passes
+        present, changes = set(), 0
+        for record in users:
+            user_id = record.get('_user_id')
+            if not user_id:
+                continue
+            present.add(user_id)
+            if self._keys.get(user_id) == (record.get('_username') or '', record.get('_role')):
+                self._records[user_id] = record  # Same terms; adopt the new record object
+            else:
+                self.add(record)
+                changes += 1
+        for user_id in self._records.keys() - present:
+            self.remove(user_id)
+            changes += 1
+        return changes
+
+    @classmethod
+    def _insert(cls, trie: dict, term: str) -> None:
+        node, depth = trie, 0
+        while True:
+            if depth == len(term):
+                node[_END] = True
+                return
+            child = node.get(term[depth])
+            if isinstance(child, dict):
+                node, depth = child, depth + 1
+                continue
+            if child is None:
+                node[term[depth]] = [term]
+                return
+            bisect.insort(child, term)
+            if len(child) > BUCKET_SIZE:
+                node[term[depth]] = cls._burst(child, depth + 1)
+            return
+
+    @classmethod
+    def _burst(cls, bucket: list, depth: int) -> dict:
+        # Turn a full bucket of terms sharing `depth` characters into a node
+        node = {}
+        for term in bucket:
+            if len(term) == depth:
+                node[_END] = True
+            else:
+                node.setdefault(term[depth], []).append(term)
+        for char, child in list(node.items()):
+            if char != _END and len(child) > BUCKET_SIZE:
+                node[char] = cls._burst(child, depth + 1)
+        return node
+
+    @staticmethod
+    def _delete(trie: dict, term: str) -> None:
+        path, node = [], trie
+        for char in term:
+            child = node.get(char)
+            if not isinstance(child, dict):
+                child.remove(term)
+                if not child:
+                    del node[char]
+                break
+            path.append((node, char))
+            node = child
+        else:
+            del node[_END]
+        # Prune nodes left empty, bottom-up
+        for parent, char in reversed(path):
+            if parent[char]:
+                break
+            del parent[char]
+
+    # Queries
+
+    def find(self, text: str, role: str = None):
+        """
+        Exact lookup: a username as typed, or a user ID in any case.
+        Returns:
+            dict|None: The storage record.
+        """
+        if not text:
+            return None
+        user_id = self._by_username.get(text)
+        if user_id is None:
+            user_id = text.strip().upper()
+        record = self._records.get(user_id)
+        if record is None or (role and record.get('_role') != role):
+            return None
+        return record
+
+    def _owned(self, terms, role: str, limit: int) -> list:
+        found, seen = [], set()
+        for term in terms:
+            for user_id in self._owners[term]:
+                record = self._records[user_id]
+                if user_id in seen or (role and record.get('_role') != role):
+                    continue
+                seen.add(user_id)
+                found.append(record)
+                if len(found) >= limit:
+                    return found
+        return found
+
+    @staticmethod
+    def _prefixed(trie: dict, text: str):
+        # Terms starting with `text`, in order: walk down, then depth-first in character order
+        node = trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return
+            if isinstance(node, list):
+                start = bisect.bisect_left(node, text)
+                for term in node[start:]:
+                    if not term.startswith(text):
+                        return
+                    yield term
+                return
+        stack = [(node, text)]
+        while stack:
+            node, path = stack.pop()
+            if isinstance(node, list):
+                yield from node
+                continue
+            if _END in node:
+                yield path
+            for char in sorted((c for c in node if c != _END), reverse=True):
+                stack.append((node[char], path + char))
+
+    def prefix(self, text: str, limit: int = 10, role: str = None) -> list:
+        """
+        Users whose username or ID starts with `text` (case-insensitive).
+        Args:
+            text (str): The typed prefix.
+            limit (int): Maximum number of records.
+            role (str): Only users with this role; None for all.
+        Returns:
+            list: Storage records, in term order.
+        """
+        text = text.lower()
+        if role:
+            terms = self._prefixed(self._tries.get(role, {}), text)
+        else:
+            terms = heapq.merge(*(self._prefixed(trie, text) for trie in self._tries.values()))
+        return self._owned(terms, role, limit)
+
+    def fuzzy(self, text: str, limit: int = 10, role: str = None) -> list:
+        """
+        Users whose username is similar to `text`, best match first.
+        Returns:
+            list: Storage records scoring at least `threshold`.
+        """
+        grams = trigrams(text.strip())
+        lists = sorted((self._postings[gram] for gram in grams if gram in self._postings), key=len)
+        counts = Counter()
+        budget, counted = self.scan_budget, 0
+        for postings in lists:
+            if budget < len(postings):
+                if not counted:
+                    # Even the rarest trigram is common: sample it rather than scan it all
+                    counts.update(islice(postings, budget))
+                    counted = 1
+                break
+            counts.update(postings.keys())
+            budget -= len(postings)
+            counted += 1
+        # Sort with C-level keys and filters; heapq.nlargest or a per-term loop would run in Python
+        candidates = sorted(counts, key=counts.__getitem__, reverse=True)[:CANDIDATES]
+        for postings in lists[counted:counted + VERIFY_LISTS]:
+            counts.update(filter(postings.__contains__, candidates))
+        shortlist = sorted(candidates, key=counts.__getitem__, reverse=True)[:limit * 2]
+        scored = []
+        for term in shortlist:
+            term_grams = trigrams(term)
+            score = 2 * len(grams & term_grams) / (len(grams) + len(term_grams))
+            if score >= self.threshold:
+                scored.append((-score, term))
+        return self._owned((term for _, term in sorted(scored)), role, limit)
+
+    def search(self, text: str, limit: int = 10, role: str = None) -> list:
+        """
+        Prefix matches first, then fuzzy matches to fill up to `limit`.
+        Returns:
+            list: Storage records without duplicates.
+        """
+        text = text.strip()
+        if not text:
+            return []
+        results = self.prefix(text, limit, role)
+        if len(results) < limit:
+            seen = {r.get('_user_id') for r in results}
+            results += [r for r in self.fuzzy(text, limit, role) if r.get('_user_id') not in seen][:limit - len(results)]
+        return results
@@ -0,0 +1,221 @@
+import copy
+import threading
+from .storage_manager import StorageManager
+
+
+class SharedStore(StorageManager):
+    """
+    StorageManager for many sessions in one process (see server.py).
+
+    Every data file is read once. Reads are served from memory, writes are
+    applied to memory immediately and handed to `persist` as
+    (filename, op, payload) tuples; the owner batches those and calls
+    commit() from a single writer. A file's version is a counter bumped on
+    each write, so the version-keyed index caches of StorageManager and
+    Session keep working without stat() calls. All access holds one lock.
+    """
+    JSON_FILES = ('users.json', 'groups.json', 'courses.json')
+    CSV_FILES = ('enrollments.csv', 'attendance.csv', 'grades.csv')
+
+    def __init__(self, data_dir: str, persist=None):
+        super().__init__(data_dir)
+        self._lock = threading.RLock()
+        self._persist = persist
+        # Persistence goes through a plain, disk-backed manager over the same directory
+        self._disk = StorageManager(data_dir)
+        self._memory = {
+            'users.json': self._disk.load_users(),
+            'groups.json': self._disk.load_groups(),
+            'courses.json': self._disk.load_courses(),
+            'enrollments.csv': self._disk.load_enrollments(),
+            'attendance.csv': self._disk.load_attendance(),
+            'grades.csv': self._disk.load_grades(),
+        }
+        self._versions = dict.fromkeys(self._memory, 1)
+        self.commits = 0
+        self.writes = 0
+
+    def set_persister(self, persist) -> None:
+        """Callable taking (filename, op, payload) for every write; None keeps writes in memory only."""
+        self._persist = persist
+
+    def _file_version(self, filename: str):
+        if filename in self._versions:
+            return self._versions[filename]
+        return super()._file_version(filename)
+
+    def _write(self, filename: str, op: str, payload: list) -> None:
+        # Caller holds the lock
+        self._versions[filename] += 1
+        if self._persist is not None:
+            self._persist(filename, op, payload)
+
+    def _replace(self, filename: str, records: list) -> bool:
+        with self._lock:
+            snapshot = copy.deepcopy(records)
+            self._memory[filename] = snapshot
+            self._write(filename, 'replace', snapshot)
+            return True
+
+    def _append(self, filename: str, records: list) -> None:
+        # Caller holds the lock
+        rows = [dict(record) for record in records]
+        self._memory[filename] = self._memory[filename] + rows
+        self._write(filename, 'append', rows)
+
+    # Reads: copies, so callers may modify what they get
+    def load_users(self) -> list:
+        with self._lock:
+            return copy.deepcopy(self._memory['users.json'])
+
+    def load_groups(self) -> list:
+        with self._lock:
+            return copy.deepcopy(self._memory['groups.json'])
+
+    def load_courses(self) -> list:
+        with self._lock:
+            return copy.deepcopy(self._memory['courses.json'])
+
+    # CSV rows are replaced, never edited in place, so a shallow copy is enough
+    def load_enrollments(self) -> list:
+        with self._lock:
+            return list(self._memory['enrollments.csv'])
+
+    def load_attendance(self) -> list:
+        with self._lock:
+            return list(self._memory['attendance.csv'])
+
+    def load_grades(self) -> list:
+        with self._lock:
+            return list(self._memory['grades.csv'])
+
+    def iter_grades(self):
+        yield from self.load_grades()
+
+    # Writes
+    def save_users(self, users: list) -> bool:
+        with self._lock:
+            index_current = self._search_index is not None and self._search_index_version == self.users_version()
+            self._replace('users.json', users)
+            if index_current:
+                self._sync_search_index(users)
+            return True
+
+    def save_groups(self, groups: list) -> bool:
+        return self._replace('groups.json', groups)
+
+    def save_courses(self, courses: list) -> bool:
+        return self._replace('courses.json', courses)
+
+    def save_attendance(self, attendance_records: list) -> bool:
+        if not attendance_records:
+            return True
+        return self._replace('attendance.csv', attendance_records)
+
+    def save_grades(self, grades: list) -> bool:
+        if not grades:
+            return True
+        return self._replace('grades.csv', grades)
+
+    def append_enrollments(self, enrollments: list) -> bool:
+        if not enrollments:
+            return True
+        with self._lock:
+            index_current = (
+                self._enrollment_index is not None
+                and self._enrollment_index_version == self._enrollment_version()
+            )
+            self._append('enrollments.csv', enrollments)
+            if index_current:
+                self._enrollment_index.apply_many(enrollments)
+                self._enrollment_index_version = self._enrollment_version()
+            return True
+
+    def append_attendance(self, attendance_records: list) -> bool:
+        if not attendance_records:
+            return True
+        with self._lock:
+            index_current = (
+                self._attendance_index is not None
+                and self._attendance_index_version == self._file_version('attendance.csv')
+            )
+            self._append('attendance.csv', attendance_records)
+            if index_current:
+                self._attendance_index.add_many(attendance_records)
+                self._attendance_index_version = self._file_version('attendance.csv')
+            self._notify('attendance', attendance_records)
+            return True
+
+    def append_grades(self, grades: list) -> bool:
+        if not grades:
+            return True
+        with self._lock:
+            self._append('grades.csv', grades)
+            self._notify('grades', grades)
+            return True
+
+    # The cached indexes are rebuilt lazily; keep that single-threaded
+    def load_attendance_index(self):
+        with self._lock:
+            return super().load_attendance_index()
+
+    def load_group_index(self):
+        with self._lock:
+            return super().load_group_index()
+
+    def load_enrollment_index(self):
+        with self._lock:
+            return super().load_enrollment_index()
+
+    def load_user_index(self):
+        with self._lock:
+            return super().load_user_index()
+
+    # The search index is updated in place by save_users(), so queries hold the lock too
+    def search_users(self, text: str, limit: int = 10, role: str = None) -> list:
+        with self._lock:
+            return super().search_users(text, limit, role)
+
+    def lookup_user(self, text: str, role: str = None):
+        with self._lock:
+            return super().lookup_user(text, role)
+
+    def commit(self, writes: list) -> list:
+        """
+        Persist a batch of writes with at most one disk write per file.
+
+        A 'replace' supersedes everything queued before it for that file;
+        appends after it are folded into it, or into one append otherwise.
+        Args:
+            writes (list): (filename, op, payload) tuples in the order they were made.
+        Returns:
+            list: One folded (filename, op, payload) write per file that was not
+                written, to be retried ahead of later writes; empty on success.
+        """
+        pending = {}  # {filename: [op, rows]}, insertion ordered
+        for filename, op, payload in writes:
+            entry = pending.get(filename)
+            if op == 'replace' or entry is None:
+                pending[filename] = [op, list(payload)]
+            else:
+                entry[1].extend(payload)
+        savers = {
+            'users.json': (self._disk.save_users, None),
+            'groups.json': (self._disk.save_groups, None),
+            'courses.json': (self._disk.save_courses, None),
+            'enrollments.csv': (None, self._disk.append_enrollments),
+            'attendance.csv': (self._disk.save_attendance, self._disk.append_attendance),
+            'grades.csv': (self._disk.save_grades, self._disk.append_grades),
+        }
+        failed = []
+        for filename, (op, rows) in pending.items():
+            save, append = savers[filename]
+            try:
+                written = save(rows) if op == 'replace' else append(rows)
+            except Exception:
+                written = False
+            if not written:
+                failed.append((filename, op, rows))
+        self.commits += 1
+        self.writes += len(writes)
+        return failed
@@ -3,16 +3,89 @@ import json
 import csv
 import shutil
 from datetime import datetime
+from .attendance_index import AttendanceIndex
+from .id_allocator import IdAllocator
+from .group_index import GroupIndex
+from .enrollment_index import EnrollmentIndex
+from .user_index import UserIndex
+from .search_index import SearchIndex
 
 class StorageManager:
     def __init__(self, data_dir: str):
         self.__data_dir = data_dir
         if not os.path.exists(self.__data_dir):
             os.makedirs(self.__data_dir)
+        self._attendance_index = None
+        self._attendance_index_version = None
+        self._group_index = None
+        self._group_index_version = None
+        self._enrollment_index = None
+        self._enrollment_index_version = None
+        self._legacy_enrollments = ()
+        self._legacy_enrollments_version = None
+        self._user_index = None
+        self._user_index_version = None
+        self._search_index = None
+        self._search_index_version = None
+        self._listeners = []
+        self._id_allocator = IdAllocator(self._get_file_path('id_counters.json'), recover_from=self._id_records)
 
     def _get_file_path(self, filename: str) -> str:
         return os.path.join(self.__data_dir, filename)
 
+    def _file_version(self, filename: str):
+        # Cheap change detector: a stat() call instead of re-reading the file
+        try:
+            st = os.stat(self._get_file_path(filename))
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def versions(self, *filenames) -> tuple:
+        """
+        Version tokens of several data files, for cache validation.
+        Returns:
+            tuple: One opaque token per file (None if it does not exist).
+        """
+        return tuple(self._file_version(name) for name in filenames)
+
+    def add_listener(self, callback) -> None:
+        """
+        Register a callback invoked as callback(kind, records) after rows are appended.
+        Args:
+            callback (callable): Receives 'attendance' or 'grades' and the new rows.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, kind: str, records: list) -> None:
+        for callback in self._listeners:
+            callback(kind, records)
+
+    def _append_csv(self, filename: str, records: list) -> bool:
+        file_path = self._get_file_path(filename)
+        try:
+            fieldnames = None
+            needs_newline = False
+            if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+                with open(file_path, 'r', newline='') as f:
+                    fieldnames = next(csv.reader(f), None)
+                with open(file_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) not in (b'\n', b'\r')
+            write_header = not fieldnames
+            if write_header:
+                fieldnames = list(records[0].keys())
+            with open(file_path, 'a', newline='') as f:
+                if needs_newline:
+                    f.write('\r\n')
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(records)
+            return True
+        except (csv.Error, IOError, IndexError):
+            return False
+
     # User data
     def load_users(self) -> list:
         file_path = self._get_file_path('users.json')
@@ -26,13 +99,243 @@ class StorageManager:
 
     def save_users(self, users: list) -> bool:
         file_path = self._get_file_path('users.json')
+        tmp_path = f"{file_path}.tmp"
+        index_current = self._search_index is not None and self._search_index_version == self.users_version()
         try:
-            with open(file_path, 'w') as f:
+            # Write aside and swap in, so readers never see a half-written file
+            with open(tmp_path, 'w') as f:
                 json.dump(users, f, indent=4)
+            os.replace(tmp_path, file_path)
+        except IOError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        if index_current:
+            self._sync_search_index(users)
+        return True
+
+    def _sync_search_index(self, users: list) -> None:
+        # Apply only the changed users instead of rebuilding on next use
+        self._search_index.sync(users)
+        self._search_index_version = self.users_version()
+
+    def users_version(self):
+        """
+        Version token of users.json; changes whenever the file is rewritten.
+        Returns:
+            tuple|None: Opaque token, or None if the file does not exist.
+        """
+        return self._file_version('users.json')
+
+    def load_user_index(self) -> UserIndex:
+        """
+        Get sorted, role-filterable views of users.json for paged listings, rebuilt only when the file changes.
+        Returns:
+            UserIndex: Index serving pages by cursor.
+        """
+        version = self.users_version()
+        if self._user_index is None or version != self._user_index_version:
+            self._user_index = UserIndex(self.load_users())
+            self._user_index_version = version
+        return self._user_index
+
+    def load_search_index(self) -> SearchIndex:
+        """
+        Get the prefix/fuzzy user search index, rebuilt only when users.json
+        changes outside save_users() (which updates it in place).
+        Returns:
+            SearchIndex: Index over usernames and user IDs.
+        """
+        version = self.users_version()
+        if self._search_index is None or version != self._search_index_version:
+            self._search_index = SearchIndex(self.load_users())
+            self._search_index_version = version
+        return self._search_index
+
+    def search_users(self, text: str, limit: int = 10, role: str = None) -> list:
+        """
+        Users whose username or ID starts with, or else resembles, `text`.
+        Args:
+            text (str): What was typed so far.
+            limit (int): Maximum number of records.
+            role (str): Only users with this role; None for all.
+        Returns:
+            list: Storage user records, prefix matches first.
+        """
+        return self.load_search_index().search(text, limit, role)
+
+    def lookup_user(self, text: str, role: str = None):
+        """
+        Exact lookup by username, or by user ID in any case.
+        Returns:
+            dict|None: The storage user record.
+        """
+        return self.load_search_index().find(text, role)
+
+    def next_user_id(self, role: str) -> str:
+        """
+        Allocate a new, never reused user ID for a role (e.g. 'S-012' for a Student).
+        Args:
+            role (str): The user's role; its initial is the ID prefix.
+        Returns:
+            str: The new ID.
+        """
+        return self._id_allocator.allocate(role[0].upper())
+
+    def reserve_user_ids(self, role: str, count: int) -> list:
+        """
+        Reserve a block of user IDs for a bulk import or a parallel worker.
+        Args:
+            role (str): The users' role; its initial is the ID prefix.
+            count (int): Number of IDs.
+        Returns:
+            list: The reserved IDs, in order.
+        """
+        return self._id_allocator.allocate_many(role[0].upper(), count)
+
+    def _id_records(self) -> list:
+        # Every record that carries an allocator-issued ID
+        return self.load_users() + self.load_groups()
+
+    # Group data
+    def load_groups(self) -> list:
+        file_path = self._get_file_path('groups.json')
+        if not os.path.exists(file_path):
+            return []
+        try:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return []
+
+    def save_groups(self, groups: list) -> bool:
+        """
+        Persist groups ({'group_id', 'name', 'members'}) and refresh the membership index.
+        Args:
+            groups (list): All group dictionaries.
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        file_path = self._get_file_path('groups.json')
+        tmp_path = f"{file_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(groups, f, indent=4)
+            os.replace(tmp_path, file_path)
+        except IOError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._group_index = None
+            return False
+        self._group_index = GroupIndex(groups)
+        self._group_index_version = self._file_version('groups.json')
+        return True
+
+    def load_group_index(self) -> GroupIndex:
+        """
+        Get the group <-> student membership index, rebuilt only when groups.json changes.
+        Returns:
+            GroupIndex: Index whose `groups` list is the current group data.
+        """
+        version = self._file_version('groups.json')
+        if self._group_index is None or version != self._group_index_version:
+            self._group_index = GroupIndex(self.load_groups())
+            self._group_index_version = version
+        return self._group_index
+
+    def next_group_id(self) -> str:
+        """Allocate a new, never reused group ID (e.g. 'G-004')."""
+        return self._id_allocator.allocate('G')
+
+    # Course catalog
+    def load_courses(self) -> list:
+        file_path = self._get_file_path('courses.json')
+        if not os.path.exists(file_path):
+            return []
+        try:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return []
+
+    def save_courses(self, courses: list) -> bool:
+        """
+        Persist the course catalog ({'course_id', 'name', 'teacher', 'capacity'}).
+        Args:
+            courses (list): All course dictionaries.
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        file_path = self._get_file_path('courses.json')
+        tmp_path = f"{file_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(courses, f, indent=4)
+            os.replace(tmp_path, file_path)
             return True
         except IOError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return False
 
+    # Enrollment data (append-only CSV)
+    def _enrollment_version(self):
+        # Legacy '_enrolled_courses' in users.json also feed the index; they are
+        # part of the version by value, so a login rehash or a rename keeps the index
+        return (self._file_version('enrollments.csv'), self._load_legacy_enrollments())
+
+    def _load_legacy_enrollments(self) -> tuple:
+        version = self.users_version()
+        if version != self._legacy_enrollments_version:
+            pairs = EnrollmentIndex.legacy_enrollments(self.load_users())
+            if pairs != self._legacy_enrollments:
+                self._legacy_enrollments = pairs
+            self._legacy_enrollments_version = version
+        return self._legacy_enrollments
+
+    def load_enrollments(self) -> list:
+        file_path = self._get_file_path('enrollments.csv')
+        if not os.path.exists(file_path):
+            return []
+        try:
+            with open(file_path, 'r', newline='') as f:
+                return list(csv.DictReader(f))
+        except (csv.Error, IOError):
+            return []
+
+    def append_enrollments(self, enrollments: list) -> bool:
+        """
+        Append enrollment rows (student_id, course_id, date, status) without rewriting the file.
+        Args:
+            enrollments (list): New enrollment dictionaries; status is 'enrolled' or 'dropped'.
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        if not enrollments:
+            return True
+        index_current = (
+            self._enrollment_index is not None
+            and self._enrollment_index_version == self._enrollment_version()
+        )
+        if not self._append_csv('enrollments.csv', enrollments):
+            return False
+        if index_current:
+            self._enrollment_index.apply_many(enrollments)
+            self._enrollment_index_version = self._enrollment_version()
+        return True
+
+    def load_enrollment_index(self) -> EnrollmentIndex:
+        """
+        Get enrollments indexed by course and by student, rebuilt only when the data changes.
+        Returns:
+            EnrollmentIndex: Index supporting roster and schedule lookups.
+        """
+        version = self._enrollment_version()
+        if self._enrollment_index is None or version != self._enrollment_index_version:
+            self._enrollment_index = EnrollmentIndex.from_records(self.load_enrollments(), version[1])
+            self._enrollment_index_version = version
+        return self._enrollment_index
+
     # Student data
     def load_students(self) -> list:
         users = self.load_users()
@@ -68,10 +371,46 @@ class StorageManager:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
                 writer.writerows(attendance_records)
+            self._attendance_index = None
             return True
         except (csv.Error, IOError, IndexError):
             return False
 
+    def append_attendance(self, attendance_records: list) -> bool:
+        """
+        Append attendance rows without rewriting the existing file.
+        Args:
+            attendance_records (list): New attendance dictionaries.
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        if not attendance_records:
+            return True
+        index_current = (
+            self._attendance_index is not None
+            and self._attendance_index_version == self._file_version('attendance.csv')
+        )
+        if not self._append_csv('attendance.csv', attendance_records):
+            return False
+        if index_current:
+            # Keep the cached index warm instead of rebuilding it on next use
+            self._attendance_index.add_many(attendance_records)
+            self._attendance_index_version = self._file_version('attendance.csv')
+        self._notify('attendance', attendance_records)
+        return True
+
+    def load_attendance_index(self) -> AttendanceIndex:
+        """
+        Get a date index over attendance.csv, rebuilt only when the file changes.
+        Returns:
+            AttendanceIndex: Index supporting range queries and rolling rates.
+        """
+        version = self._file_version('attendance.csv')
+        if self._attendance_index is None or version != self._attendance_index_version:
+            self._attendance_index = AttendanceIndex.from_records(self.load_attendance())
+            self._attendance_index_version = version
+        return self._attendance_index
+
     # Grades data (CSV-based)
     def load_grades(self) -> list:
         file_path = self._get_file_path('grades.csv')
@@ -87,6 +426,21 @@ class StorageManager:
         except (csv.Error, IOError):
             return []
 
+    def iter_grades(self):
+        """
+        Stream grade rows one at a time without loading the whole file.
+        Yields:
+            dict: One grade row per iteration.
+        """
+        file_path = self._get_file_path('grades.csv')
+        if not os.path.exists(file_path):
+            return
+        try:
+            with open(file_path, 'r', newline='') as f:
+                yield from csv.DictReader(f)
+        except (csv.Error, IOError):
+            return
+
     def save_grades(self, grades: list) -> bool:
         file_path = self._get_file_path('grades.csv')
         if not grades:
@@ -101,6 +455,21 @@ class StorageManager:
         except (csv.Error, IOError, IndexError):
             return False
 
+    def append_grades(self, grades: list) -> bool:
+        """
+        Append grade rows without rewriting the existing file.
+        Args:
+            grades (list): New grade dictionaries.
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        if not grades:
+            return True
+        if not self._append_csv('grades.csv', grades):
+            return False
+        self._notify('grades', grades)
+        return True
+
     # Utility / safety
     def backup_data(self) -> bool:
         backup_dir = os.path.join(self.__data_dir, 'backups')
@@ -109,7 +478,8 @@ class StorageManager:
         
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         try:
-            files_to_backup = ['users.json', 'attendance.csv', 'grades.csv']
+            files_to_backup = ['users.json', 'groups.json', 'courses.json', 'enrollments.csv',
+                               'attendance.csv', 'grades.csv', 'id_counters.json']
             files_found = False
             for filename in files_to_backup:
                 src = self._get_file_path(filename)
@@ -140,6 +510,47 @@ class StorageManager:
             except json.JSONDecodeError:
                 users_valid = False
 
+        # groups.json
+        groups_valid = True
+        gr_path = self._get_file_path('groups.json')
+        if os.path.exists(gr_path):
+            try:
+                with open(gr_path, 'r') as f:
+                    groups = json.load(f)
+                if not isinstance(groups, list) or not all(isinstance(g, dict) and 'group_id' in g for g in groups):
+                    groups_valid = False
+            except (json.JSONDecodeError, IOError):
+                groups_valid = False
+
+        # courses.json (an empty file is an empty catalog)
+        courses_valid = True
+        c_path = self._get_file_path('courses.json')
+        if os.path.exists(c_path) and os.path.getsize(c_path) > 0:
+            try:
+                with open(c_path, 'r') as f:
+                    courses = json.load(f)
+                if not isinstance(courses, list) or not all(isinstance(c, dict) and 'course_id' in c for c in courses):
+                    courses_valid = False
+            except (json.JSONDecodeError, IOError):
+                courses_valid = False
+
+        # enrollments.csv
+        enroll_valid = True
+        e_path = self._get_file_path('enrollments.csv')
+        if os.path.exists(e_path):
+            try:
+                with open(e_path, 'r') as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        if not all(key in row for key in ['student_id', 'course_id', 'status']):
+                            enroll_valid = False
+                            break
+                        if row['status'] not in ['enrolled', 'dropped']:
+                            enroll_valid = False
+                            break
+            except (csv.Error, ValueError):
+                enroll_valid = False
+
         # attendance.csv
         att_valid = True
         a_path = self._get_file_path('attendance.csv')
@@ -177,4 +588,4 @@ class StorageManager:
             except (csv.Error, ValueError):
                 grades_valid = False
 
-        return users_valid and att_valid and grades_valid
+        return users_valid and groups_valid and courses_valid and enroll_valid and att_valid and grades_valid
@@ -0,0 +1,99 @@
+import bisect
+import json
+
+def id_key(user_id) -> tuple:
+    """
+    Sort key of a user ID: prefix, then the number numerically, so S-999 comes before S-1000.
+    IDs without a numeric part sort before the numbered ones of their prefix; the full ID
+    breaks any remaining tie (S-01 and S-001).
+    """
+    user_id = str(user_id or '')
+    prefix, _, number = user_id.rpartition('-')
+    if not prefix or not number.isdigit():
+        return (user_id, -1, user_id)
+    return (prefix, int(number), user_id)
+
+
+# Sort orders; the user ID breaks ties so every key is unique
+SORT_KEYS = {
+    'id': lambda u: id_key(u.get('_user_id')),
+    'name': lambda u: (str(u.get('_username') or '').lower(),) + id_key(u.get('_user_id')),
+}
+
+
+def encode_cursor(key: tuple) -> str:
+    return json.dumps(list(key), separators=(',', ':'))
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Raises:
+        ValueError: If the cursor was not produced by encode_cursor().
+    """
+    try:
+        key = json.loads(cursor)
+    except (TypeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(key, list) or not all(isinstance(part, (str, int)) and not isinstance(part, bool) for part in key):
+        raise ValueError("Invalid cursor.")
+    return tuple(key)
+
+
+class UserIndex:
+    """
+    Sorted, filterable views of users.json for paged listings.
+
+    A view (sort order + optional role) is sorted once, the first time it is
+    asked for. Cursors hold the sort key of the last user on a page rather
+    than an offset, so the next page starts after that user even if users
+    were added or removed in between.
+    """
+    def __init__(self, users: list):
+        self.users = users
+        self._by_username = {u.get('_username'): u for u in users}
+        self._views = {}  # {(sort, role): (keys, records)}
+
+    def _view(self, sort: str, role: str = None) -> tuple:
+        view = self._views.get((sort, role))
+        if view is None:
+            if sort not in SORT_KEYS:
+                raise ValueError(f"Unknown sort '{sort}'.")
+            key = SORT_KEYS[sort]
+            records = sorted((u for u in self.users if role is None or u.get('_role') == role), key=key)
+            view = ([key(u) for u in records], records)
+            self._views[(sort, role)] = view
+        return view
+
+    def find(self, username: str):
+        """Return the storage record with this username, or None."""
+        return self._by_username.get(username)
+
+    def count(self, role: str = None) -> int:
+        return len(self._view('id', role)[1])
+
+    def page(self, sort: str = 'id', role: str = None, cursor: str = None, limit: int = 20) -> dict:
+        """
+        One page of users.
+        Args:
+            sort (str): 'id' or 'name'.
+            role (str): Only users with this role; None for all.
+            cursor (str): next_cursor of the previous page; None for the first page.
+            limit (int): Page size.
+        Returns:
+            dict: {'items': list, 'next_cursor': str|None, 'offset': int, 'total': int}
+        Raises:
+            ValueError: If the sort or the cursor is invalid.
+        """
+        keys, records = self._view(sort, role)
+        try:
+            start = bisect.bisect_right(keys, decode_cursor(cursor)) if cursor else 0
+        except TypeError:
+            # Parts of the wrong type for this sort, e.g. a cursor from the other sort order
+            raise ValueError("Invalid cursor.")
+        end = start + limit
+        return {
+            'items': records[start:end],
+            'next_cursor': encode_cursor(keys[end - 1]) if end < len(records) else None,
+            'offset': start,
+            'total': len(records),
+        }
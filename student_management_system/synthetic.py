@@ -0,0 +1,251 @@
+"""
+Seeded synthetic data at any scale, for load and performance testing.
+
+    python -m student_management_system.synthetic OUT_DIR [--students 10000] [--courses 40]
+        [--days 180] [--courses-per-student 5] [--attendance-rate 0.92] [--score-mean 72] [--seed 1]
+
+Writes users.json, courses.json, enrollments.csv, attendance.csv and
+grades.csv into OUT_DIR in exactly the format StorageManager writes them, so
+the directory can be used as --data-dir anywhere (or copied over data/).
+The same arguments and seed always produce byte-identical files.
+
+Rows are streamed to disk as they are drawn: memory grows with the number of
+students and enrollments, never with the number of days or rows, so
+10,000 students x 5 courses x 200 days (10M attendance rows) runs in a few
+tens of MB. Passwords are hashed once per role ('admin123', 'teacher123',
+'student123') with a seeded salt.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from student_management_system import passwords
+from student_management_system.models.user import Admin, Teacher, Student
+
+FILES = ('users.json', 'courses.json', 'enrollments.csv', 'attendance.csv', 'grades.csv')
+PASSWORDS = {'Admin': 'admin123', 'Teacher': 'teacher123', 'Student': 'student123'}
+SUBJECTS = (('MATH', 'Mathematics'), ('PHY', 'Physics'), ('BIO', 'Biology'), ('CHEM', 'Chemistry'),
+            ('CS', 'Computer Science'), ('ENG', 'English'), ('HIST', 'History'), ('ECON', 'Economics'),
+            ('GEO', 'Geography'), ('ART', 'Art'))
+FIRST = ("james mary robert patricia john jennifer michael linda david elizabeth william barbara richard susan "
+         "joseph jessica thomas sarah charles karen daniel nancy matthew lisa anthony betty mark sandra paul "
+         "emily andrew donna joshua michelle kevin amanda brian dorothy george melissa alisher dilnoza bobur "
+         "shavkat aziz nodira rustam malika timur gulnora").split()
+LAST = ("smith johnson williams brown jones garcia miller davis rodriguez martinez wilson anderson taylor "
+        "thomas moore jackson martin lee thompson white harris clark lewis walker young allen king wright "
+        "karimov rahimov usmonov tursunov yusupov").split()
+NOT_PRESENT = ('A', 'L', 'E')
+NOT_PRESENT_WEIGHTS = (0.5, 0.35, 0.15)  # Share of non-present sessions that are absent, late, excused
+RATE_CONCENTRATION = 20  # Beta(a, b) with a + b = 20: most students near the mean rate, a tail of poor attenders
+
+
+def school_days(start: date, count: int) -> list:
+    """The first `count` weekdays from `start`, as 'YYYY-MM-DD' strings."""
+    days, day = [], start
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def _write_json_list(path: str, records) -> int:
+    # Same bytes as json.dump(list(records), f, indent=4), one record at a time
+    count = 0
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(',\n    ' if count else '[\n    ')
+            f.write(json.dumps(record, indent=4).replace('\n', '\n    '))
+            count += 1
+        f.write('\n]' if count else '[]')
+    return count
+
+
+def _write_csv(path: str, header: tuple, rows) -> int:
+    # Same dialect as StorageManager's DictWriter; writerows() pulls the generator lazily
+    counter = _Tally(rows)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(counter)
+    return counter.count
+
+
+class _Tally:
+    """Iterator wrapper that counts the rows passing through."""
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = next(self._rows)
+        self.count += 1
+        return row
+
+
+def generate(data_dir: str, students: int = 10000, courses: int = 40, days: int = 180,
+             courses_per_student: int = 5, teachers: int = None, assessments: int = 3,
+             attendance_rate: float = 0.92, score_mean: float = 72.0, score_sd: float = 12.0,
+             start: str = '2025-09-01', seed: int = 1) -> dict:
+    """
+    Write a complete synthetic data directory.
+    Args:
+        data_dir (str): Output directory; created if missing, existing data files are overwritten.
+        students (int): Number of students.
+        courses (int): Number of courses.
+        days (int): School days (weekdays from `start`) of attendance.
+        courses_per_student (int): Courses each student is enrolled in.
+        teachers (int): Number of teachers; defaults to one per two courses.
+        assessments (int): Graded assessments per enrollment; their weights sum to 1.
+        attendance_rate (float): Mean share of sessions a student attends (0-1).
+        score_mean (float): Mean score out of 100.
+        score_sd (float): Spread of student ability around the mean.
+        start (str): First school day, 'YYYY-MM-DD'.
+        seed (int): Random seed.
+    Returns:
+        dict: Rows written per file.
+    Raises:
+        ValueError: If an argument is out of range.
+    """
+    if students < 1 or courses < 1 or days < 1 or assessments < 1:
+        raise ValueError("students, courses, days and assessments must be at least 1.")
+    if not 0 < attendance_rate < 1:
+        raise ValueError("attendance_rate must be between 0 and 1.")
+    per_student = min(courses_per_student, courses)
+    teachers = max(1, teachers or (courses + 1) // 2)
+    first_day = date.fromisoformat(start)
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+
+    hashes = {role: passwords.hash_password(pw, salt=bytes(rng.getrandbits(8) for _ in range(passwords.SALT_BYTES)))
+              for role, pw in PASSWORDS.items()}
+    teacher_ids = [f"T-{n:03d}" for n in range(1, teachers + 1)]
+    teacher_names = [f"{rng.choice(('mr', 'ms'))}_{rng.choice(LAST)}{n}" for n in range(1, teachers + 1)]
+    student_ids = [f"S-{n:03d}" for n in range(1, students + 1)]
+    # Courses are dealt to teachers in turn; a teacher's department is their first course's subject
+    catalog, course_teachers, departments = [], [], {}
+    for n in range(courses):
+        prefix, subject = SUBJECTS[n % len(SUBJECTS)]
+        level = 101 + n // len(SUBJECTS)
+        t = n % teachers
+        catalog.append({'course_id': f"{prefix}-{level}", 'name': f"{subject} {level}",
+                        'teacher': teacher_names[t], 'capacity': None})
+        course_teachers.append(t)
+        departments.setdefault(t, subject)
+
+    # Per-student draws, kept for the attendance and grade passes
+    a = attendance_rate * RATE_CONCENTRATION
+    b = (1 - attendance_rate) * RATE_CONCENTRATION
+    rates = [rng.betavariate(a, b) for _ in student_ids]
+    schedules = [sorted(rng.sample(range(courses), per_student)) for _ in student_ids]
+    rosters = [[] for _ in catalog]
+    for s, schedule in enumerate(schedules):
+        for c in schedule:
+            rosters[c].append(s)
+
+    def users():
+        admin = Admin('admin', hashes['Admin'], user_id='A-001')
+        admin._permissions = ['all']
+        yield admin.to_record()
+        for t, user_id in enumerate(teacher_ids):
+            teacher = Teacher(teacher_names[t], hashes['Teacher'], user_id=user_id)
+            teacher._department = departments.get(t, 'General')
+            teacher._assigned_courses = [catalog[c]['course_id'] for c in range(t, courses, teachers)]
+            yield teacher.to_record()
+        for s, user_id in enumerate(student_ids):
+            student = Student(f"{rng.choice(FIRST)}_{rng.choice(LAST)}{s + 1}", hashes['Student'], user_id=user_id)
+            student._academic_year = rng.randint(1, 4)
+            # The legacy copy of the enrollments, as the shipped users.json has it
+            student._enrolled_courses = [catalog[c]['course_id'] for c in schedules[s]]
+            yield student.to_record()
+
+    def enrollments():
+        for s, schedule in enumerate(schedules):
+            for c in schedule:
+                yield (student_ids[s], catalog[c]['course_id'], start, 'enrolled')
+
+    def attendance():
+        # Day by day, class by class: the order teachers would record it in
+        random_ = rng.random
+        for day in school_days(first_day, days):
+            for course, t, roster in zip(catalog, course_teachers, rosters):
+                course_id, teacher_id = course['course_id'], teacher_ids[t]
+                for s in roster:
+                    if random_() < rates[s]:
+                        status = 'P'
+                    else:
+                        status = rng.choices(NOT_PRESENT, NOT_PRESENT_WEIGHTS)[0]
+                    yield (student_ids[s], course_id, day, status, teacher_id)
+
+    weight = round(1 / assessments, 2)
+    weights = [weight] * (assessments - 1) + [round(1 - weight * (assessments - 1), 2)]
+
+    def grades():
+        for s, schedule in enumerate(schedules):
+            # Ability tracks attendance a little, so at-risk students look at risk on both counts
+            ability = rng.gauss(score_mean + 40 * (rates[s] - attendance_rate), score_sd)
+            for c in schedule:
+                for w in weights:
+                    score = min(100, max(0, round(rng.gauss(ability, score_sd / 2))))
+                    yield (student_ids[s], catalog[c]['course_id'], score, 100, w)
+
+    return {
+        'users.json': _write_json_list(os.path.join(data_dir, 'users.json'), users()),
+        'courses.json': _write_json_list(os.path.join(data_dir, 'courses.json'), catalog),
+        'enrollments.csv': _write_csv(os.path.join(data_dir, 'enrollments.csv'), ('student_id', 'course_id', 'date', 'status'), enrollments()),
+        'attendance.csv': _write_csv(os.path.join(data_dir, 'attendance.csv'), ('student_id', 'course_id', 'date', 'status', 'marked_by'), attendance()),
+        'grades.csv': _write_csv(os.path.join(data_dir, 'grades.csv'), ('student_id', 'course_id', 'score', 'max_score', 'weight'), grades()),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m student_management_system.synthetic',
+                                     description="Write a seeded synthetic data directory.")
+    parser.add_argument('data_dir', help="output directory")
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--courses', type=int, default=40)
+    parser.add_argument('--days', type=int, default=180, help="school days of attendance")
+    parser.add_argument('--courses-per-student', type=int, default=5)
+    parser.add_argument('--teachers', type=int, default=None, help="default: one per two courses")
+    parser.add_argument('--assessments', type=int, default=3, help="grades per enrollment")
+    parser.add_argument('--attendance-rate', type=float, default=0.92, help="mean share of sessions attended")
+    parser.add_argument('--score-mean', type=float, default=72.0)
+    parser.add_argument('--score-sd', type=float, default=12.0)
+    parser.add_argument('--start', default='2025-09-01', help="first school day, YYYY-MM-DD")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--force', action='store_true', help="overwrite existing data files")
+    args = parser.parse_args(argv)
+
+    existing = [name for name in FILES + ('id_counters.json',) if os.path.exists(os.path.join(args.data_dir, name))]
+    if existing and not args.force:
+        print(f"{args.data_dir} already has {', '.join(existing)}; pass --force to overwrite.", file=sys.stderr)
+        return 1
+    if 'id_counters.json' in existing:
+        # Stale counters would be reconciled upward anyway; start from the generated IDs
+        os.remove(os.path.join(args.data_dir, 'id_counters.json'))
+
+    started = time.perf_counter()
+    try:
+        counts = generate(args.data_dir, args.students, args.courses, args.days, args.courses_per_student,
+                          args.teachers, args.assessments, args.attendance_rate, args.score_mean,
+                          args.score_sd, args.start, args.seed)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+    for name, count in counts.items():
+        print(f"{name:<16} {count:>12,} records")
+    print(f"Wrote {sum(counts.values()):,} records to {args.data_dir} in {elapsed:.1f} s.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
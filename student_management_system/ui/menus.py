@@ -1,27 +1,68 @@
 from . import prompts
 
+# Menu options per dashboard (key -> label); main.py uses the labels for metrics
+ADMIN_OPTIONS = {
+    "1": "Add User",
+    "2": "Update User",
+    "3": "Delete User",
+    "4": "Create Group",
+    "5": "Update Group",
+    "6": "Delete Group",
+    "7": "Show Users",
+    "8": "Show Groups",
+    "9": "Course Management",
+    "10": "System Reports",
+    "11": "Report Jobs",
+    "12": "Bulk User Import",
+    "13": "Performance Stats",
+    "14": "Logout",
+    "15": "Exit"
+}
+
+COURSE_OPTIONS = {
+    "1": "List Courses",
+    "2": "Create/Update Course",
+    "3": "Delete Course",
+    "4": "View Roster",
+    "5": "Back"
+}
+
+TEACHER_OPTIONS = {
+    "1": "Mark Class Attendance",
+    "2": "Assign Grade",
+    "3": "View Students",
+    "4": "Course Leaderboard",
+    "5": "Mark Group Attendance",
+    "6": "Group Progress",
+    "7": "Logout",
+    "8": "Exit"
+}
+
+STUDENT_OPTIONS = {
+    "1": "Check Attendance",
+    "2": "Check Progress",
+    "3": "View Courses",
+    "4": "Logout",
+    "5": "Exit"
+}
+
 def admin_menu() -> str:
     """
     Displays the Admin menu.
     Returns:
         str: Selected action key.
     """
-    options = {
-        "1": "Add User",
-        "2": "Update User",
-        "3": "Delete User",
-        "4": "Create Group",
-        "5": "Update Group",
-        "6": "Delete Group",
-        "7": "Show Users",
-        "8": "Show Groups",
-        "9": "Course Management",
-        "10": "System Reports",
-        "11": "Logout",
-        "12": "Exit"
-    }
     print("\n[ADMIN DASHBOARD]")
-    return prompts.prompt_menu(options)
+    return prompts.prompt_menu(ADMIN_OPTIONS)
+
+def course_menu() -> str:
+    """
+    Displays the Course Management menu.
+    Returns:
+        str: Selected action key.
+    """
+    print("\n[COURSE MANAGEMENT]")
+    return prompts.prompt_menu(COURSE_OPTIONS)
 
 def teacher_menu() -> str:
     """
@@ -29,15 +70,8 @@ def teacher_menu() -> str:
     Returns:
         str: Selected action key.
     """
-    options = {
-        "1": "Mark Attendance",
-        "2": "Assign Grade",
-        "3": "View Students",
-        "4": "Logout",
-        "5": "Exit"
-    }
     print("\n[TEACHER DASHBOARD]")
-    return prompts.prompt_menu(options)
+    return prompts.prompt_menu(TEACHER_OPTIONS)
 
 def student_menu() -> str:
     """
@@ -45,12 +79,5 @@ def student_menu() -> str:
     Returns:
         str: Selected action key.
     """
-    options = {
-        "1": "Check Attendance",
-        "2": "Check Progress",
-        "3": "View Courses",
-        "4": "Logout",
-        "5": "Exit"
-    }
     print("\n[STUDENT DASHBOARD]")
-    return prompts.prompt_menu(options)
+    return prompts.prompt_menu(STUDENT_OPTIONS)
@@ -90,18 +90,68 @@ def prompt_user_details() -> dict:
         '_is_active': True 
     }
 
-def prompt_attendance_details() -> dict:
+def prompt_course_details(existing: dict = None) -> dict:
     """
-    Prompts for attendance marking details.
+    Prompts for course catalog details.
+    Args:
+        existing (dict): The current course when updating; blank answers keep its values.
     Returns:
-        dict: student_id, course_id, date, status
+        dict: name, teacher, capacity (None for unlimited); when updating, course_id plus the changed fields.
     """
-    print("\n[Mark Attendance]")
+    print("\n[Course Details]")
+    if existing:
+        details = {'course_id': existing['course_id']}
+        name = normalize_input(input(f"Name ({existing.get('name')}): "))
+        if name:
+            details['name'] = name
+        teacher = normalize_input(input(f"Teacher ({existing.get('teacher') or 'none'}): "))
+        if teacher:
+            details['teacher'] = teacher
+    else:
+        while True:
+            name = normalize_input(input("Name: "))
+            if name: break
+            print("Course name required.")
+        details = {'name': name, 'teacher': normalize_input(input("Teacher username (optional): ")) or None}
+
     while True:
-        student_id = normalize_input(input("Student ID: "))
-        if student_id: break
-        print("Student ID required.")
-        
+        raw = normalize_input(input("Capacity (blank for unlimited/unchanged): "))
+        if not raw:
+            if not existing:
+                details['capacity'] = None
+            break
+        try:
+            capacity = int(raw)
+            if capacity > 0:
+                details['capacity'] = capacity
+                break
+            print("Capacity must be positive.")
+        except ValueError:
+            print("Invalid number.")
+    return details
+
+def prompt_id_list(label: str) -> list:
+    """
+    Prompts for a comma-separated list of IDs (may be empty).
+    Args:
+        label (str): The prompt text.
+    Returns:
+        list: Unique IDs in the order entered.
+    """
+    raw = input(f"{label} (comma-separated, blank for none): ")
+    ids = []
+    for part in raw.split(','):
+        value = normalize_input(part)
+        if value and value not in ids:
+            ids.append(value)
+    return ids
+
+def prompt_class_session() -> dict:
+    """
+    Prompts for the course and date of a class session.
+    Returns:
+        dict: course_id, date
+    """
     while True:
         course_id = normalize_input(input("Course ID: "))
         if course_id: break
@@ -113,31 +163,60 @@ def prompt_attendance_details() -> dict:
             break
         print("Invalid date format. Use YYYY-MM-DD.")
         
-    print("Statuses: P (Present), A (Absent), L (Late), E (Excused)")
-    while True:
-        status = normalize_input(input("Status: ")).upper()
-        if status in ['P', 'A', 'L', 'E']:
-            break
-        print("Invalid status.")
-        
     return {
-        'student_id': student_id,
         'course_id': course_id,
-        'date': date_str,
-        'status': status
+        'date': date_str
     }
 
-def prompt_grade_details() -> dict:
+def prompt_status_exceptions(roster: list) -> dict:
+    """
+    Prompts for the students whose status is not Present.
+    Args:
+        roster (list): Student IDs allowed in the answer.
+    Returns:
+        dict: {student_id: status} for the exceptions only.
+    """
+    allowed = set(roster)
+    print("Everyone is marked P (Present) by default.")
+    print("Enter exceptions as ID=STATUS, e.g. S-001=A, S-002=L (A: Absent, L: Late, E: Excused).")
+    while True:
+        raw = input("Exceptions (blank for none): ")
+        exceptions = {}
+        error = None
+        for part in raw.split(','):
+            part = normalize_input(part)
+            if not part:
+                continue
+            student_id, _, status = part.partition('=')
+            student_id, status = normalize_input(student_id), normalize_input(status).upper()
+            if student_id not in allowed:
+                error = f"{student_id} is not on this roster."
+            elif status not in ['P', 'A', 'L', 'E']:
+                error = f"Invalid status for {student_id}."
+            else:
+                exceptions[student_id] = status
+        if error is None:
+            return exceptions
+        print(error)
+
+def prompt_grade_details(resolve_student=None) -> dict:
     """
     Prompts for grade assignment details.
+    Args:
+        resolve_student (callable): Maps the typed text to a student ID, or None to ask again.
     Returns:
         dict: student_id, course_id, score, max_score, weight
     """
     print("\n[Assign Grade]")
     while True:
         student_id = normalize_input(input("Student ID: "))
+        if not student_id:
+            print("Student ID required.")
+            continue
+        if resolve_student is None: break
+        student_id = resolve_student(student_id)
         if student_id: break
-        print("Student ID required.")
+        print("Student not found.")
         
     while True:
         course_id = normalize_input(input("Course ID: "))
@@ -176,6 +255,58 @@ def prompt_grade_details() -> dict:
         'weight': weight
     }
 
+def prompt_list_view(allow_role: bool = True) -> dict:
+    """
+    Prompts for the sort order and (optionally) the role filter of a listing.
+    Returns:
+        dict: sort ('id' or 'name'), role (str or None)
+    """
+    sort = 'name' if normalize_input(input("Sort by (1) ID or (2) Name [1]: ")) == '2' else 'id'
+    role = None
+    while allow_role:
+        role = normalize_input(input("Role filter (Admin/Teacher/Student, blank for all): ")).capitalize() or None
+        if role in (None, 'Admin', 'Teacher', 'Student'):
+            break
+        print("Invalid role.")
+    return {'sort': sort, 'role': role}
+
+def prompt_page_command(has_next: bool, has_previous: bool) -> str:
+    """
+    Prompts for paging through a listing; Enter means next (or quit on the last page).
+    Returns:
+        str: 'n' (next), 'p' (previous) or 'q' (stop).
+    """
+    if not (has_next or has_previous):
+        return 'q'
+    options = (["[n]ext"] if has_next else []) + (["[p]revious"] if has_previous else []) + ["[q]uit"]
+    while True:
+        choice = normalize_input(input(f"{', '.join(options)}: ")).lower()[:1] or ('n' if has_next else 'q')
+        if choice == 'q' or (choice == 'n' and has_next) or (choice == 'p' and has_previous):
+            return choice
+        print("Invalid choice.")
+
+def prompt_pick(options: list, render):
+    """
+    Offers numbered suggestions after an inexact lookup.
+    Args:
+        options (list): Candidate records, best first.
+        render (callable): Formats one candidate as a line.
+    Returns:
+        The chosen option, or None if there were none or the user declined.
+    """
+    if not options:
+        return None
+    print("No exact match. Did you mean:")
+    for number, option in enumerate(options, 1):
+        print(f"  {number}. {render(option)}")
+    while True:
+        choice = normalize_input(input(f"Choose 1-{len(options)} (blank for none): "))
+        if not choice:
+            return None
+        if choice.isdigit() and 1 <= int(choice) <= len(options):
+            return options[int(choice) - 1]
+        print("Invalid choice.")
+
 def display_message(message: str):
     print(f"\n[INFO] {message}")
 
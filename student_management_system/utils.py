@@ -1,6 +1,7 @@
 import os
 import csv
 from datetime import datetime
+from student_management_system import config
 
 def validate_date(date_str: str) -> bool:
     """
@@ -111,21 +112,21 @@ def generate_attendance_report(attendance_records: list, output_path: str = "rep
     except IOError:
         return False
 
-def generate_progress_report(grades: list, output_path: str = "reports/progress_report.csv") -> bool:
+def summarize_grades(grades, student_ids=None) -> dict:
     """
-    Generate a CSV progress report.
+    Average grade percentage per student in a single pass.
     Args:
-        grades (list): List of grade dictionaries.
-        output_path (str): Path to save the report.
+        grades (iterable): Grade dictionaries; may be a stream such as StorageManager.iter_grades().
+        student_ids (set): Optional set of students to keep; others are skipped.
     Returns:
-        bool: True if successful, False otherwise.
+        dict: {student_id: {'average': float, 'count': int}}
     """
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    student_grades = {} # {sid: {'weighted_sum': 0, 'total_weight': 0, 'scores': []}}
+    student_grades = {} # {sid: {'weighted_sum': 0, 'total_weight': 0, 'perc_sum': 0, 'count': 0}}
     
     for g in grades:
         sid = g.get('student_id')
+        if student_ids is not None and sid not in student_ids:
+            continue
         score = float(g.get('score', 0))
         max_score = float(g.get('max_score', 100))
         weight = float(g.get('weight', 0)) # Use weight if available
@@ -133,14 +134,39 @@ def generate_progress_report(grades: list, output_path: str = "reports/progress_
         perc = (score / max_score * 100) if max_score > 0 else 0
         
         if sid not in student_grades:
-            student_grades[sid] = {'weighted_sum': 0.0, 'total_weight': 0.0, 'percentages': []}
+            student_grades[sid] = {'weighted_sum': 0.0, 'total_weight': 0.0, 'perc_sum': 0.0, 'count': 0}
         
-        student_grades[sid]['percentages'].append(perc)
+        # Running sums keep memory per student constant instead of storing every score
+        student_grades[sid]['perc_sum'] += perc
+        student_grades[sid]['count'] += 1
         
         # Weighted logic
         if weight > 0:
             student_grades[sid]['weighted_sum'] += perc * weight
             student_grades[sid]['total_weight'] += weight
+
+    summary = {}
+    for sid, data in student_grades.items():
+        avg = 0.0
+        if data['total_weight'] > 0:
+            avg = data['weighted_sum'] / data['total_weight']
+        elif data['count']:
+            avg = data['perc_sum'] / data['count']
+        summary[sid] = {'average': avg, 'count': data['count']}
+    return summary
+
+def generate_progress_report(grades: list, output_path: str = "reports/progress_report.csv") -> bool:
+    """
+    Generate a CSV progress report.
+    Args:
+        grades (list): List of grade dictionaries.
+        output_path (str): Path to save the report.
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    
+    student_grades = summarize_grades(grades)
         
     try:
         with open(output_path, 'w', newline='') as f:
@@ -148,19 +174,44 @@ def generate_progress_report(grades: list, output_path: str = "reports/progress_
             writer.writerow(['Student ID', 'Average Grade', 'Risk Level'])
             
             for sid, data in student_grades.items():
-                avg = 0.0
-                if data['total_weight'] > 0:
-                    avg = data['weighted_sum'] / data['total_weight']
-                elif data['percentages']:
-                    avg = sum(data['percentages']) / len(data['percentages'])
+                avg = data['average']
                 
                 risk = "OK"
-                if avg < 60:
+                if avg < config.RISK_GRADE_CRITICAL:
                     risk = "Critical"
-                elif avg < 75:
+                elif avg < config.RISK_GRADE_MODERATE:
                     risk = "Moderate"
                     
                 writer.writerow([sid, f"{avg:.2f}", risk])
         return True
     except IOError:
         return False
+
+def generate_distribution_report(grades, output_path: str = "reports/grade_distribution.csv") -> bool:
+    """
+    Generate a CSV of grade distributions (quartiles and histogram) per course and term.
+    Args:
+        grades (iterable): Grade dictionaries; may be a stream such as StorageManager.iter_grades().
+        output_path (str): Path to save the report.
+    Returns:
+        bool: True if successful, False otherwise.
+    """
+    from student_management_system.sketches import GradeDistribution
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    dist = GradeDistribution.from_rows(grades)
+
+    try:
+        with open(output_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Course ID', 'Term', 'Count', 'Mean', 'Min', 'Q1', 'Median', 'Q3', 'Max', 'Rank Error', 'Histogram'])
+            for course_id, term in dist.keys():
+                s = dist.summary(course_id, term)
+                histogram = ' '.join(f"{low:.0f}-{high:.0f}:{count}" for low, high, count in s['histogram'])
+                writer.writerow([
+                    course_id, term, s['count'], f"{s['mean']:.2f}", f"{s['min']:.2f}", f"{s['q1']:.2f}",
+                    f"{s['median']:.2f}", f"{s['q3']:.2f}", f"{s['max']:.2f}", f"{s['rank_error']:.4f}", histogram
+                ])
+        return True
+    except IOError:
+        return False